@@ -0,0 +1,95 @@
+"""
+Benchmark for the lean Reddit listing parser (search_reddit_posts_lean).
+
+Parses a listing in Reddit's search JSON format (fixtures/reddit_search_listing.json,
+100 posts) two ways:
+- praw: objectify into Submission models and build post dicts the way
+  search_reddit_posts does (subreddit.display_name, str(author));
+- lean: parse_listing into __slots__ RedditPost records.
+Reports parse time and the memory retained by the parsed posts, plus how many
+posts a client-side 30-day filter would discard (the lean path filters server-side).
+
+Usage:
+    python -m benchmarks.benchmark_reddit_listing [--runs 50]
+"""
+
+import argparse
+import json
+import statistics
+import time
+import tracemalloc
+from pathlib import Path
+
+# Importing src.config first avoids the services/api circular import outside the server
+import src.config  # noqa: F401
+from src.services.reddit_service import parse_listing
+
+FIXTURE = Path(__file__).parent / "fixtures" / "reddit_search_listing.json"
+
+
+def _praw_posts(reddit, payload: dict) -> list:
+    """Build post dicts through praw models, as search_reddit_posts does."""
+    posts = []
+    for post in reddit._objector.objectify(data=payload):
+        posts.append({
+            "title": post.title,
+            "url": post.url,
+            "permalink": f"https://www.reddit.com{post.permalink}",
+            "score": post.score,
+            "num_comments": post.num_comments,
+            "selftext": post.selftext[:500] if post.selftext else "",
+            "subreddit": post.subreddit.display_name,
+            "created_utc": post.created_utc,
+            "author": str(post.author) if post.author else "[deleted]",
+        })
+    return posts
+
+
+def _time(fn, runs: int) -> float:
+    """Median duration of fn in milliseconds."""
+    durations = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        fn()
+        durations.append((time.perf_counter() - started) * 1000)
+    return statistics.median(durations)
+
+
+def _retained_bytes(fn) -> int:
+    """Memory still allocated by the result of fn."""
+    tracemalloc.start()
+    result = fn()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=50, help="timed runs")
+    args = parser.parse_args()
+
+    import praw
+    # No network access: praw only needs credentials to build the objector
+    reddit = praw.Reddit(client_id="benchmark", client_secret="benchmark", user_agent="benchmark")
+    payload = json.loads(FIXTURE.read_text())
+
+    praw_ms = _time(lambda: _praw_posts(reddit, payload), args.runs)
+    lean_ms = _time(lambda: parse_listing(payload), args.runs)
+    praw_bytes = _retained_bytes(lambda: _praw_posts(reddit, payload))
+    lean_bytes = _retained_bytes(lambda: parse_listing(payload))
+
+    posts = parse_listing(payload)
+    fixture_now = max(p.created_utc for p in posts)
+    older = sum(1 for p in posts if p.created_utc < fixture_now - 30 * 86400)
+
+    print(f"posts:        {len(posts)} ({FIXTURE.stat().st_size // 1024} KB listing JSON)")
+    print(f"parse time:   praw {praw_ms:.2f} ms -> lean {lean_ms:.2f} ms ({praw_ms / lean_ms:.1f}x faster)")
+    print(f"retained:     praw {praw_bytes // 1024} KB -> lean {lean_bytes // 1024} KB")
+    print(f"time filter:  {older}/{len(posts)} posts in the listing are older than 30 days; "
+          f"without t=month they are fetched only to be discarded")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Benchmark for the local extractive summarizer (SUMMARIZE_SOURCES stage).
+
+Compares the generation prompt built from raw core texts (truncated by
+truncate_source_content, as before) with the one built from summarized texts,
+and measures the summarizer's own latency.
+
+Usage:
+    python -m benchmarks.benchmark_summarizer [--sources 6] [--sentences 400] [--budget 600] [--runs 5]
+"""
+
+import argparse
+import random
+import statistics
+import time
+
+# Importing src.config first avoids the services/api circular import outside the server
+import src.config  # noqa: F401
+from src.services.summarizer_service import summarize_text, estimate_tokens
+from src.services.openai_service import truncate_source_content, MAX_SOURCE_CONTENT_LENGTH
+
+# rate_relevance truncates each source to this many characters
+_RELEVANCE_TEXT_LENGTH = 10000
+
+_SUBJECTS = ["The startup", "The research team", "The company", "Regulators", "Investors", "Developers", "Analysts"]
+_VERBS = ["announced", "released", "criticized", "tested", "funded", "delayed", "open-sourced", "benchmarked"]
+_OBJECTS = [
+    "a new language model", "an agent framework", "a data center in Europe", "its quarterly results",
+    "a safety evaluation", "a developer preview", "an inference chip", "a partnership with a cloud provider",
+]
+_TAILS = [
+    "according to people familiar with the matter.", "after months of speculation.",
+    "which could reshape the market.", "despite concerns about cost.", "ahead of a major conference.",
+    "in a blog post on Tuesday.", "as competition intensifies.", "with availability expected next quarter.",
+]
+
+
+def _make_source(rng: random.Random, sentences: int) -> str:
+    """Build a synthetic long article with repeated themes, like scraped news pages."""
+    lines = []
+    for i in range(sentences):
+        sentence = f"{rng.choice(_SUBJECTS)} {rng.choice(_VERBS)} {rng.choice(_OBJECTS)} {rng.choice(_TAILS)}"
+        lines.append(sentence + ("\n" if i % 8 == 7 else " "))
+    return "".join(lines)
+
+
+def _sources_in_prompt(texts: list) -> int:
+    """Count the sources that start before the generation prompt is truncated."""
+    covered = 0
+    offset = 0
+    for text in texts:
+        if offset >= MAX_SOURCE_CONTENT_LENGTH:
+            break
+        covered += 1
+        offset += len(text) + 2
+    return covered
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sources", type=int, default=6, help="number of sources per request")
+    parser.add_argument("--sentences", type=int, default=400, help="sentences per source")
+    parser.add_argument("--budget", type=int, default=600, help="token budget per source")
+    parser.add_argument("--runs", type=int, default=5, help="timed runs")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    sources = [_make_source(rng, args.sentences) for _ in range(args.sources)]
+
+    durations = []
+    summaries = []
+    for _ in range(args.runs):
+        started = time.perf_counter()
+        summaries = [summarize_text(text, args.budget) for text in sources]
+        durations.append((time.perf_counter() - started) * 1000)
+
+    raw_tokens = sum(estimate_tokens(text) for text in sources)
+    summary_tokens = sum(estimate_tokens(text) for text in summaries)
+    rating_before = sum(estimate_tokens(text[:_RELEVANCE_TEXT_LENGTH]) for text in sources)
+    rating_after = sum(estimate_tokens(text[:_RELEVANCE_TEXT_LENGTH]) for text in summaries)
+    prompt_before = estimate_tokens(truncate_source_content("\n\n".join(sources)))
+    prompt_after = estimate_tokens(truncate_source_content("\n\n".join(summaries)))
+
+    print(f"sources:           {args.sources} x ~{raw_tokens // args.sources} tokens, budget {args.budget} tokens/source")
+    print(f"source tokens:     {raw_tokens} -> {summary_tokens} ({1 - summary_tokens / raw_tokens:.0%} smaller)")
+    print(f"rating prompts:    {rating_before} -> {rating_after} tokens ({1 - rating_after / rating_before:.0%} smaller)")
+    print(f"generation prompt: {prompt_before} -> {prompt_after} tokens, "
+          f"sources included {_sources_in_prompt(sources)} -> {_sources_in_prompt(summaries)}")
+    print(f"summarizer time:   median {statistics.median(durations):.1f} ms, max {max(durations):.1f} ms per request")
+
+if __name__ == "__main__":
+    main()
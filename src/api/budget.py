@@ -0,0 +1,19 @@
+from fastapi import APIRouter
+from src.config.logger import get_logger
+from src.services.budget_service import get_budget_status
+
+router = APIRouter()
+logger = get_logger("Budget")
+
+
+@router.get("")
+def budget():
+    """
+    Get today's API usage and remaining budget per source (YouTube, Tavily, OpenAI).
+    A plain function, so FastAPI runs the blocking ledger read in its threadpool.
+
+    Returns:
+        dict: Budget day and per-source usage, limits and level.
+    """
+    logger.debug("Budget endpoint accessed")
+    return get_budget_status()
@@ -0,0 +1,18 @@
+from fastapi import APIRouter
+from src.config.logger import get_logger
+from src.services.metrics_service import get_metrics
+
+router = APIRouter()
+logger = get_logger("Metrics")
+
+
+@router.get("")
+async def metrics():
+    """
+    Get a snapshot of the in-process service metrics (counters, gauges and timings).
+
+    Returns:
+        dict: Current metrics snapshot.
+    """
+    logger.debug("Metrics endpoint accessed")
+    return get_metrics()
@@ -0,0 +1,18 @@
+from fastapi import APIRouter
+from src.config.logger import get_logger
+from src.services.prewarm_service import get_prewarm_status
+
+router = APIRouter()
+logger = get_logger("Prewarm")
+
+
+@router.get("/status")
+async def prewarm_status():
+    """
+    Get the background topic pre-warmer status.
+
+    Returns:
+        dict: Scheduler state, last cycle results and today's budget usage.
+    """
+    logger.debug("Prewarm status endpoint accessed")
+    return get_prewarm_status()
@@ -1,5 +1,5 @@
 from fastapi import FastAPI, APIRouter
-from . import get_graph_png, user_input, welcome_message, health
+from . import get_graph_png, user_input, welcome_message, health, metrics, prewarm, budget
 from src.config.logger import get_logger
 
 router = APIRouter()
@@ -20,6 +20,9 @@ def register_routes(app: FastAPI):
     app.include_router(welcome_message.router, prefix="/welcome-message", tags=["Welcome Message"])
     app.include_router(get_graph_png.router, prefix="/get-graph-png", tags=["Get Graph Png"])
     app.include_router(user_input.router, prefix="/user-input", tags=["User Input"])
+    app.include_router(metrics.router, prefix="/metrics", tags=["Metrics"])
+    app.include_router(prewarm.router, prefix="/prewarm", tags=["Prewarm"])
+    app.include_router(budget.router, prefix="/budget", tags=["Budget"])
     logger.info("All API routes registered successfully")
 
 
@@ -7,13 +7,91 @@ class Settings(BaseSettings):
     openai_api_key: str = os.getenv("OPENAI_API_KEY", "")
     tavily_api_key: str = os.getenv("TAVILY_API_KEY", "")
     youtube_api_key: str = os.getenv("YOUTUBE_API_KEY", "")
+    youtube_http_timeout_seconds: float = float(os.getenv("YOUTUBE_HTTP_TIMEOUT_SECONDS", "10"))
+    youtube_engagement_ranking_enabled: bool = os.getenv("YOUTUBE_ENGAGEMENT_RANKING_ENABLED", "true").lower() == "true"
+    youtube_ranking_candidates: int = int(os.getenv("YOUTUBE_RANKING_CANDIDATES", "15"))
+    youtube_transcripts_enabled: bool = os.getenv("YOUTUBE_TRANSCRIPTS_ENABLED", "true").lower() == "true"
+    youtube_timedtext_base_url: str = os.getenv("YOUTUBE_TIMEDTEXT_BASE_URL", "https://www.youtube.com/api/timedtext")
+    youtube_transcript_language: str = os.getenv("YOUTUBE_TRANSCRIPT_LANGUAGE", "en")
+    youtube_transcript_concurrency: int = int(os.getenv("YOUTUBE_TRANSCRIPT_CONCURRENCY", "4"))
     reddit_client_id: str = os.getenv("REDDIT_CLIENT_ID", "")
     reddit_client_secret: str = os.getenv("REDDIT_CLIENT_SECRET", "")
     reddit_user_agent: str = os.getenv("REDDIT_USER_AGENT", "multiagent-rag-app/1.0")
+    reddit_client_mode: str = os.getenv("REDDIT_CLIENT_MODE", "praw")
+    reddit_auth_url: str = os.getenv("REDDIT_AUTH_URL", "https://www.reddit.com/api/v1/access_token")
+    reddit_api_base_url: str = os.getenv("REDDIT_API_BASE_URL", "https://oauth.reddit.com")
+    reddit_http_max_connections: int = int(os.getenv("REDDIT_HTTP_MAX_CONNECTIONS", "10"))
+    reddit_http_timeout_seconds: float = float(os.getenv("REDDIT_HTTP_TIMEOUT_SECONDS", "10"))
+    reddit_subreddit_routing_enabled: bool = os.getenv("REDDIT_SUBREDDIT_ROUTING_ENABLED", "true").lower() == "true"
+    reddit_subreddits_per_topic: int = int(os.getenv("REDDIT_SUBREDDITS_PER_TOPIC", "3"))
+    reddit_routed_listing_limit: int = int(os.getenv("REDDIT_ROUTED_LISTING_LIMIT", "10"))
+    reddit_discussions_enabled: bool = os.getenv("REDDIT_DISCUSSIONS_ENABLED", "false").lower() == "true"
+    reddit_discussion_threads: int = int(os.getenv("REDDIT_DISCUSSION_THREADS", "2"))
+    reddit_discussion_comment_limit: int = int(os.getenv("REDDIT_DISCUSSION_COMMENT_LIMIT", "8"))
+    reddit_comment_concurrency: int = int(os.getenv("REDDIT_COMMENT_CONCURRENCY", "4"))
     mongodb_uri: str = os.getenv("MONGODB_URI", "")
     mongodb_db_name: str = os.getenv("MONGODB_DB_NAME", "multiagent_rag")
     mongodb_api_user: str = os.getenv("MONGODB_API_USER", "")
     mongodb_api_password: str = os.getenv("MONGODB_API_PASSWORD", "")
+    mongodb_max_pool_size: int = int(os.getenv("MONGODB_MAX_POOL_SIZE", "50"))
+    mongodb_min_pool_size: int = int(os.getenv("MONGODB_MIN_POOL_SIZE", "0"))
+    mongodb_server_selection_timeout_ms: int = int(os.getenv("MONGODB_SERVER_SELECTION_TIMEOUT_MS", "5000"))
+    mongodb_connect_timeout_ms: int = int(os.getenv("MONGODB_CONNECT_TIMEOUT_MS", "5000"))
+    mongodb_socket_timeout_ms: int = int(os.getenv("MONGODB_SOCKET_TIMEOUT_MS", "10000"))
+    mongodb_wait_queue_timeout_ms: int = int(os.getenv("MONGODB_WAIT_QUEUE_TIMEOUT_MS", "2000"))
+    details_similarity_threshold: float = float(os.getenv("DETAILS_SIMILARITY_THRESHOLD", "0.5"))
+    near_duplicate_threshold: float = float(os.getenv("NEAR_DUPLICATE_THRESHOLD", "0.8"))
+    prewarm_enabled: bool = os.getenv("PREWARM_ENABLED", "false").lower() == "true"
+    prewarm_interval_seconds: int = int(os.getenv("PREWARM_INTERVAL_SECONDS", "21600"))
+    prewarm_max_concurrency: int = int(os.getenv("PREWARM_MAX_CONCURRENCY", "2"))
+    prewarm_max_runs_per_cycle: int = int(os.getenv("PREWARM_MAX_RUNS_PER_CYCLE", "10"))
+    prewarm_daily_budget: int = int(os.getenv("PREWARM_DAILY_BUDGET", "40"))
+    prewarm_top_details: int = int(os.getenv("PREWARM_TOP_DETAILS", "5"))
+    single_flight_enabled: bool = os.getenv("SINGLE_FLIGHT_ENABLED", "true").lower() == "true"
+    single_flight_distributed: bool = os.getenv("SINGLE_FLIGHT_DISTRIBUTED", "false").lower() == "true"
+    single_flight_lease_seconds: int = int(os.getenv("SINGLE_FLIGHT_LEASE_SECONDS", "180"))
+    single_flight_wait_timeout_seconds: int = int(os.getenv("SINGLE_FLIGHT_WAIT_TIMEOUT_SECONDS", "240"))
+    single_flight_result_ttl_seconds: int = int(os.getenv("SINGLE_FLIGHT_RESULT_TTL_SECONDS", "30"))
+    speculative_prefetch_enabled: bool = os.getenv("SPECULATIVE_PREFETCH_ENABLED", "false").lower() == "true"
+    speculative_max_concurrent: int = int(os.getenv("SPECULATIVE_MAX_CONCURRENT", "4"))
+    speculative_daily_budget: int = int(os.getenv("SPECULATIVE_DAILY_BUDGET", "200"))
+    speculative_ttl_seconds: int = int(os.getenv("SPECULATIVE_TTL_SECONDS", "600"))
+    stale_while_revalidate_enabled: bool = os.getenv("STALE_WHILE_REVALIDATE_ENABLED", "false").lower() == "true"
+    freshness_soft_days: int = int(os.getenv("FRESHNESS_SOFT_DAYS", "7"))
+    freshness_hard_days: int = int(os.getenv("FRESHNESS_HARD_DAYS", "30"))
+    topic_freshness_overrides: str = os.getenv("TOPIC_FRESHNESS_OVERRIDES", "")
+    extractive_summary_enabled: bool = os.getenv("EXTRACTIVE_SUMMARY_ENABLED", "false").lower() == "true"
+    summary_max_tokens_per_source: int = int(os.getenv("SUMMARY_MAX_TOKENS_PER_SOURCE", "600"))
+    openai_max_concurrency: int = int(os.getenv("OPENAI_MAX_CONCURRENCY", "8"))
+    map_reduce_enabled: bool = os.getenv("MAP_REDUCE_ENABLED", "false").lower() == "true"
+    map_reduce_model: str = os.getenv("MAP_REDUCE_MODEL", "gpt-4o-mini")
+    map_reduce_chunk_chars: int = int(os.getenv("MAP_REDUCE_CHUNK_CHARS", "8000"))
+    map_reduce_max_chunks: int = int(os.getenv("MAP_REDUCE_MAX_CHUNKS", "8"))
+    text_cleaning_enabled: bool = os.getenv("TEXT_CLEANING_ENABLED", "true").lower() == "true"
+    tavily_fast_mode_enabled: bool = os.getenv("TAVILY_FAST_MODE_ENABLED", "false").lower() == "true"
+    tavily_snippet_min_chars: int = int(os.getenv("TAVILY_SNIPPET_MIN_CHARS", "500"))
+    tavily_adaptive_depth_enabled: bool = os.getenv("TAVILY_ADAPTIVE_DEPTH_ENABLED", "true").lower() == "true"
+    tavily_escalate_min_results: int = int(os.getenv("TAVILY_ESCALATE_MIN_RESULTS", "2"))
+    tavily_escalate_max_age_days: int = int(os.getenv("TAVILY_ESCALATE_MAX_AGE_DAYS", "14"))
+    tavily_escalate_min_score: float = float(os.getenv("TAVILY_ESCALATE_MIN_SCORE", "0.5"))
+    tavily_extract_batch_size: int = int(os.getenv("TAVILY_EXTRACT_BATCH_SIZE", "2"))
+    tavily_extract_timeout_seconds: float = float(os.getenv("TAVILY_EXTRACT_TIMEOUT_SECONDS", "15"))
+    budget_enabled: bool = os.getenv("BUDGET_ENABLED", "true").lower() == "true"
+    budget_soft_limit_ratio: float = float(os.getenv("BUDGET_SOFT_LIMIT_RATIO", "0.8"))
+    budget_youtube_daily_units: int = int(os.getenv("BUDGET_YOUTUBE_DAILY_UNITS", "10000"))
+    budget_tavily_daily_credits: int = int(os.getenv("BUDGET_TAVILY_DAILY_CREDITS", "1000"))
+    budget_openai_daily_tokens: int = int(os.getenv("BUDGET_OPENAI_DAILY_TOKENS", "2000000"))
+    circuit_breaker_enabled: bool = os.getenv("CIRCUIT_BREAKER_ENABLED", "true").lower() == "true"
+    circuit_failure_rate_threshold: float = float(os.getenv("CIRCUIT_FAILURE_RATE_THRESHOLD", "0.5"))
+    circuit_window_size: int = int(os.getenv("CIRCUIT_WINDOW_SIZE", "10"))
+    circuit_min_calls: int = int(os.getenv("CIRCUIT_MIN_CALLS", "4"))
+    circuit_reset_timeout_seconds: float = float(os.getenv("CIRCUIT_RESET_TIMEOUT_SECONDS", "30"))
+    http_max_connections: int = int(os.getenv("HTTP_MAX_CONNECTIONS", "50"))
+    http_max_keepalive_connections: int = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "20"))
+    http_keepalive_expiry_seconds: float = float(os.getenv("HTTP_KEEPALIVE_EXPIRY_SECONDS", "60"))
+    http_connect_timeout_seconds: float = float(os.getenv("HTTP_CONNECT_TIMEOUT_SECONDS", "5"))
+    http_timeout_seconds: float = float(os.getenv("HTTP_TIMEOUT_SECONDS", "60"))
+    http_http2_enabled: bool = os.getenv("HTTP_HTTP2_ENABLED", "true").lower() == "true"
     langchain_api_key: str = os.getenv("LANGCHAIN_API_KEY", "")
     langchain_tracing_v2: str = os.getenv("LANGCHAIN_TRACING_V2", "false")
     langchain_project: str = os.getenv("LANGCHAIN_PROJECT", "multiagent-rag-app")
@@ -4,12 +4,34 @@ load_dotenv()
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse
 import os
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from src.api import register_routes
 from src.config.logger import logger, set_logger_level
 from src.config.settings import settings
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start and stop application-wide resources."""
+    from src.services.mongo_service import ensure_indexes
+    from src.services.prewarm_service import start_prewarmer, stop_prewarmer
+    from src.services.async_mongo_service import close_client
+    from src.services import async_reddit_service
+    from src.services.youtube_service import warm_up_client
+    from src.services import http_transport_service
+
+    await asyncio.to_thread(ensure_indexes)
+    await asyncio.to_thread(warm_up_client)
+    start_prewarmer()
+    yield
+    await stop_prewarmer()
+    await close_client()
+    await asyncio.to_thread(async_reddit_service.close_client)
+    http_transport_service.close()
+
+
 def setup_server() -> FastAPI:
     # Initialize logger with settings
     set_logger_level(settings.log_level)
@@ -36,7 +58,7 @@ def setup_server() -> FastAPI:
     else:
         logger.info("MONGODB_DB_NAME is configured")
 
-    app = FastAPI(title="Multi-Agent RAG App", version="1.0.0")
+    app = FastAPI(title="Multi-Agent RAG App", version="1.0.0", lifespan=lifespan)
 
     app.add_middleware(
         CORSMiddleware,
@@ -6,6 +6,7 @@ from langgraph.graph import add_messages
 class MessageGraph(TypedDict):
     """State schema for the content generation workflow."""
     messages: Annotated[list[BaseMessage], add_messages]
+    conversation_id: Optional[str]
     topic: Optional[str]
     details: Optional[str]
     retry_count: Optional[int]
@@ -16,9 +17,18 @@ class MessageGraph(TypedDict):
     urls: Optional[list[str]]
     video_urls: Optional[list[str]]
     tavily_urls: Optional[list[str]]
+    search_texts: Optional[list[list[str]]]
     reddit_urls: Optional[list[str]]
     transcripts: Optional[list[str]]
     core_texts: Optional[list[str]]
+    core_text_urls: Optional[list[str]]
+    summarized_texts: Optional[list[str]]
+    stored_text_urls: Optional[list[str]]
+    failed_results: Optional[list[list[str]]]
+    prefetched_core_texts: Optional[list[str]]
+    prefetched_core_text_urls: Optional[list[str]]
+    prefetched_stored_text_urls: Optional[list[str]]
+    prefetched_failed_results: Optional[list[list[str]]]
     relevance_scores: Optional[list[float]]
     verified_texts: Optional[list[str]]
     generated_content: Optional[dict[str, str]]
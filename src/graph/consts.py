@@ -38,3 +38,60 @@ PREDEFINED_TOPICS = [
     "politics",
     "news",
 ]
+
+
+# Per-topic freshness for stored content, in days: (soft age, hard age).
+# Older than soft: served immediately and refreshed in the background.
+# Older than hard: refreshed before answering.
+# Topics not listed use FRESHNESS_SOFT_DAYS / FRESHNESS_HARD_DAYS from settings.
+TOPIC_FRESHNESS_DAYS = {
+    "news": (1, 3),
+    "politics": (1, 3),
+    "finance": (1, 7),
+    "sports": (2, 7),
+    "tech": (3, 14),
+    "business": (3, 14),
+    "startup": (3, 14),
+    "gaming": (3, 14),
+    "marketing": (7, 30),
+    "fashion": (7, 30),
+    "music": (7, 30),
+    "science": (14, 60),
+    "health": (14, 60),
+    "cooking": (30, 90),
+    "food": (30, 90),
+    "travel": (30, 90),
+    "motivation": (30, 90),
+    "productivity": (30, 90),
+}
+
+
+# Subreddits to discover Reddit posts from for each topic, best first.
+# Topics not listed fall back to a search across all of Reddit.
+TOPIC_SUBREDDITS = {
+    "tech": ["technology", "programming", "gadgets", "artificial"],
+    "sports": ["sports", "nba", "soccer", "nfl"],
+    "fashion": ["fashion", "malefashionadvice", "femalefashionadvice"],
+    "food": ["food", "FoodPorn", "AskCulinary"],
+    "travel": ["travel", "solotravel", "TravelHacks"],
+    "health": ["Health", "nutrition", "medicine"],
+    "business": ["business", "Entrepreneur", "smallbusiness"],
+    "education": ["education", "Teachers", "learnprogramming"],
+    "science": ["science", "space", "EverythingScience"],
+    "art": ["Art", "ArtHistory", "learnart"],
+    "music": ["Music", "WeAreTheMusicMakers", "listentothis"],
+    "gaming": ["gaming", "Games", "pcgaming"],
+    "finance": ["finance", "personalfinance", "investing"],
+    "fitness": ["Fitness", "bodyweightfitness", "running"],
+    "cooking": ["Cooking", "recipes", "AskCulinary"],
+    "photography": ["photography", "photocritique", "AskPhotography"],
+    "design": ["Design", "graphic_design", "web_design"],
+    "marketing": ["marketing", "digital_marketing", "SEO"],
+    "startup": ["startups", "Entrepreneur", "SaaS"],
+    "career": ["careerguidance", "cscareerquestions", "jobs"],
+    "motivation": ["GetMotivated", "selfimprovement", "DecidingToBeBetter"],
+    "productivity": ["productivity", "getdisciplined", "Notion"],
+    "environment": ["environment", "climate", "sustainability"],
+    "politics": ["politics", "worldpolitics", "PoliticalDiscussion"],
+    "news": ["news", "worldnews", "UpliftingNews"],
+}
@@ -1,12 +1,13 @@
 from langgraph.graph import StateGraph, END
 from src.graph.nodes import (
     topic_extraction_node, check_db_node, ask_date_node,
-    find_url_node, core_text_extraction_node,
-    relevance_rating_node, fetch_from_db_node,
+    find_url_node, transcript_ingestion_node, core_text_extraction_node,
+    summarize_sources_node, relevance_rating_node, fetch_from_db_node,
     generate_contant_node
 )
 from src.dto.graph_dto import MessageGraph
 from src.config.logger import get_logger
+from src.config.settings import settings
 
 logger = get_logger("GraphRouting")
 
@@ -20,7 +21,11 @@ def build_graph() -> StateGraph:
     builder.add_node("CHECK_DB", check_db_node)
     builder.add_node("ASK_DATE_RELEVANT", ask_date_node)
     builder.add_node("FIND_URL", find_url_node)
+    if settings.youtube_transcripts_enabled:
+        builder.add_node("TRANSCRIPTS", transcript_ingestion_node)
     builder.add_node("CORE_TEXT", core_text_extraction_node)
+    if settings.extractive_summary_enabled:
+        builder.add_node("SUMMARIZE_SOURCES", summarize_sources_node)
     builder.add_node("RATE_RELEVANCE", relevance_rating_node)
     builder.add_node("FETCH_DB", fetch_from_db_node)
     builder.add_node("GENERATE_CONTENT", generate_contant_node)
@@ -104,8 +109,18 @@ def build_graph() -> StateGraph:
     )
 
     # Main content pipeline
-    builder.add_edge("FIND_URL", "CORE_TEXT")
-    builder.add_edge("CORE_TEXT", "RATE_RELEVANCE")
+    if settings.youtube_transcripts_enabled:
+        # Optional: use video transcripts instead of extracting YouTube pages
+        builder.add_edge("FIND_URL", "TRANSCRIPTS")
+        builder.add_edge("TRANSCRIPTS", "CORE_TEXT")
+    else:
+        builder.add_edge("FIND_URL", "CORE_TEXT")
+    if settings.extractive_summary_enabled:
+        # Optional: compress sources locally before rating and generation
+        builder.add_edge("CORE_TEXT", "SUMMARIZE_SOURCES")
+        builder.add_edge("SUMMARIZE_SOURCES", "RATE_RELEVANCE")
+    else:
+        builder.add_edge("CORE_TEXT", "RATE_RELEVANCE")
     builder.add_edge("RATE_RELEVANCE", "GENERATE_CONTENT")
     builder.add_edge("FETCH_DB", "GENERATE_CONTENT")
     builder.add_edge("GENERATE_CONTENT", END)
@@ -3,6 +3,8 @@ from .find_url_node import find_url_node
 from .check_in_db_node import check_db_node
 from .ask_reuse_db import ask_date_node
 from .fetch_contant_db_node import fetch_from_db_node
+from .transcript_ingestion_node import transcript_ingestion_node
 from .core_text_extraction_node import core_text_extraction_node
+from .summarize_sources_node import summarize_sources_node
 from .relevance_rating_node import relevance_rating_node
 from .generate_contant_node import generate_contant_node
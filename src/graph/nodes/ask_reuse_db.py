@@ -2,6 +2,7 @@ from datetime import datetime
 from src.dto.graph_dto import MessageGraph
 from langchain_core.messages import AIMessage, HumanMessage
 from src.config.logger import get_logger
+from src.services.speculation_service import start_speculative_prefetch, cancel_speculative_prefetch
 
 logger = get_logger("AskDateNode")
 
@@ -32,6 +33,8 @@ def ask_date_node(state: MessageGraph) -> dict:
     # If user has responded, parse yes/no
     if latest_message:
         if latest_message in ["yes", "y", "ok", "okay", "sure", "fine"]:
+            # Stored content accepted: the speculative refresh is not needed
+            cancel_speculative_prefetch(state.get("conversation_id"))
             return {"user_confirmed_date": True}
         elif latest_message in ["no", "n", "nope"]:
             return {"user_confirmed_date": False}
@@ -61,6 +64,8 @@ def ask_date_node(state: MessageGraph) -> dict:
             formatted_date = str(date) if date else ""
     
     logger.info(f"ASK_DATE_RELEVANT node executing: topic={topic}, date={date}, formatted_date={formatted_date}, db_content length={len(db_content)}")
+    # Start fresh discovery while the user thinks, in case they answer "no"
+    start_speculative_prefetch(state.get("conversation_id"), topic, state.get("details", ""))
     msg = AIMessage(content=f"I have existing data for '{topic}' from {formatted_date}. Is this date okay for you? (yes/no)")
     logger.info("Returning message to ask user about date")
     return {"messages": [msg]}  # This will pause for user input via graph routing
@@ -1,37 +1,101 @@
 from datetime import datetime, timedelta
 from langchain_core.messages import AIMessage
-from src.services.mongo_service import get_collection
+from src.services.mongo_service import (
+    find_recent_topic_documents, find_recent_details, find_recent_documents_by_details
+)
+from src.services.similarity_service import find_similar_details
+from src.services.dedup_service import find_near_duplicates
+from src.services.prewarm_service import record_topic_request
+from src.services.freshness_service import classify_content_age, schedule_background_refresh, STALE, EXPIRED
 from src.graph.consts import FIND_URL
 from src.config.logger import get_logger
+from src.config.settings import settings
 from src.dto.graph_dto import MessageGraph
 
 logger = get_logger("CheckRecentURLs")
 
 LOOKBACK_DAYS = 90
 
+def _find_documents_by_similar_details(topic: str, details: str, cutoff: datetime) -> list:
+    """
+    Find stored documents of the topic whose details are similar to the requested details.
+    
+    Args:
+        topic: Requested topic
+        details: Requested details
+        cutoff: Only documents on or after this date are considered
+    
+    Returns:
+        List of matching documents, newest first
+    """
+    candidates = find_recent_details(topic, cutoff)
+    matches = find_similar_details(details, candidates, settings.details_similarity_threshold)
+    if not matches:
+        return []
+    
+    logger.info(f"Details '{details}' matched stored details: {[(d, round(score, 2)) for d, score in matches]}")
+    return find_recent_documents_by_details(topic, [d for d, _ in matches], cutoff)
+
+
+def _apply_freshness_policy(topic: str, details: str, content: str, date: datetime) -> dict:
+    """
+    Stale-while-revalidate: serve fresh and stale content without asking the user,
+    refresh stale content in the background and force a refresh for expired content.
+    
+    Returns:
+        State update for the CHECK_DB node
+    """
+    age = classify_content_age(topic, date)
+    logger.info(f"Stored content for topic '{topic}' from {date} is {age}")
+    
+    if age == EXPIRED:
+        return {"topic_in_db": False}
+    
+    if age == STALE:
+        schedule_background_refresh(topic, details)
+    
+    # Content is served directly: mark it as confirmed so ASK_DATE_RELEVANT routes to FETCH_DB
+    return {
+        "topic_in_db": True,
+        "user_confirmed_date": True,
+        "db_content": content,
+        "date": date
+    }
+
+
 def check_db_node(state: MessageGraph) -> dict:
     """
-    Check if topic exists in the DB (Topic and data).
+    Check if similar content exists in the DB (Topic and data).
+    Matches on details similarity when details are given, otherwise on topic.
     Sets 'topic_in_db' True/False and stores db_content and date if found.
     Combines all core_text from multiple URLs into a single content string.
     """
-    from src.services.mongo_service import get_collection
-    
     topic = state.get("topic", "")
-    collection = get_collection("Topic and data")
-    if not topic or collection is None:
+    details = state.get("details", "")
+    if not topic:
         return {"topic_in_db": False}
 
+    # Remember the request so the pre-warmer can keep popular details warm
+    record_topic_request(topic, details)
+
     # Check for existing records in last 3 months
     now = datetime.utcnow()
     cutoff = now - timedelta(days=LOOKBACK_DAYS)
 
-    # Find all documents for this topic within the lookback period
-    docs = list(collection.find({"topic": topic, "date": {"$gte": cutoff}}).sort("date", -1))
+    # Find all documents for these details (or this topic) within the lookback period
+    if details:
+        docs = _find_documents_by_similar_details(topic, details, cutoff)
+    else:
+        docs = find_recent_topic_documents(topic, cutoff)
     
     if docs:
-        # Combine all core_text from multiple URLs into a single content string
-        core_texts = [doc.get("core_text", "") for doc in docs if doc.get("core_text")]
+        # Combine all core_text from multiple URLs into a single content string (near-duplicates once)
+        text_docs = [doc for doc in docs if doc.get("core_text")]
+        keep = find_near_duplicates(
+            [doc["core_text"] for doc in text_docs],
+            [doc.get("minhash_signature") for doc in text_docs]
+        )
+        core_texts = [text_docs[i]["core_text"] for i in keep]
         combined_content = "\n\n".join(core_texts) if core_texts else ""
         
         # Get the most recent date
@@ -39,6 +103,10 @@ def check_db_node(state: MessageGraph) -> dict:
         
         if combined_content:
             logger.info(f"Found {len(docs)} existing records for topic '{topic}' in DB")
+            
+            if settings.stale_while_revalidate_enabled:
+                return _apply_freshness_policy(topic, details, combined_content, most_recent_date)
+            
             logger.info(f"Setting topic_in_db=True, db_content length: {len(combined_content)} chars, date: {most_recent_date}")
             return {
                 "topic_in_db": True,
@@ -46,5 +114,5 @@ def check_db_node(state: MessageGraph) -> dict:
                 "date": most_recent_date
             }
     
-    logger.info(f"No existing records found for topic '{topic}' in DB")
+    logger.info(f"No existing records found for topic '{topic}', details '{details}' in DB")
     return {"topic_in_db": False}
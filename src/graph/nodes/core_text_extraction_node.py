@@ -2,23 +2,40 @@
 Core text extraction node - extracts relevant text from URLs using Tavily.
 """
 
+from datetime import datetime, timedelta
 from src.dto.graph_dto import MessageGraph
-from src.services.tavily_service import extract_core_text_from_urls
+from src.services.tavily_service import extract_core_texts_with_failures
+from src.services.mongo_service import find_stored_core_texts
+from src.services.freshness_service import get_freshness_policy
+from src.services.single_flight_service import run_single_flight
+from src.services.dedup_service import find_near_duplicates
 from src.config.logger import get_logger
 from langchain_core.messages import AIMessage
 
 logger = get_logger("CoreTextExtraction")
 
 
+def _extract_new_urls(urls: list[str], topic: str, details: str) -> dict:
+    """Extract URLs; results are (url, text) and (url, error) pairs so they can be shared across processes."""
+    texts, failed = extract_core_texts_with_failures(urls, topic, details)
+    return {"texts": list(texts.items()), "failed": [[url, error] for url, error in failed.items()]}
+
+
 def core_text_extraction_node(state: MessageGraph) -> dict:
     """
     Extract core relevant text from URLs.
+    URLs whose text is already stored for the topic and still fresh (not older than the
+    topic's soft freshness age) are reused, in fast mode Tavily URLs use the text
+    returned with their search result, and YouTube URLs with a transcript use the
+    transcript; only the remaining URLs are extracted.
+    Near-duplicate texts (syndicated or reposted articles) are collapsed to one.
     
     Args:
         state: The current graph state with URLs, topic, and details.
     
     Returns:
-        dict: Updated state with core texts.
+        dict: Updated state with core texts, the URL of each text, the reused URLs
+        and the URLs that failed to extract (with their error).
     """
     urls = state.get("urls", [])
     topic = state.get("topic", "")
@@ -27,21 +44,72 @@ def core_text_extraction_node(state: MessageGraph) -> dict:
     if not urls:
         logger.warning("No URLs found in state, cannot extract core text")
         return {
-            "core_texts": []
+            "core_texts": [],
+            "core_text_urls": []
         }
     
-    logger.info(f"Extracting core text from {len(urls)} URLs for topic: {topic}, details: {details}")
+    prefetched_core_texts = state.get("prefetched_core_texts")
+    if prefetched_core_texts:
+        logger.info(f"Using {len(prefetched_core_texts)} speculatively prefetched core texts for topic: {topic}")
+        return {
+            "urls": urls,
+            "topic": topic,
+            "details": details,
+            "core_texts": prefetched_core_texts,
+            "core_text_urls": state.get("prefetched_core_text_urls") or [],
+            "stored_text_urls": state.get("prefetched_stored_text_urls") or [],
+            "failed_results": state.get("prefetched_failed_results") or [],
+            "prefetched_core_texts": None,
+            "prefetched_core_text_urls": None,
+            "prefetched_stored_text_urls": None,
+            "prefetched_failed_results": None
+        }
     
-    # Extract core text from all URLs
-    core_text = extract_core_text_from_urls(urls, topic, details)
+    # Reuse fresh texts already stored for these URLs (stale ones are re-extracted,
+    # so a background revalidation actually refreshes them)
+    soft_days, _ = get_freshness_policy(topic)
+    stored_texts = find_stored_core_texts(topic, urls, datetime.utcnow() - timedelta(days=soft_days))
+    search_texts = {url: text for url, text in state.get("search_texts") or [] if url not in stored_texts}
+    transcripts = {
+        url: text for url, text in zip(state.get("video_urls") or [], state.get("transcripts") or [])
+        if url not in stored_texts
+    }
+    new_urls = [url for url in urls if url not in stored_texts and url not in search_texts and url not in transcripts]
     
-    # Store the extracted text in core_texts list
-    core_texts = [core_text] if core_text else []
+    logger.info(
+        f"Extracting core text from {len(new_urls)} new URLs ({len(stored_texts)} already stored, "
+        f"{len(search_texts)} from search results, {len(transcripts)} transcripts) for topic: {topic}, details: {details}"
+    )
+    
+    # Extract core text from new URLs (shared with concurrent requests for the same topic/details).
+    # Failed URLs are dropped; the pipeline continues with whatever was extracted.
+    extracted_texts = {}
+    failed_results = []
+    if new_urls:
+        extracted = run_single_flight(
+            "core_text", topic, details,
+            lambda: _extract_new_urls(new_urls, topic, details),
+            inputs=sorted(new_urls),
+        )
+        extracted_texts = dict(extracted["texts"])
+        failed_results = extracted["failed"]
+    
+    # Merge stored and new texts, in URL order
+    texts_by_url = {**stored_texts, **search_texts, **transcripts, **extracted_texts}
+    core_text_urls = [url for url in urls if texts_by_url.get(url)]
+    core_text_urls += [url for url in extracted_texts if url not in core_text_urls]
+    core_texts = [texts_by_url[url] for url in core_text_urls]
+
+    keep = find_near_duplicates(core_texts)
+    core_text_urls = [core_text_urls[i] for i in keep]
+    core_texts = [core_texts[i] for i in keep]
 
     return {
         "urls": urls,
         "topic": topic,
         "details": details,
-        "core_texts": core_texts
+        "core_texts": core_texts,
+        "core_text_urls": core_text_urls,
+        "stored_text_urls": list(stored_texts),
+        "failed_results": failed_results
     }
-
@@ -4,10 +4,18 @@ Find URL node - finds 2 viral URLs from the last month from each service (Tavily
 
 from datetime import datetime, timedelta
 from src.dto.graph_dto import MessageGraph
-from src.services.youtube_service import get_viral_urls_from_last_month
-from src.services.tavily_service import get_viral_urls_from_last_month
-from src.services.reddit_service import get_reddit_client, search_reddit_posts
+from src.services.youtube_service import get_viral_urls_from_last_month as get_viral_youtube_urls
+from src.services.tavily_service import get_viral_results_from_last_month, get_search_result_texts
+from src.services.reddit_service import (
+    get_reddit_client, search_reddit_posts_lean, get_routed_posts, merge_by_engagement, get_discussion_texts,
+    RedditPost
+)
+from src.services import async_reddit_service
+from src.services.single_flight_service import run_single_flight
+from src.services.speculation_service import take_speculative_prefetch
+from src.graph.consts import TOPIC_SUBREDDITS
 from src.config.logger import get_logger
+from src.config.settings import settings
 
 
 logger = get_logger("FindURL")
@@ -40,12 +48,13 @@ def _get_youtube_urls(topic: str, details: str, limit: int = 2) -> list[str]:
     Returns:
         List of YouTube video URLs
     """
-    return get_viral_urls_from_last_month(topic, details, limit)
+    return get_viral_youtube_urls(topic, details, limit)
 
 
-def _get_tavily_urls(topic: str, details: str, limit: int = 2) -> list[str]:
+def _get_tavily_results(topic: str, details: str, limit: int = 2) -> list[dict]:
     """
-    Get viral Tavily URLs from the last month.
+    Get viral Tavily search results from the last month.
+    In fast mode the page text is requested in the same search call.
     
     Args:
         topic: General topic category
@@ -53,14 +62,101 @@ def _get_tavily_urls(topic: str, details: str, limit: int = 2) -> list[str]:
         limit: Number of URLs to return
     
     Returns:
-        List of URLs from Tavily search results
+        List of Tavily search results
     """
-    return get_viral_urls_from_last_month(topic, details, limit)
+    return get_viral_results_from_last_month(
+        topic, details, limit, include_raw_content=settings.tavily_fast_mode_enabled
+    )
 
 
-def _get_reddit_urls(topic: str, details: str, limit: int = 2) -> list[str]:
+def _search_reddit_posts(query: str, limit: int) -> list[RedditPost]:
+    """
+    Search Reddit posts from the last month with the configured client
+    (async httpx client when REDDIT_CLIENT_MODE=async, otherwise praw).
+    """
+    if async_reddit_service.is_enabled():
+        try:
+            return async_reddit_service.run_reddit_coroutine(
+                async_reddit_service.search_reddit_posts(query, limit=limit, sort="hot", time_filter="month")
+            )
+        except TimeoutError:
+            logger.warning(f"Reddit search timed out for: {query}")
+            return []
+    
+    if not get_reddit_client():
+        logger.warning("Reddit client not available")
+        return []
+    return search_reddit_posts_lean(query, limit=limit, sort="hot", time_filter="month")
+
+
+def _get_routed_reddit_posts(topic: str, details: str) -> list[RedditPost]:
+    """
+    Get posts from the subreddits mapped to the topic (TOPIC_SUBREDDITS), fetched
+    concurrently and merged by normalized engagement.
+    
+    Args:
+        topic: General topic category
+        details: Specific details or sub-topics (searched within the subreddits)
+    
+    Returns:
+        List of RedditPost records, best first (empty if the topic has no mapping)
+    """
+    subreddits = TOPIC_SUBREDDITS.get(topic.lower(), [])[:settings.reddit_subreddits_per_topic]
+    if not settings.reddit_subreddit_routing_enabled or not subreddits:
+        return []
+    
+    limit = settings.reddit_routed_listing_limit
+    if async_reddit_service.is_enabled():
+        try:
+            listings = async_reddit_service.run_reddit_coroutine(
+                async_reddit_service.get_routed_posts(subreddits, query=details, limit=limit, time_filter="month")
+            )
+        except TimeoutError:
+            logger.warning(f"Reddit listings timed out for {', '.join('r/' + s for s in subreddits)}")
+            return []
+    elif not get_reddit_client():
+        logger.warning("Reddit client not available")
+        return []
+    else:
+        listings = get_routed_posts(subreddits, query=details, limit=limit, time_filter="month")
+    
+    logger.info(f"Fetched {sum(len(l) for l in listings)} posts from {', '.join('r/' + s for s in subreddits)}")
+    return merge_by_engagement(listings)
+
+
+def _select_reddit_urls(posts: list[RedditPost], limit: int, urls: list[str]) -> list[str]:
+    """
+    Add external URLs of recent posts with some engagement to urls, up to limit.
+    
+    Args:
+        posts: Posts in priority order
+        limit: Number of URLs wanted in total
+        urls: URLs selected so far (extended in place)
+    
+    Returns:
+        The urls list
+    """
+    for post in posts:
+        if len(urls) >= limit:
+            break
+        # The server-side filter is on a rolling window; keep the exact 30-day cut
+        if not _is_within_last_month(post.created_utc):
+            continue
+        
+        # Get external URL (not Reddit permalink)
+        url = post.url
+        if url and "reddit.com" not in url and url not in urls:
+            # Only include posts with some engagement (viral indicators)
+            if post.score > 10 or post.num_comments > 5:
+                urls.append(url)
+                logger.debug(f"Found Reddit URL: {url} (score: {post.score}, comments: {post.num_comments})")
+    return urls
+
+
+def _get_reddit_results(topic: str, details: str, limit: int = 2) -> tuple[list[str], list[RedditPost]]:
     """
     Get viral Reddit URLs from the last month.
+    Topic subreddits are tried first; a search across all of Reddit tops up the rest.
     
     Args:
         topic: General topic category
@@ -68,51 +164,69 @@ def _get_reddit_urls(topic: str, details: str, limit: int = 2) -> list[str]:
         limit: Number of URLs to return
     
     Returns:
-        List of Reddit post URLs (external URLs from posts, not Reddit permalinks)
+        Tuple of (Reddit post URLs - external URLs from posts, not Reddit permalinks -
+        and all posts fetched, for discussion harvesting)
     """
     logger.info(f"Searching Reddit for viral posts: {topic}, {details}")
     
-    reddit = get_reddit_client()
-    if not reddit:
-        logger.warning("Reddit client not available")
-        return []
-    
     try:
-        # Combine topic and details for search query
-        query = f"{topic} {details}".strip() if details else topic
+        posts = _get_routed_reddit_posts(topic, details)
+        urls = _select_reddit_urls(posts, limit, [])
         
-        # Search Reddit posts, sorted by hot (viral) or top
-        posts = search_reddit_posts(query, limit=limit * 5, sort="hot")
-        
-        # Filter posts from last month and prioritize by score (viral)
-        urls = []
-        for post in posts:
-            # Check if post is from last month
-            created_utc = post.get("created_utc", 0)
-            if not _is_within_last_month(created_utc):
-                continue
+        if len(urls) < limit:
+            # Combine topic and details for search query
+            query = f"{topic} {details}".strip() if details else topic
             
-            # Get external URL (not Reddit permalink)
-            url = post.get("url", "")
-            if url and "reddit.com" not in url and url not in urls:
-                # Prioritize high-scoring posts (viral)
-                score = post.get("score", 0)
-                num_comments = post.get("num_comments", 0)
-                
-                # Only include posts with some engagement (viral indicators)
-                if score > 10 or num_comments > 5:
-                    urls.append(url)
-                    logger.debug(f"Found Reddit URL: {url} (score: {score}, comments: {num_comments})")
-                    
-                    if len(urls) >= limit:
-                        break
+            # Search Reddit posts from the last month (filtered server-side), sorted by hot (viral)
+            searched = _search_reddit_posts(query, limit=limit * 5)
+            _select_reddit_urls(searched, limit, urls)
+            posts = posts + searched
         
         logger.info(f"Found {len(urls)} Reddit URLs from last month")
-        return urls[:limit]
+        return urls[:limit], posts
         
     except Exception as e:
         logger.error(f"Error searching Reddit: {e}", exc_info=True)
+        return [], []
+
+
+def _get_reddit_discussions(posts: list[RedditPost], limit: int) -> list[list[str]]:
+    """
+    Harvest the most discussed recent threads as text sources (title, post text and top comments).
+    
+    Args:
+        posts: Candidate posts
+        limit: Number of threads to harvest
+    
+    Returns:
+        List of [permalink, discussion text] pairs
+    """
+    threads = []
+    seen = set()
+    for post in sorted(posts, key=lambda p: p.num_comments, reverse=True):
+        if len(threads) >= limit:
+            break
+        if post.permalink in seen or post.num_comments <= 5 or not _is_within_last_month(post.created_utc):
+            continue
+        seen.add(post.permalink)
+        threads.append(post)
+    if not threads:
         return []
+    
+    comment_limit = settings.reddit_discussion_comment_limit
+    try:
+        if async_reddit_service.is_enabled():
+            discussions = async_reddit_service.run_reddit_coroutine(
+                async_reddit_service.get_discussion_texts(threads, comment_limit)
+            )
+        else:
+            discussions = get_discussion_texts(threads, comment_limit)
+    except Exception as e:
+        logger.error(f"Error harvesting Reddit discussions: {e}", exc_info=True)
+        return []
+    
+    logger.info(f"Harvested {len(discussions)} Reddit discussions")
+    return discussions
 
 
 def find_url_node(state: MessageGraph) -> dict:
@@ -138,19 +252,60 @@ def find_url_node(state: MessageGraph) -> dict:
     
     logger.info(f"Finding viral URLs for topic: {topic}, details: {details}")
     
+    # Reuse the speculative prefetch started while the user was asked about stored data
+    prefetched = take_speculative_prefetch(state.get("conversation_id"), topic, details)
+    if prefetched and prefetched["urls"]:
+        return {
+            "urls": prefetched["urls"],
+            "prefetched_core_texts": prefetched["core_texts"],
+            "prefetched_core_text_urls": prefetched["core_text_urls"],
+            "prefetched_stored_text_urls": prefetched.get("stored_text_urls", []),
+            "prefetched_failed_results": prefetched.get("failed_results", [])
+        }
+    
+    # Concurrent requests for the same topic/details share one discovery run
+    discovered = run_single_flight("find_url", topic, details, lambda: _discover_urls(topic, details, MAX_URLS))
+    
+    return {
+        "urls": discovered["urls"],
+        "search_texts": discovered["search_texts"]
+    }
+
+
+def _discover_urls(topic: str, details: str, limit: int) -> dict:
+    """
+    Get viral URLs from each service and combine them.
+    
+    Args:
+        topic: General topic category
+        details: Specific details or sub-topics
+        limit: Number of URLs to take from each service
+    
+    Returns:
+        Dict with the combined "urls" and "search_texts": (url, text) pairs whose text
+        replaces extraction - Tavily search results in fast mode and Reddit discussions
+    """
     # Get URLs from each service (2 from each)
-    tavily_urls = _get_tavily_urls(topic, details, limit=MAX_URLS)
-    youtube_urls = _get_youtube_urls(topic, details, limit=MAX_URLS)
-    reddit_urls = _get_reddit_urls(topic, details, limit=MAX_URLS)
+    tavily_results = _get_tavily_results(topic, details, limit=limit)
+    tavily_urls = [result["url"] for result in tavily_results]
+    youtube_urls = _get_youtube_urls(topic, details, limit=limit)
+    reddit_urls, reddit_posts = _get_reddit_results(topic, details, limit=limit)
+    
+    discussions = []
+    if settings.reddit_discussions_enabled:
+        discussions = _get_reddit_discussions(reddit_posts, settings.reddit_discussion_threads)
     
-    # Combine all URLs into a single list
-    all_urls = tavily_urls + youtube_urls + reddit_urls
+    # Combine all URLs into a single list (discussion threads are keyed by permalink)
+    all_urls = tavily_urls + youtube_urls + reddit_urls + [url for url, _ in discussions]
     
     total_urls = len(all_urls)
     
-    logger.info(f"Found {total_urls} total URLs: {len(tavily_urls)} from Tavily, {len(youtube_urls)} from YouTube, {len(reddit_urls)} from Reddit")
+    logger.info(f"Found {total_urls} total URLs: {len(tavily_urls)} from Tavily, {len(youtube_urls)} from YouTube, {len(reddit_urls)} from Reddit, {len(discussions)} Reddit discussions")
     
-    return {
-        "urls": all_urls
-    }
+    search_texts = []
+    if settings.tavily_fast_mode_enabled:
+        search_texts = [
+            [url, text] for url, text in get_search_result_texts(tavily_results, settings.tavily_snippet_min_chars).items()
+        ]
+    return {"urls": all_urls, "search_texts": search_texts + discussions}
 
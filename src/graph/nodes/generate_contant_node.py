@@ -5,7 +5,7 @@ Content generation node - generates both LinkedIn posts and Instagram/TikTok vid
 import threading
 from langchain_core.messages import AIMessage
 from src.dto.graph_dto import MessageGraph
-from src.services.openai_service import generate_linkedin_content, generate_video_script, truncate_source_content
+from src.services.openai_service import generate_linkedin_content, generate_video_script, prepare_source_content
 from src.config.logger import get_logger
 
 logger = get_logger("GenerateContent")
@@ -36,8 +36,8 @@ def generate_contant_node(state: MessageGraph) -> dict:
         }
     
     try:
-        # Truncate source content once before generating both
-        truncated_content = truncate_source_content(source_content)
+        # Fit source content once before generating both (map-reduce digest or truncation)
+        truncated_content = prepare_source_content(topic, details, source_content)
         
         # Generate both LinkedIn content and video script in parallel using threads
         linkedin_content = None
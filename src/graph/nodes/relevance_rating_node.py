@@ -1,20 +1,77 @@
 from datetime import datetime
+from typing import Optional
 from langchain_core.messages import AIMessage
 from src.dto.graph_dto import MessageGraph
-from src.services.openai_service import rate_relevance
+from src.services.openai_service import rate_relevance_batch
 from src.services.mongo_service import save_relevance_data
+from src.services.single_flight_service import run_single_flight
 from src.config.logger import get_logger
 
 logger = get_logger("RelevanceRating")
 
+def _rate_and_save(user_message: str, sources: list[tuple], topic: str, details: str, stored_urls: list[str],
+                   summaries: Optional[list[str]] = None) -> list[str]:
+    """
+    Rate all sources in one call, keep the top 2 texts and save newly extracted sources to the DB.
+    
+    Args:
+        user_message: The user's original request
+        sources: (url, core_text) pairs
+        topic: Topic
+        details: Details
+        stored_urls: URLs whose text came from the DB (not saved again)
+        summaries: Optional compressed text of each source; rated and returned instead of
+            the core text, while the full core text is what gets saved
+    
+    Returns:
+        List of the top rated texts (summaries when given)
+    """
+    if not summaries or len(summaries) != len(sources):
+        summaries = [text for _, text in sources]
+    scores = rate_relevance_batch(user_message, summaries)
+    scored_texts = [
+        {"url": url, "text": text, "summary": summary, "score": score}
+        for (url, text), summary, score in zip(sources, summaries, scores)
+    ]
+
+    # Save to DB: one record per newly extracted URL with its own core_text and score
+    current_date = datetime.utcnow()
+    for scored in scored_texts:
+        url = scored["url"]
+        if not url or url in stored_urls:
+            continue
+        try:
+            save_relevance_data(
+                topic=topic,
+                details=details,
+                url=url,
+                core_text=scored["text"],
+                date=current_date,
+                relevance_score=scored["score"]
+            )
+            logger.info(f"Saved relevance data to DB: topic='{topic}', url={url}")
+        except Exception as e:
+            logger.error(f"Failed to save relevance data for URL {url}: {e}", exc_info=True)
+            # Continue with other URLs even if one fails
+
+    # Sort by score descending
+    scored_texts.sort(key=lambda x: x["score"], reverse=True)
+    return [x["summary"] for x in scored_texts[:2]]
+
+
 def relevance_rating_node(state: MessageGraph) -> dict:
     """
-    Rate relevance of core texts to user request.
-    Keep top 2 most relevant URLs for content generation.
-    Save topic, details, urls, core_text, and date to DB for each URL/core_text combination.
+    Rate relevance of each core text to user request (one batched rating call).
+    Keep top 2 most relevant texts for content generation.
+    Save topic, details, url, core_text, score and date to DB for each newly extracted URL.
+    When sources were summarized, the summaries are rated and kept for generation, and
+    the original core texts are saved.
+    Concurrent requests for the same topic/details and the same message and sources share one rating run (and one DB save).
     """
     core_texts = state.get("core_texts", [])
-    urls = state.get("urls", [])
+    core_text_urls = state.get("core_text_urls") or []
+    summarized_texts = state.get("summarized_texts") or None
+    stored_urls = state.get("stored_text_urls") or []
     topic = state.get("topic", "")
     details = state.get("details", "")
     
@@ -24,37 +81,16 @@ def relevance_rating_node(state: MessageGraph) -> dict:
             user_message = msg.content
             break
 
-    scored_texts = []
-    for text in core_texts:
-        score = rate_relevance(user_message, text).relevance_score
-        scored_texts.append({"text": text, "score": score})
-
-    # Sort by score descending
-    scored_texts.sort(key=lambda x: x["score"], reverse=True)
-    top_texts = [x["text"] for x in scored_texts[:2]]
+    # Pair each text with its URL (texts without a known URL are rated but not saved)
+    if len(core_text_urls) != len(core_texts):
+        core_text_urls = [None] * len(core_texts)
+    sources = list(zip(core_text_urls, core_texts))
 
-    # Save to DB: for each URL and core_text combination
-    # Save one record per URL with its corresponding core_text
-    current_date = datetime.utcnow()
-    
-    if urls and top_texts:
-        # Combine all top texts into one core_text (since extraction returns combined text)
-        combined_core_text = "\n\n".join(top_texts) if len(top_texts) > 1 else (top_texts[0] if top_texts else "")
-        
-        # Save one record per URL, each with the combined core_text
-        for url in urls:
-            try:
-                save_relevance_data(
-                    topic=topic,
-                    details=details,
-                    url=url,
-                    core_text=combined_core_text,
-                    date=current_date
-                )
-                logger.info(f"Saved relevance data to DB: topic='{topic}', url={url}")
-            except Exception as e:
-                logger.error(f"Failed to save relevance data for URL {url}: {e}", exc_info=True)
-                # Continue with other URLs even if one fails
+    top_texts = run_single_flight(
+        "relevance", topic, details,
+        lambda: _rate_and_save(user_message, sources, topic, details, stored_urls, summarized_texts),
+        inputs={"user_message": user_message, "sources": sources, "stored_urls": sorted(stored_urls)},
+    )
 
     msg = AIMessage(content=f"Kept top {len(top_texts)} relevant texts for content generation.")
     return {"core_texts": top_texts, "messages": [msg]}
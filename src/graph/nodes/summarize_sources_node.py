@@ -0,0 +1,43 @@
+"""
+Source summarization node - compresses each core text with the local extractive summarizer.
+"""
+
+import time
+from langchain_core.messages import AIMessage
+from src.dto.graph_dto import MessageGraph
+from src.services.summarizer_service import summarize_text, estimate_tokens
+from src.services import metrics_service
+from src.config.logger import get_logger
+from src.config.settings import settings
+
+logger = get_logger("SummarizeSources")
+
+
+def summarize_sources_node(state: MessageGraph) -> dict:
+    """
+    Compress each core text to its most central sentences before relevance rating and generation.
+    Summaries go to summarized_texts in the same positions as core_texts; the original
+    core texts are left in place so the relevance node saves the full text to the DB.
+    
+    Args:
+        state: The current graph state with core texts.
+    
+    Returns:
+        dict: Updated state with the compressed texts.
+    """
+    core_texts = state.get("core_texts", [])
+    if not core_texts:
+        return {"summarized_texts": []}
+    
+    started = time.perf_counter()
+    summaries = [summarize_text(text, settings.summary_max_tokens_per_source) for text in core_texts]
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    
+    tokens_before = sum(estimate_tokens(text) for text in core_texts)
+    tokens_after = sum(estimate_tokens(text) for text in summaries)
+    metrics_service.observe("summarizer.duration_ms", elapsed_ms)
+    metrics_service.increment("summarizer.tokens_saved", tokens_before - tokens_after)
+    logger.info(f"Summarized {len(core_texts)} sources from ~{tokens_before} to ~{tokens_after} tokens in {elapsed_ms:.0f} ms")
+    
+    msg = AIMessage(content=f"Compressed {len(core_texts)} sources from ~{tokens_before} to ~{tokens_after} tokens.")
+    return {"summarized_texts": summaries, "messages": [msg]}
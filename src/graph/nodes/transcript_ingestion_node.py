@@ -0,0 +1,40 @@
+"""
+Transcript ingestion node - fetches captions for the discovered YouTube videos.
+"""
+
+from src.dto.graph_dto import MessageGraph
+from src.services.youtube_service import extract_video_id, fetch_transcripts
+from src.config.logger import get_logger
+
+logger = get_logger("TranscriptIngestion")
+
+
+def transcript_ingestion_node(state: MessageGraph) -> dict:
+    """
+    Fetch transcripts for the YouTube URLs found by FIND_URL.
+    Video pages extract to little more than page chrome, so the core text stage uses
+    these transcripts instead of extracting the pages.
+    
+    Args:
+        state: The current graph state with URLs.
+    
+    Returns:
+        dict: Updated state with the video URLs that have a transcript and,
+        at the same positions, their transcripts.
+    """
+    if state.get("prefetched_core_texts"):
+        # Core texts were already prefetched; nothing left to extract
+        return {"video_urls": [], "transcripts": []}
+    
+    video_urls = [url for url in state.get("urls") or [] if extract_video_id(url)]
+    if not video_urls:
+        return {"video_urls": [], "transcripts": []}
+    
+    transcripts = fetch_transcripts(video_urls)
+    found = [url for url in video_urls if url in transcripts]
+    logger.info(f"Found transcripts for {len(found)}/{len(video_urls)} videos")
+    
+    return {
+        "video_urls": found,
+        "transcripts": [transcripts[url] for url in found]
+    }
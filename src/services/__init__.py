@@ -1,6 +1,6 @@
 from .graph_factory_service import route_input_to_graph
 from .mongo_service import get_collection, save_user_input, generate_conversation_id, save_url_with_topic
-from .openai_service import extract_topic_and_details, generate_video_script, generate_linkedin_content, rate_relevance
+from .openai_service import extract_topic_and_details, generate_video_script, generate_linkedin_content, rate_relevance, rate_relevance_batch
 from .print_graph_service import get_graph_png_path
 from .tavily_service import search_tavily, extract_core_text_from_urls, extract_core_text, verify_facts, get_viral_urls_from_last_month
 from .youtube_service import get_youtube_client, get_viral_urls_from_last_month
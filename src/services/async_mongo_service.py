@@ -0,0 +1,133 @@
+"""
+Async MongoDB data access layer for nodes and API handlers.
+Mirrors the sync functions in mongo_service using pymongo's AsyncMongoClient,
+so database calls do not block the event loop or hold threadpool slots.
+"""
+
+import threading
+from datetime import datetime
+from typing import Optional, Any
+from src.config.logger import get_logger
+from src.config.settings import settings
+from src.services.mongo_service import _client_options, build_relevance_document
+
+logger = get_logger("AsyncMongo")
+
+_async_client: Optional[Any] = None
+_async_collections: dict = {}
+_client_lock = threading.Lock()
+
+
+def _get_async_client() -> Any:
+    """
+    Get or create the async MongoDB client.
+    The client is bound to the event loop it is first used on (the server's loop).
+
+    Returns:
+        AsyncMongoClient instance.
+    """
+    global _async_client
+
+    if _async_client is not None:
+        return _async_client
+
+    with _client_lock:
+        if _async_client is None:
+            from pymongo import AsyncMongoClient
+            _async_collections.clear()
+            # Own pool metrics prefix: the sync client's listener reports under "mongo.pool"
+            _async_client = AsyncMongoClient(settings.mongodb_uri, **_client_options("mongo.async_pool"))
+            logger.info(f"Async MongoDB client initialized (maxPoolSize={settings.mongodb_max_pool_size})")
+    return _async_client
+
+
+def get_collection(collection_name: str = "inputs"):
+    """
+    Get async MongoDB collection instance.
+    Collection handles are cached per name; no network round trip happens here.
+
+    Args:
+        collection_name: Name of the collection. Defaults to "inputs".
+
+    Returns:
+        AsyncCollection instance or None if the client cannot be created.
+    """
+    if not settings.mongodb_uri:
+        logger.warning("MONGODB_URI not configured")
+        return None
+
+    try:
+        client = _get_async_client()
+        collection = _async_collections.get(collection_name)
+        if collection is None:
+            collection = client[settings.mongodb_db_name][collection_name]
+            _async_collections[collection_name] = collection
+            logger.debug(f"Created async MongoDB collection handle '{collection_name}'")
+        return collection
+    except Exception as e:
+        logger.error(f"Async MongoDB client initialization failed: {e}", exc_info=True)
+        return None
+
+
+async def save_relevance_data(topic: str, details: str, url: str, core_text: str, date: datetime = None,
+                              relevance_score: float = None) -> None:
+    """
+    Save relevance data to MongoDB (Topic and data) without blocking the event loop.
+
+    Args:
+        topic (str): The topic.
+        details (str): The details.
+        url (str): The URL.
+        core_text (str): The core text extracted from the URL.
+        date (datetime, optional): The date. Defaults to current UTC time.
+        relevance_score (float, optional): Relevance of the core text to the request.
+    """
+    collection = get_collection("Topic and data")
+    if collection is None:
+        logger.warning("MongoDB collection not available, skipping save")
+        return
+
+    try:
+        document = build_relevance_document(topic, details, url, core_text, date, relevance_score)
+        await collection.insert_one(document)
+        logger.info(f"Relevance data saved to 'Topic and data' collection: topic='{topic}', URL: {url}")
+    except Exception as e:
+        logger.error(f"MongoDB insertion failed for relevance data: {e}", exc_info=True)
+        # Don't raise exception, just log error to avoid breaking the workflow
+
+
+async def find_recent_topic_documents(topic: str, since: datetime) -> list:
+    """
+    Find stored relevance data (Topic and data) for a topic, newest first.
+
+    Args:
+        topic (str): The topic.
+        since (datetime): Only documents with a date on or after this are returned.
+
+    Returns:
+        list: Matching documents, or an empty list if the collection is not available or the lookup fails.
+    """
+    collection = get_collection("Topic and data")
+    if collection is None:
+        logger.warning("MongoDB collection not available, skipping topic lookup")
+        return []
+
+    try:
+        cursor = collection.find({"topic": topic, "date": {"$gte": since}}).sort("date", -1)
+        return await cursor.to_list(length=None)
+    except Exception as e:
+        logger.error(f"Failed to look up stored documents for topic '{topic}': {e}")
+        return []
+
+
+async def close_client() -> None:
+    """Close the async MongoDB client (called on application shutdown)."""
+    global _async_client
+
+    with _client_lock:
+        client = _async_client
+        _async_client = None
+        _async_collections.clear()
+    if client is not None:
+        await client.close()
+        logger.info("Async MongoDB client closed")
@@ -0,0 +1,327 @@
+"""
+Async Reddit API service on httpx (alternative to the praw-based reddit_service).
+Uses the application-only OAuth flow with the token cached until shortly before it
+expires, and one pooled AsyncClient (from the shared transport, with its metrics and
+HTTP/2 support) so connections are reused across requests.
+The client lives on a dedicated event loop thread, so sync graph nodes can call it
+through run_reddit_coroutine without blocking on praw.
+"""
+
+import asyncio
+import re
+import threading
+import time
+from typing import List, Optional, Dict, Any
+import httpx
+from src.config.logger import get_logger
+from src.config.settings import settings
+from src.services import http_transport_service
+from src.services.circuit_breaker_service import get_breaker
+from src.services.reddit_service import RedditPost, parse_listing, build_discussion_text, MAX_LISTING_LIMIT
+
+logger = get_logger("AsyncReddit")
+
+# Refresh the OAuth token this long before Reddit expires it
+_TOKEN_REFRESH_MARGIN_SECONDS = 60
+_POST_ID_PATTERN = re.compile(r"/comments/([a-z0-9]+)", re.IGNORECASE)
+
+_http_client: Optional[httpx.AsyncClient] = None
+_token = {"value": None, "expires_at": 0.0}
+_token_lock: Optional[asyncio.Lock] = None
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_thread: Optional[threading.Thread] = None
+_loop_lock = threading.Lock()
+
+
+def is_enabled() -> bool:
+    """Whether the async client is selected (REDDIT_CLIENT_MODE=async) and configured."""
+    return (
+        settings.reddit_client_mode == "async"
+        and bool(settings.reddit_client_id)
+        and bool(settings.reddit_client_secret)
+    )
+
+
+def _get_http_client() -> httpx.AsyncClient:
+    """
+    Get or create the pooled HTTP client.
+    Must be called on the event loop that uses it.
+
+    Returns:
+        httpx.AsyncClient instance.
+    """
+    global _http_client
+
+    if _http_client is None:
+        _http_client = http_transport_service.create_async_client(
+            timeout=httpx.Timeout(settings.reddit_http_timeout_seconds, connect=settings.http_connect_timeout_seconds),
+            limits=httpx.Limits(
+                max_connections=settings.reddit_http_max_connections,
+                max_keepalive_connections=settings.reddit_http_max_connections,
+                keepalive_expiry=settings.http_keepalive_expiry_seconds
+            ),
+            headers={"User-Agent": settings.reddit_user_agent or "multiagent-rag-app/1.0"},
+        )
+        logger.info(f"Async Reddit HTTP client initialized (max_connections={settings.reddit_http_max_connections})")
+    return _http_client
+
+
+async def _get_token() -> str:
+    """
+    Get an application-only OAuth token, reusing it until shortly before it expires.
+
+    Returns:
+        Access token
+    """
+    global _token_lock
+
+    if _token["value"] and time.monotonic() < _token["expires_at"]:
+        return _token["value"]
+
+    if _token_lock is None:
+        _token_lock = asyncio.Lock()
+    async with _token_lock:
+        # Another coroutine may have refreshed it while this one waited
+        if _token["value"] and time.monotonic() < _token["expires_at"]:
+            return _token["value"]
+
+        response = await _get_http_client().post(
+            settings.reddit_auth_url,
+            data={"grant_type": "client_credentials"},
+            auth=(settings.reddit_client_id, settings.reddit_client_secret),
+        )
+        response.raise_for_status()
+        payload = response.json()
+        _token["value"] = payload["access_token"]
+        _token["expires_at"] = time.monotonic() + payload.get("expires_in", 3600) - _TOKEN_REFRESH_MARGIN_SECONDS
+        logger.info("Reddit OAuth token refreshed")
+        return _token["value"]
+
+
+async def _get_json(path: str, params: Dict[str, Any]) -> Any:
+    """
+    GET an OAuth API path and return the JSON body (through the Reddit circuit breaker).
+    """
+    return await get_breaker("reddit").call_async(_get_json_with_token, path, params)
+
+
+async def _get_json_with_token(path: str, params: Dict[str, Any]) -> Any:
+    """
+    GET an OAuth API path and return the JSON body.
+    A 401 (token revoked early) refreshes the token and retries once.
+    """
+    url = f"{settings.reddit_api_base_url.rstrip('/')}{path}"
+    params = {**params, "raw_json": 1}
+    for attempt in range(2):
+        token = await _get_token()
+        response = await _get_http_client().get(url, params=params, headers={"Authorization": f"bearer {token}"})
+        if response.status_code == 401 and attempt == 0:
+            _token["value"] = None
+            continue
+        response.raise_for_status()
+        return response.json()
+
+
+async def search_reddit_posts(query: str, subreddit: Optional[str] = None, limit: int = 10, sort: str = "hot",
+                              time_filter: str = "month") -> List[RedditPost]:
+    """
+    Search Reddit for posts matching the query.
+
+    Args:
+        query: Search query string
+        subreddit: Optional subreddit name to search within (defaults to all of Reddit)
+        limit: Maximum number of posts to return (at most 100)
+        sort: Sort order - "hot", "new", "top", "relevance", "comments"
+        time_filter: Server-side time window - "hour", "day", "week", "month", "year", "all"
+
+    Returns:
+        List of RedditPost records
+    """
+    logger.info(f"Searching Reddit (async) for: {query}, subreddit: {subreddit or 'all'}")
+    try:
+        payload = await _get_json(f"/r/{subreddit or 'all'}/search", {
+            "q": query,
+            "sort": sort,
+            "t": time_filter,
+            "limit": min(limit, MAX_LISTING_LIMIT),
+            "restrict_sr": "on" if subreddit else "off",
+        })
+        posts = parse_listing(payload)
+        logger.info(f"Successfully found {len(posts)} Reddit posts")
+        return posts
+    except Exception as e:
+        logger.error(f"Error searching Reddit: {e}", exc_info=True)
+        return []
+
+
+async def get_subreddit_posts(subreddit: str, limit: int = 10, sort: str = "hot",
+                              time_filter: str = "month") -> List[RedditPost]:
+    """
+    Get posts from a specific subreddit.
+
+    Args:
+        subreddit: Subreddit name (e.g., "python", "technology")
+        limit: Maximum number of posts to return (at most 100)
+        sort: Sort order - "hot", "new", "top"
+        time_filter: Time window for "top" - "hour", "day", "week", "month", "year", "all"
+
+    Returns:
+        List of RedditPost records
+    """
+    if sort not in ("hot", "new", "top"):
+        sort = "hot"  # Default to hot
+    logger.info(f"Fetching posts from r/{subreddit} (async), sort: {sort}")
+    try:
+        payload = await _get_json(f"/r/{subreddit}/{sort}", {"limit": min(limit, MAX_LISTING_LIMIT), "t": time_filter})
+        posts = parse_listing(payload)
+        logger.info(f"Successfully fetched {len(posts)} posts from r/{subreddit}")
+        return posts
+    except Exception as e:
+        logger.error(f"Error fetching subreddit posts: {e}", exc_info=True)
+        return []
+
+
+async def get_post_comments(post_url: str, limit: int = 10) -> List[Dict[str, Any]]:
+    """
+    Get top-level comments from a Reddit post ("more comments" placeholders are skipped).
+
+    Args:
+        post_url: Reddit post URL or permalink
+        limit: Maximum number of top-level comments to return
+
+    Returns:
+        List of dictionaries containing comment information
+    """
+    match = _POST_ID_PATTERN.search(post_url)
+    if not match:
+        logger.warning(f"Not a Reddit post URL: {post_url}")
+        return []
+
+    logger.info(f"Fetching comments from post (async): {post_url}")
+    try:
+        payload = await _get_json(f"/comments/{match.group(1)}", {"limit": limit, "depth": 1, "sort": "top"})
+        # Response is [post listing, comment listing]
+        children = payload[1]["data"]["children"] if isinstance(payload, list) and len(payload) > 1 else []
+
+        comments = []
+        for child in children:
+            if child.get("kind") != "t1":
+                continue
+            data = child["data"]
+            comments.append({
+                "body": (data.get("body") or "")[:500],  # Limit text length
+                "score": data.get("score", 0),
+                "author": data.get("author") or "[deleted]",
+                "created_utc": data.get("created_utc", 0),
+            })
+            if len(comments) >= limit:
+                break
+
+        logger.info(f"Successfully fetched {len(comments)} comments")
+        return comments
+    except Exception as e:
+        logger.error(f"Error fetching post comments: {e}", exc_info=True)
+        return []
+
+
+async def get_routed_posts(subreddits: List[str], query: str = "", limit: int = 10,
+                           time_filter: str = "month") -> List[List[RedditPost]]:
+    """
+    Fetch listings from several subreddits concurrently (see reddit_service.get_routed_posts).
+
+    Args:
+        subreddits: Subreddit names
+        query: Optional search query
+        limit: Maximum number of posts per subreddit
+        time_filter: Server-side time window
+
+    Returns:
+        One list of RedditPost records per subreddit, in the same order
+    """
+    if query:
+        calls = [search_reddit_posts(query, subreddit=s, limit=limit, sort="top", time_filter=time_filter) for s in subreddits]
+    else:
+        calls = [get_subreddit_posts(s, limit=limit, sort="top", time_filter=time_filter) for s in subreddits]
+    return list(await asyncio.gather(*calls))
+
+
+async def get_discussion_texts(posts: List[RedditPost], comment_limit: int = 8) -> List[List[str]]:
+    """
+    Fetch top comments for several threads concurrently (see reddit_service.get_discussion_texts).
+
+    Args:
+        posts: Threads to harvest
+        comment_limit: Maximum number of top-level comments per thread
+
+    Returns:
+        List of [permalink, discussion text] pairs, in the order of posts
+    """
+    semaphore = asyncio.Semaphore(settings.reddit_comment_concurrency)
+
+    async def harvest(post: RedditPost) -> List[str]:
+        async with semaphore:
+            comments = await get_post_comments(post.permalink, comment_limit)
+        return [post.permalink, build_discussion_text(post, comments)]
+
+    return list(await asyncio.gather(*(harvest(post) for post in posts)))
+
+
+def _get_loop() -> asyncio.AbstractEventLoop:
+    """Get or start the event loop thread that owns the HTTP client."""
+    global _loop, _loop_thread
+
+    if _loop is not None:
+        return _loop
+
+    with _loop_lock:
+        if _loop is None:
+            loop = asyncio.new_event_loop()
+            _loop_thread = threading.Thread(target=loop.run_forever, name="async-reddit", daemon=True)
+            _loop_thread.start()
+            _loop = loop
+            logger.info("Async Reddit event loop started")
+    return _loop
+
+
+def run_reddit_coroutine(coroutine, timeout: Optional[float] = None) -> Any:
+    """
+    Run one of this module's coroutines from sync code (e.g. a graph node) and wait for it.
+    On timeout the coroutine is cancelled, so its requests do not keep running on the loop.
+
+    Args:
+        coroutine: Coroutine to run on the Reddit event loop
+        timeout: Seconds to wait (defaults to twice the HTTP timeout)
+
+    Returns:
+        The coroutine's result
+
+    Raises:
+        TimeoutError: If the coroutine did not finish in time
+    """
+    future = asyncio.run_coroutine_threadsafe(coroutine, _get_loop())
+    try:
+        return future.result(timeout or settings.reddit_http_timeout_seconds * 2)
+    except TimeoutError:
+        future.cancel()
+        raise
+
+
+def close_client() -> None:
+    """Close the HTTP client and stop the event loop thread (called on application shutdown)."""
+    global _http_client, _loop, _loop_thread, _token_lock
+
+    with _loop_lock:
+        loop, thread = _loop, _loop_thread
+        _loop = _loop_thread = None
+    if loop is None:
+        return
+
+    if _http_client is not None:
+        asyncio.run_coroutine_threadsafe(_http_client.aclose(), loop).result(timeout=5)
+    _http_client = None
+    _token_lock = None
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(timeout=5)
+    loop.close()
+    logger.info("Async Reddit client closed")
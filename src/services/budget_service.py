@@ -0,0 +1,213 @@
+"""
+Daily quota and cost budgets for the external APIs: YouTube quota units, Tavily credits
+and OpenAI tokens. Services reserve the cost of a call before making it (and release it
+if the call fails) or report it afterwards when it is only known then, and check the
+budget level before expensive calls, so they can downgrade (basic depth, cache-only,
+skip the source) before the provider starts rejecting requests. Budgets reset at midnight UTC.
+
+The ledger is shared by all workers: one MongoDB document per (source, day) in
+"API budget", updated with atomic $inc. While MongoDB is not available, each process
+falls back to its own in-memory counters.
+"""
+
+import threading
+from datetime import datetime
+from typing import Dict
+from src.config.logger import get_logger
+from src.config.settings import settings
+from src.services import metrics_service
+
+logger = get_logger("Budget")
+
+YOUTUBE = "youtube"
+TAVILY = "tavily"
+OPENAI = "openai"
+
+# Budget levels: past the soft limit services downgrade, at the hard limit they skip the call
+OK = "ok"
+SOFT = "soft"
+HARD = "hard"
+
+# YouTube Data API quota cost per call
+YOUTUBE_SEARCH_UNITS = 100
+YOUTUBE_LIST_UNITS = 1
+# Tavily credits per search by depth; extraction costs one credit per 5 URLs
+TAVILY_SEARCH_CREDITS = {"basic": 1, "advanced": 2}
+TAVILY_URLS_PER_EXTRACT_CREDIT = 5
+
+_UNITS = {YOUTUBE: "quota_units", TAVILY: "credits", OPENAI: "tokens"}
+
+_lock = threading.Lock()
+_state = {"day": None}
+_spent: Dict[str, float] = {}
+
+
+def _daily_budget(source: str) -> float:
+    """Daily budget of a source, from settings."""
+    return {
+        YOUTUBE: settings.budget_youtube_daily_units,
+        TAVILY: settings.budget_tavily_daily_credits,
+        OPENAI: settings.budget_openai_daily_tokens,
+    }[source]
+
+
+def _today() -> str:
+    """Budget day (ISO date, UTC)."""
+    return datetime.utcnow().date().isoformat()
+
+
+def _roll_day(today: str) -> None:
+    """Start a new in-memory budget day at midnight UTC. Must be called with _lock held."""
+    if _state["day"] != today:
+        _state["day"] = today
+        _spent.clear()
+
+
+def _ledger():
+    """MongoDB ledger functions (imported lazily: mongo_service imports services that report costs)."""
+    from src.services import mongo_service
+    return mongo_service
+
+
+def _level(source: str, spent: float) -> str:
+    """Budget level for an amount spent."""
+    budget = _daily_budget(source)
+    if spent >= budget:
+        return HARD
+    if spent >= budget * settings.budget_soft_limit_ratio:
+        return SOFT
+    return OK
+
+
+def _spent_today(day: str) -> Dict[str, float]:
+    """Spend per source for a day, from the shared ledger or the in-memory fallback."""
+    spent = _ledger().find_budget_spend(day)
+    if spent is not None:
+        return spent
+    with _lock:
+        _roll_day(day)
+        return dict(_spent)
+
+
+def _report(source: str, amount: float, spent: float) -> None:
+    """Update spend metrics and log when an amount moved a source to another budget level."""
+    metrics_service.increment(f"budget.{source}.spent", amount)
+    metrics_service.set_gauge(f"budget.{source}.remaining", max(_daily_budget(source) - spent, 0))
+    if _level(source, spent - amount) != _level(source, spent):
+        logger.warning(f"{source} budget reached its {_level(source, spent)} limit ({spent:.0f}/{_daily_budget(source)} {_UNITS[source]})")
+
+
+def record(source: str, amount: float) -> None:
+    """
+    Report the cost of a call that is only known afterwards (e.g. OpenAI tokens),
+    or refund part of a reservation with a negative amount.
+
+    Args:
+        source: YOUTUBE, TAVILY or OPENAI
+        amount: Cost in the source's unit (quota units, credits or tokens)
+    """
+    if not settings.budget_enabled or amount == 0:
+        return
+    day = _today()
+    spent = _ledger().add_budget_spend(source, day, amount)
+    if spent is None:
+        with _lock:
+            _roll_day(day)
+            _spent[source] = _spent.get(source, 0.0) + amount
+            spent = _spent[source]
+    _report(source, amount, spent)
+
+
+def reserve(source: str, cost: float) -> bool:
+    """
+    Reserve the cost of a call if it fits the remaining daily budget.
+    The check and the charge are one atomic step, so concurrent callers cannot overspend;
+    release the cost if the call then fails.
+
+    Args:
+        source: YOUTUBE, TAVILY or OPENAI
+        cost: Expected cost of the call
+
+    Returns:
+        False if the call would exceed the hard limit (the call should be skipped)
+    """
+    if not settings.budget_enabled:
+        return True
+    day = _today()
+    budget = _daily_budget(source)
+    result = _ledger().reserve_budget(source, day, cost, budget)
+    if result is None:
+        with _lock:
+            _roll_day(day)
+            spent = _spent.get(source, 0.0)
+            reserved = spent + cost <= budget
+            if reserved:
+                spent = _spent[source] = spent + cost
+        result = (reserved, spent)
+    reserved, spent = result
+    if not reserved:
+        metrics_service.increment(f"budget.{source}.denied")
+        logger.warning(f"Skipping {source} call: daily budget spent ({spent:.0f}/{budget} {_UNITS[source]})")
+        return False
+    _report(source, cost, spent)
+    return True
+
+
+def release(source: str, cost: float) -> None:
+    """
+    Give back a reservation whose call failed (rejected or failed calls are not billed).
+
+    Args:
+        source: YOUTUBE, TAVILY or OPENAI
+        cost: The reserved cost
+    """
+    if not settings.budget_enabled or cost <= 0:
+        return
+    record(source, -cost)
+
+
+def get_level(source: str) -> str:
+    """
+    Get the budget level of a source.
+
+    Args:
+        source: YOUTUBE, TAVILY or OPENAI
+
+    Returns:
+        OK, SOFT (past the soft limit: downgrade) or HARD (budget spent: skip)
+    """
+    if not settings.budget_enabled:
+        return OK
+    return _level(source, _spent_today(_today()).get(source, 0.0))
+
+
+def get_budget_status() -> dict:
+    """
+    Get today's usage and remaining budget per source.
+
+    Returns:
+        dict: Budget day and, per source, unit, daily budget, soft limit, spent, remaining and level.
+    """
+    day = _today()
+    spent = _spent_today(day)
+
+    sources = {}
+    for source, unit in _UNITS.items():
+        budget = _daily_budget(source)
+        used = spent.get(source, 0.0)
+        sources[source] = {
+            "unit": unit,
+            "daily_budget": budget,
+            "soft_limit": budget * settings.budget_soft_limit_ratio,
+            "spent": used,
+            "remaining": max(budget - used, 0),
+            "level": _level(source, used) if settings.budget_enabled else OK,
+        }
+    return {"enabled": settings.budget_enabled, "day": day, "sources": sources}
+
+
+def reset_budget() -> None:
+    """Clear today's in-memory usage (the shared ledger is not touched)."""
+    with _lock:
+        _state["day"] = None
+        _spent.clear()
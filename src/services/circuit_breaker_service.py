@@ -0,0 +1,217 @@
+"""
+Circuit breakers for external dependencies (Tavily, YouTube, Reddit, OpenAI, MongoDB).
+A breaker tracks the outcome of the last calls to one dependency. When the failure rate
+crosses the threshold it opens and rejects calls immediately with CircuitOpenError, so an
+outage costs no timeout per request. After the reset timeout one probe call is let
+through (half-open): success closes the breaker, failure opens it again.
+Only outage errors count as failures (timeouts, connection errors, 5xx responses);
+client errors such as a 404 for an unknown subreddit pass through without an outcome.
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Optional
+from src.config.logger import get_logger
+from src.config.settings import settings
+from src.services import metrics_service
+
+logger = get_logger("CircuitBreaker")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+_breakers: Dict[str, "CircuitBreaker"] = {}
+_registry_lock = threading.Lock()
+
+
+# Exception class names (in the MRO) that signal an outage across the client libraries:
+# requests/httpx/openai timeouts and connection errors, pymongo AutoReconnect and
+# ServerSelectionTimeoutError, prawcore ServerError, openai InternalServerError
+_OUTAGE_NAME_MARKERS = ("Timeout", "Connect", "NetworkError", "AutoReconnect", "ServerError", "ServiceUnavailable")
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a dependency whose breaker is open."""
+
+
+def _status_code(exc: BaseException) -> Optional[int]:
+    """HTTP status of an error raised for a response (requests, httpx, googleapiclient, openai, praw)."""
+    for holder in (exc, getattr(exc, "response", None), getattr(exc, "resp", None)):
+        for attr in ("status_code", "status"):
+            value = getattr(holder, attr, None)
+            if isinstance(value, int):
+                return value
+    return None
+
+
+def is_outage_error(exc: BaseException) -> bool:
+    """
+    Whether an error means the dependency is unavailable (and counts against its breaker).
+
+    Args:
+        exc: Exception raised by the dependency call
+
+    Returns:
+        True for timeouts, connection errors and 5xx responses; False for client and application errors
+    """
+    if isinstance(exc, (TimeoutError, ConnectionError)):
+        return True
+    status = _status_code(exc)
+    if status is not None:
+        return status >= 500
+    if any(marker in cls.__name__ for cls in type(exc).__mro__ for marker in _OUTAGE_NAME_MARKERS):
+        return True
+    # Wrapped transport errors (e.g. prawcore RequestException.original_exception)
+    cause = getattr(exc, "original_exception", None) or exc.__cause__
+    return isinstance(cause, BaseException) and cause is not exc and is_outage_error(cause)
+
+
+class CircuitBreaker:
+    """Failure-rate circuit breaker for one dependency (thread-safe)."""
+
+    def __init__(self, name: str, failure_rate_threshold: float, window_size: int, min_calls: int,
+                 reset_timeout_seconds: float):
+        self.name = name
+        self.failure_rate_threshold = failure_rate_threshold
+        self.min_calls = min_calls
+        self.reset_timeout_seconds = reset_timeout_seconds
+        self._outcomes = deque(maxlen=window_size)
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+        metrics_service.set_gauge(f"circuit.{name}.state", CLOSED)
+
+    @property
+    def state(self) -> str:
+        """Current state: CLOSED, OPEN or HALF_OPEN."""
+        with self._lock:
+            return self._state
+
+    def _set_state(self, state: str) -> None:
+        """Change state and report it. Must be called with _lock held."""
+        if state == self._state:
+            return
+        logger.warning(f"Circuit '{self.name}' {self._state} -> {state}")
+        self._state = state
+        metrics_service.set_gauge(f"circuit.{self.name}.state", state)
+        metrics_service.increment(f"circuit.{self.name}.{state}")
+
+    def _before_call(self) -> None:
+        """Let the call through or raise CircuitOpenError."""
+        with self._lock:
+            if self._state == OPEN and time.monotonic() - self._opened_at >= self.reset_timeout_seconds:
+                self._set_state(HALF_OPEN)
+            if self._state == OPEN or (self._state == HALF_OPEN and self._probe_in_flight):
+                metrics_service.increment(f"circuit.{self.name}.rejected")
+                raise CircuitOpenError(f"Circuit '{self.name}' is open")
+            if self._state == HALF_OPEN:
+                self._probe_in_flight = True
+
+    def _after_call(self, success: Optional[bool]) -> None:
+        """Record the outcome of a call (None: no outcome) and update the state."""
+        with self._lock:
+            if success is None:
+                self._probe_in_flight = False
+                return
+            if self._state == HALF_OPEN:
+                self._probe_in_flight = False
+                self._outcomes.clear()
+                if success:
+                    self._set_state(CLOSED)
+                else:
+                    self._opened_at = time.monotonic()
+                    self._set_state(OPEN)
+                return
+
+            self._outcomes.append(success)
+            failures = self._outcomes.count(False)
+            if (
+                self._state == CLOSED
+                and len(self._outcomes) >= self.min_calls
+                and failures / len(self._outcomes) >= self.failure_rate_threshold
+            ):
+                self._opened_at = time.monotonic()
+                self._set_state(OPEN)
+
+    def call(self, fn: Callable, *args, **kwargs) -> Any:
+        """
+        Call fn through the breaker.
+
+        Args:
+            fn: Function that calls the dependency
+            *args, **kwargs: Arguments for fn
+
+        Returns:
+            fn's result
+
+        Raises:
+            CircuitOpenError: If the breaker is open (fn is not called)
+        """
+        if not settings.circuit_breaker_enabled:
+            return fn(*args, **kwargs)
+        self._before_call()
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as e:
+            # Client and application errors say nothing about availability
+            self._after_call(False if is_outage_error(e) else None)
+            raise
+        except BaseException:
+            # Cancelled or interrupted: no outcome, but free the half-open probe slot
+            self._after_call(None)
+            raise
+        self._after_call(True)
+        return result
+
+    async def call_async(self, fn: Callable, *args, **kwargs) -> Any:
+        """Await the coroutine function fn through the breaker (see call)."""
+        if not settings.circuit_breaker_enabled:
+            return await fn(*args, **kwargs)
+        self._before_call()
+        try:
+            result = await fn(*args, **kwargs)
+        except Exception as e:
+            # Client and application errors say nothing about availability
+            self._after_call(False if is_outage_error(e) else None)
+            raise
+        except BaseException:
+            # Cancelled or interrupted: no outcome, but free the half-open probe slot
+            self._after_call(None)
+            raise
+        self._after_call(True)
+        return result
+
+
+def get_breaker(name: str) -> CircuitBreaker:
+    """
+    Get or create the breaker for a dependency (configured from settings).
+
+    Args:
+        name: Dependency name (e.g., "tavily", "youtube", "reddit", "openai", "mongo")
+
+    Returns:
+        CircuitBreaker instance
+    """
+    breaker = _breakers.get(name)
+    if breaker is not None:
+        return breaker
+
+    with _registry_lock:
+        if name not in _breakers:
+            _breakers[name] = CircuitBreaker(
+                name,
+                failure_rate_threshold=settings.circuit_failure_rate_threshold,
+                window_size=settings.circuit_window_size,
+                min_calls=settings.circuit_min_calls,
+                reset_timeout_seconds=settings.circuit_reset_timeout_seconds,
+            )
+        return _breakers[name]
+
+
+def reset_breakers() -> None:
+    """Forget all breakers (they are recreated closed on next use)."""
+    with _registry_lock:
+        _breakers.clear()
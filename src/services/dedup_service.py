@@ -0,0 +1,138 @@
+"""
+Near-duplicate detection for extracted source texts.
+Texts are split into word shingles and summarized as MinHash signatures computed with
+NumPy; the share of equal signature positions estimates the Jaccard similarity of two
+texts. Signatures are persisted with the documents, so hashing must be stable across processes.
+"""
+
+import re
+import zlib
+from typing import List, Optional
+import numpy as np
+from src.config.logger import get_logger
+from src.config.settings import settings
+from src.services import metrics_service
+
+logger = get_logger("Dedup")
+
+NUM_PERMUTATIONS = 64
+SHINGLE_SIZE = 5
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+_MERSENNE_PRIME = np.uint64((1 << 31) - 1)
+_MAX_HASH = np.uint64((1 << 31) - 1)
+
+# Fixed seed: the permutations must be identical in every process that reads stored signatures
+_rng = np.random.default_rng(20240917)
+_PERM_A = _rng.integers(1, int(_MERSENNE_PRIME), size=NUM_PERMUTATIONS, dtype=np.uint64)
+_PERM_B = _rng.integers(0, int(_MERSENNE_PRIME), size=NUM_PERMUTATIONS, dtype=np.uint64)
+
+
+def _shingle_hashes(text: str) -> np.ndarray:
+    """
+    Hash the distinct word shingles of a text.
+
+    Args:
+        text: Text to shingle
+
+    Returns:
+        uint64 array of 31-bit shingle hashes (empty for empty text)
+    """
+    tokens = _TOKEN_PATTERN.findall((text or "").lower())
+    if not tokens:
+        return np.zeros(0, dtype=np.uint64)
+
+    size = min(SHINGLE_SIZE, len(tokens))
+    shingles = {" ".join(tokens[i:i + size]) for i in range(len(tokens) - size + 1)}
+    hashes = np.fromiter((zlib.crc32(s.encode("utf-8")) for s in shingles), dtype=np.uint64, count=len(shingles))
+    return hashes & _MAX_HASH
+
+
+def minhash_signature(text: str) -> np.ndarray:
+    """
+    Compute the MinHash signature of a text.
+
+    Args:
+        text: Text to sign
+
+    Returns:
+        uint64 vector of length NUM_PERMUTATIONS (all _MAX_HASH for empty text)
+    """
+    hashes = _shingle_hashes(text)
+    if hashes.size == 0:
+        return np.full(NUM_PERMUTATIONS, _MAX_HASH, dtype=np.uint64)
+
+    # (a * x + b) mod p for every permutation and shingle at once; a, x < 2^31 so nothing overflows
+    permuted = (_PERM_A[:, None] * hashes[None, :] + _PERM_B[:, None]) % _MERSENNE_PRIME
+    return permuted.min(axis=1)
+
+
+def signature_to_list(signature: np.ndarray) -> List[int]:
+    """Convert a signature to a list of ints for storage in MongoDB."""
+    return [int(x) for x in signature]
+
+
+def _stored_signature(stored: Optional[list], text: str) -> np.ndarray:
+    """Use the persisted signature if it matches the current size, otherwise recompute it."""
+    if stored is not None and len(stored) == NUM_PERMUTATIONS:
+        return np.asarray(stored, dtype=np.uint64)
+    return minhash_signature(text)
+
+
+def pairwise_similarities(signatures: np.ndarray) -> np.ndarray:
+    """
+    Estimate the Jaccard similarity between every pair of signatures.
+
+    Args:
+        signatures: Matrix of shape (n, NUM_PERMUTATIONS)
+
+    Returns:
+        Matrix of shape (n, n) with estimated similarities
+    """
+    if signatures.size == 0:
+        return np.zeros((0, 0), dtype=np.float32)
+    return (signatures[:, None, :] == signatures[None, :, :]).mean(axis=2)
+
+
+def find_near_duplicates(texts: List[str], signatures: Optional[List[Optional[list]]] = None,
+                         threshold: Optional[float] = None) -> List[int]:
+    """
+    Pick one text per group of near-duplicates.
+    Within a group the longest text is kept; empty texts are never treated as duplicates.
+
+    Args:
+        texts: Texts to compare
+        signatures: Optional persisted signatures, one per text (None entries are recomputed)
+        threshold: Minimum estimated similarity to count as duplicates (defaults to settings)
+
+    Returns:
+        Indices of the texts to keep, in their original order
+    """
+    if threshold is None:
+        threshold = settings.near_duplicate_threshold
+    if len(texts) < 2:
+        return list(range(len(texts)))
+
+    signatures = signatures or [None] * len(texts)
+    matrix = np.vstack([_stored_signature(sig, text) for sig, text in zip(signatures, texts)])
+    similar = pairwise_similarities(matrix) >= threshold
+    empty = np.array([not (text or "").strip() for text in texts])
+    similar[empty, :] = False
+    similar[:, empty] = False
+
+    # Longest first, so each group is represented by its fullest text
+    order = sorted(range(len(texts)), key=lambda i: len(texts[i] or ""), reverse=True)
+    dropped = np.zeros(len(texts), dtype=bool)
+    for i in order:
+        if dropped[i]:
+            continue
+        duplicates = similar[i] & ~dropped
+        duplicates[i] = False
+        dropped |= duplicates
+
+    keep = [i for i in range(len(texts)) if not dropped[i]]
+    removed = len(texts) - len(keep)
+    if removed:
+        metrics_service.increment("dedup.near_duplicates_removed", removed)
+        logger.info(f"Collapsed {removed} near-duplicate texts out of {len(texts)}")
+    return keep
@@ -0,0 +1,136 @@
+"""
+Stale-while-revalidate policy for stored topic content (Topic and data).
+Classifies stored content as fresh, stale or expired using per-topic soft and hard
+ages, and refreshes stale content in the background for the next caller.
+"""
+
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from functools import lru_cache
+from typing import Optional, Tuple
+from src.config.logger import get_logger
+from src.config.settings import settings
+from src.graph.consts import TOPIC_FRESHNESS_DAYS
+from src.services import metrics_service
+from src.services.single_flight_service import normalize_key
+
+logger = get_logger("Freshness")
+
+FRESH = "fresh"
+STALE = "stale"
+EXPIRED = "expired"
+
+# Background refreshes are cheap to queue but expensive to run; keep them few
+_MAX_BACKGROUND_REFRESHES = 2
+
+_lock = threading.Lock()
+_executor: Optional[ThreadPoolExecutor] = None
+_refreshing: set = set()
+
+
+@lru_cache(maxsize=4)
+def _parse_overrides(raw: str) -> dict:
+    """
+    Parse TOPIC_FRESHNESS_OVERRIDES (JSON: {"news": [1, 3], ...}).
+    Cached per settings value: the policy is looked up for every stored document.
+    """
+    if not raw:
+        return {}
+    try:
+        overrides = json.loads(raw)
+        return {topic: (float(soft), float(hard)) for topic, (soft, hard) in overrides.items()}
+    except (ValueError, TypeError) as e:
+        logger.warning(f"Invalid TOPIC_FRESHNESS_OVERRIDES, ignoring: {e}")
+        return {}
+
+
+def get_freshness_policy(topic: str) -> Tuple[float, float]:
+    """
+    Get the soft and hard age (days) for a topic.
+
+    Args:
+        topic: Topic
+
+    Returns:
+        Tuple of (soft_days, hard_days)
+    """
+    overrides = _parse_overrides(settings.topic_freshness_overrides)
+    if topic in overrides:
+        return overrides[topic]
+    return TOPIC_FRESHNESS_DAYS.get(topic, (settings.freshness_soft_days, settings.freshness_hard_days))
+
+
+def classify_content_age(topic: str, date: datetime, now: Optional[datetime] = None) -> str:
+    """
+    Classify stored content by age.
+
+    Args:
+        topic: Topic of the content
+        date: Date the content was stored (naive UTC, as stored in Mongo)
+        now: Current time (defaults to utcnow)
+
+    Returns:
+        FRESH, STALE or EXPIRED
+    """
+    if not isinstance(date, datetime):
+        return EXPIRED
+
+    now = now or datetime.utcnow()
+    age_days = (now - date).total_seconds() / 86400
+    soft_days, hard_days = get_freshness_policy(topic)
+
+    if age_days > hard_days:
+        return EXPIRED
+    if age_days > soft_days:
+        return STALE
+    return FRESH
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Get or create the background refresh thread pool."""
+    global _executor
+
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=_MAX_BACKGROUND_REFRESHES, thread_name_prefix="revalidate")
+    return _executor
+
+
+def _refresh(key: str, topic: str, details: str) -> None:
+    """Refresh stored content and clear the in-progress marker."""
+    from src.services.prewarm_service import refresh_topic
+
+    try:
+        stored = refresh_topic(topic, details)
+        metrics_service.increment("freshness.background_refreshed")
+        logger.info(f"Background refresh stored {stored} documents for topic '{topic}', details '{details}'")
+    except Exception as e:
+        metrics_service.increment("freshness.background_failed")
+        logger.error(f"Background refresh failed for topic '{topic}': {e}", exc_info=True)
+    finally:
+        with _lock:
+            _refreshing.discard(key)
+
+
+def schedule_background_refresh(topic: str, details: str) -> bool:
+    """
+    Refresh stale content in the background (at most one refresh per topic/details).
+
+    Args:
+        topic: Topic
+        details: Details
+
+    Returns:
+        True if a refresh was scheduled, False if one is already running
+    """
+    key = normalize_key("revalidate", topic, details)
+    with _lock:
+        if key in _refreshing:
+            return False
+        _refreshing.add(key)
+
+    _get_executor().submit(_refresh, key, topic, details)
+    metrics_service.increment("freshness.background_scheduled")
+    logger.info(f"Scheduled background refresh for topic '{topic}', details '{details}'")
+    return True
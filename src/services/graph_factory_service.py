@@ -64,7 +64,7 @@ def route_input_to_graph(req: UserMessage) -> ChatResponse:
         del _state_registry[conversation_id]
     else:
         # Start fresh with just the new message
-        input_state = {"messages": [user_message]}
+        input_state = {"messages": [user_message], "conversation_id": conversation_id}
 
     # Invoke the graph
     updated_state = graph.invoke(input_state)
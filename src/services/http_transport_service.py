@@ -0,0 +1,255 @@
+"""
+Shared HTTP transport for the external API clients.
+Instead of every client library keeping its own connection pool (and paying a new TCP
+and TLS handshake whenever its pool is cold), the services get their HTTP clients here:
+
+- create_session(): a requests.Session for Tavily and praw. Each service gets its own
+  session (headers and cookies stay separate), but all of them share one mounted
+  adapter, so connections to a host are pooled and kept alive across services.
+- get_client(): one shared httpx.Client (OpenAI, YouTube captions) with keep-alive
+  limits and HTTP/2 when the h2 package is installed.
+- create_async_client(): httpx.AsyncClient with the same limits, timeouts and metrics,
+  for asyncio services that own their client (async Reddit).
+
+All of them use the same connect and read timeouts and report
+http.handshake_ms (TCP + TLS setup of a new connection), http.connections_opened and
+http.pool_wait_ms (time waiting for a pooled connection).
+The YouTube Data API client runs on httplib2, which cannot use these pools; it keeps
+its per-thread connections (see youtube_service).
+"""
+
+import importlib.util
+import threading
+import time
+from typing import Any, Optional
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from src.config.logger import get_logger
+from src.config.settings import settings
+from src.services import metrics_service
+
+logger = get_logger("HttpTransport")
+
+_lock = threading.Lock()
+_client: Optional[httpx.Client] = None
+_adapter: Optional[HTTPAdapter] = None
+
+
+def _record_handshake(started: float) -> None:
+    """Report a newly opened connection and how long its setup took."""
+    metrics_service.increment("http.connections_opened")
+    metrics_service.observe("http.handshake_ms", (time.perf_counter() - started) * 1000)
+
+
+def _record_pool_wait(started: float) -> None:
+    """Report how long a request waited for a pooled connection."""
+    metrics_service.observe("http.pool_wait_ms", (time.perf_counter() - started) * 1000)
+
+
+def http2_enabled() -> bool:
+    """Whether httpx clients negotiate HTTP/2 (enabled in settings and the h2 package is installed)."""
+    return settings.http_http2_enabled and importlib.util.find_spec("h2") is not None
+
+
+def get_timeout() -> httpx.Timeout:
+    """Shared timeouts: a short connect timeout, and the read/write/pool timeout for everything else."""
+    return httpx.Timeout(settings.http_timeout_seconds, connect=settings.http_connect_timeout_seconds)
+
+
+def get_limits() -> httpx.Limits:
+    """Shared connection pool limits and keep-alive expiry."""
+    return httpx.Limits(
+        max_connections=settings.http_max_connections,
+        max_keepalive_connections=settings.http_max_keepalive_connections,
+        keepalive_expiry=settings.http_keepalive_expiry_seconds,
+    )
+
+
+# --- requests (urllib3) ---
+
+class _MeteredHTTPConnection(HTTPConnection):
+    """urllib3 connection that reports its setup time."""
+
+    def connect(self) -> None:
+        started = time.perf_counter()
+        super().connect()
+        _record_handshake(started)
+
+
+class _MeteredHTTPSConnection(HTTPSConnection):
+    """urllib3 TLS connection that reports its setup time (TCP and TLS handshake)."""
+
+    def connect(self) -> None:
+        started = time.perf_counter()
+        super().connect()
+        _record_handshake(started)
+
+
+class _MeteredHTTPConnectionPool(HTTPConnectionPool):
+    """urllib3 pool that reports how long requests wait for a connection."""
+    ConnectionCls = _MeteredHTTPConnection
+
+    def _get_conn(self, timeout: Optional[float] = None) -> Any:
+        started = time.perf_counter()
+        try:
+            return super()._get_conn(timeout)
+        finally:
+            _record_pool_wait(started)
+
+
+class _MeteredHTTPSConnectionPool(HTTPSConnectionPool):
+    """urllib3 TLS pool that reports how long requests wait for a connection."""
+    ConnectionCls = _MeteredHTTPSConnection
+
+    def _get_conn(self, timeout: Optional[float] = None) -> Any:
+        started = time.perf_counter()
+        try:
+            return super()._get_conn(timeout)
+        finally:
+            _record_pool_wait(started)
+
+
+class _PooledAdapter(HTTPAdapter):
+    """Adapter with metered connection pools and the shared timeouts as default."""
+
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _MeteredHTTPConnectionPool,
+            "https": _MeteredHTTPSConnectionPool,
+        }
+
+    def send(self, request: Any, **kwargs: Any) -> requests.Response:
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = (settings.http_connect_timeout_seconds, settings.http_timeout_seconds)
+        return super().send(request, **kwargs)
+
+
+def _get_adapter() -> HTTPAdapter:
+    """Get or create the adapter shared by all sessions."""
+    global _adapter
+
+    if _adapter is None:
+        with _lock:
+            if _adapter is None:
+                _adapter = _PooledAdapter(
+                    pool_connections=settings.http_max_connections,
+                    pool_maxsize=settings.http_max_keepalive_connections,
+                )
+    return _adapter
+
+
+def create_session() -> requests.Session:
+    """
+    Create a requests session on the shared connection pools.
+
+    Returns:
+        requests.Session with the shared adapter mounted for http and https
+    """
+    session = requests.Session()
+    adapter = _get_adapter()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+# --- httpx ---
+
+class _ConnectionTracer:
+    """
+    httpcore trace callback for one request: the wait for a pooled connection ends when
+    the request starts connecting or sending, and a handshake lasts from the start of
+    the TCP connect until the request is sent on the new connection.
+    """
+
+    def __init__(self) -> None:
+        self._started = time.perf_counter()
+        self._connect_started: Optional[float] = None
+        self._waited = False
+
+    def __call__(self, event_name: str, info: dict) -> None:
+        connecting = event_name == "connection.connect_tcp.started"
+        sending = event_name.endswith(".send_request_headers.started")
+        if not self._waited and (connecting or sending):
+            self._waited = True
+            _record_pool_wait(self._started)
+        if connecting:
+            self._connect_started = time.perf_counter()
+        elif sending and self._connect_started is not None:
+            _record_handshake(self._connect_started)
+            self._connect_started = None
+
+    async def trace_async(self, event_name: str, info: dict) -> None:
+        self(event_name, info)
+
+
+def _trace_request(request: httpx.Request) -> None:
+    """Request hook attaching a connection tracer (sync clients)."""
+    request.extensions["trace"] = _ConnectionTracer()
+
+
+async def _trace_request_async(request: httpx.Request) -> None:
+    """Request hook attaching a connection tracer (async clients)."""
+    request.extensions["trace"] = _ConnectionTracer().trace_async
+
+
+def get_client() -> httpx.Client:
+    """
+    Get or create the shared httpx client (shared across threads).
+
+    Returns:
+        httpx.Client instance
+    """
+    global _client
+
+    if _client is None:
+        with _lock:
+            if _client is None:
+                _client = httpx.Client(
+                    http2=http2_enabled(),
+                    timeout=get_timeout(),
+                    limits=get_limits(),
+                    event_hooks={"request": [_trace_request]},
+                )
+                logger.info(
+                    f"Shared HTTP client initialized (http2={http2_enabled()}, "
+                    f"max_connections={settings.http_max_connections})"
+                )
+    return _client
+
+
+def create_async_client(**kwargs: Any) -> httpx.AsyncClient:
+    """
+    Create an httpx async client with the shared pool settings and metrics.
+    Async clients are bound to the event loop that uses them, so the caller owns and closes it.
+
+    Args:
+        **kwargs: httpx.AsyncClient arguments overriding the shared defaults (e.g. timeout, headers)
+
+    Returns:
+        httpx.AsyncClient instance
+    """
+    options = {
+        "http2": http2_enabled(),
+        "timeout": get_timeout(),
+        "limits": get_limits(),
+        "event_hooks": {"request": [_trace_request_async]},
+    }
+    options.update(kwargs)
+    return httpx.AsyncClient(**options)
+
+
+def close() -> None:
+    """Close the shared client and connection pools (called on application shutdown)."""
+    global _client, _adapter
+
+    with _lock:
+        if _client is not None:
+            _client.close()
+            _client = None
+        if _adapter is not None:
+            _adapter.close()
+            _adapter = None
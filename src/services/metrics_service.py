@@ -0,0 +1,81 @@
+"""
+In-process metrics registry for counters and timings.
+"""
+
+import threading
+from typing import Dict, Any
+
+_lock = threading.Lock()
+_counters: Dict[str, float] = {}
+_timings: Dict[str, Dict[str, float]] = {}
+_gauges: Dict[str, Any] = {}
+
+
+def increment(name: str, value: float = 1) -> None:
+    """
+    Increment a counter metric.
+
+    Args:
+        name: Metric name (e.g., "mongo.pool.checkout_failed")
+        value: Amount to add to the counter
+    """
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + value
+
+
+def observe(name: str, value: float) -> None:
+    """
+    Record a single observation (e.g., a duration in milliseconds).
+    Keeps count, sum and max so the average and worst case can be reported.
+
+    Args:
+        name: Metric name (e.g., "mongo.pool.checkout_wait_ms")
+        value: Observed value
+    """
+    with _lock:
+        timing = _timings.get(name)
+        if timing is None:
+            timing = {"count": 0, "sum": 0.0, "max": 0.0}
+            _timings[name] = timing
+        timing["count"] += 1
+        timing["sum"] += value
+        timing["max"] = max(timing["max"], value)
+
+
+def set_gauge(name: str, value: Any) -> None:
+    """
+    Set a gauge metric to its current value.
+
+    Args:
+        name: Metric name (e.g., "mongo.pool.checked_out")
+        value: Current value
+    """
+    with _lock:
+        _gauges[name] = value
+
+
+def get_metrics() -> dict:
+    """
+    Get a snapshot of all recorded metrics.
+
+    Returns:
+        dict: Counters, gauges and timings (with computed averages).
+    """
+    with _lock:
+        timings = {
+            name: {**timing, "avg": timing["sum"] / timing["count"] if timing["count"] else 0.0}
+            for name, timing in _timings.items()
+        }
+        return {
+            "counters": dict(_counters),
+            "gauges": dict(_gauges),
+            "timings": timings,
+        }
+
+
+def reset_metrics() -> None:
+    """Clear all recorded metrics."""
+    with _lock:
+        _counters.clear()
+        _timings.clear()
+        _gauges.clear()
@@ -1,11 +1,18 @@
 import os
+import threading
 from datetime import datetime
+from typing import Optional
 from dotenv import load_dotenv
-from pymongo import MongoClient, errors
+from pymongo import MongoClient, ReturnDocument, errors
+from pymongo.monitoring import ConnectionPoolListener
 from bson import ObjectId
 from fastapi import HTTPException
 from src.config.logger import get_logger
 from src.config.settings import settings
+from src.services import metrics_service
+from src.services.circuit_breaker_service import get_breaker
+from src.services.similarity_service import embed_text
+from src.services.dedup_service import minhash_signature, signature_to_list
 
 load_dotenv()
 
@@ -13,29 +20,130 @@ logger = get_logger("Mongo")
 
 _client = None
 _collection = None
+_collections: dict = {}
+_client_lock = threading.Lock()
+
+
+class _PoolMetricsListener(ConnectionPoolListener):
+    """Report connection pool checkout wait times, failures and connections in use to the metrics service."""
+
+    def __init__(self, prefix: str = "mongo.pool"):
+        # Each client has its own pool, so each listener reports under its own prefix
+        self._prefix = prefix
+        self._checked_out = 0
+        self._lock = threading.Lock()
+
+    def _update_checked_out(self, delta: int) -> None:
+        with self._lock:
+            self._checked_out = max(self._checked_out + delta, 0)
+            metrics_service.set_gauge(f"{self._prefix}.checked_out", self._checked_out)
+
+    def pool_created(self, event):
+        logger.debug(f"MongoDB connection pool created for {event.address}")
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        metrics_service.increment(f"{self._prefix}.cleared")
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        metrics_service.increment(f"{self._prefix}.connections_created")
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        metrics_service.increment(f"{self._prefix}.connections_closed")
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def connection_check_out_failed(self, event):
+        metrics_service.increment(f"{self._prefix}.checkout_failed")
+        metrics_service.observe(f"{self._prefix}.checkout_wait_ms", event.duration * 1000)
+
+    def connection_checked_out(self, event):
+        metrics_service.observe(f"{self._prefix}.checkout_wait_ms", event.duration * 1000)
+        self._update_checked_out(1)
+
+    def connection_checked_in(self, event):
+        self._update_checked_out(-1)
+
+
+def _client_options(metrics_prefix: str = "mongo.pool") -> dict:
+    """
+    Build MongoClient keyword arguments from settings (pool size and timeouts).
+    
+    Args:
+        metrics_prefix (str): Prefix of the client's pool metrics.
+    
+    Returns:
+        dict: Keyword arguments for MongoClient / AsyncMongoClient.
+    """
+    return {
+        "maxPoolSize": settings.mongodb_max_pool_size,
+        "minPoolSize": settings.mongodb_min_pool_size,
+        "serverSelectionTimeoutMS": settings.mongodb_server_selection_timeout_ms,
+        "connectTimeoutMS": settings.mongodb_connect_timeout_ms,
+        "socketTimeoutMS": settings.mongodb_socket_timeout_ms,
+        "waitQueueTimeoutMS": settings.mongodb_wait_queue_timeout_ms,
+        "event_listeners": [_PoolMetricsListener(metrics_prefix)],
+    }
+
+
+def _get_client() -> MongoClient:
+    """
+    Get or create the MongoDB client.
+    Initialization is guarded by a lock so concurrent requests share one client and one pool.
+    
+    Returns:
+        MongoClient instance.
+    """
+    global _client
+    
+    if _client is not None:
+        return _client
+    
+    with _client_lock:
+        if _client is None:
+            _collections.clear()
+            _client = MongoClient(settings.mongodb_uri, **_client_options())
+            logger.info(
+                f"MongoDB client initialized (maxPoolSize={settings.mongodb_max_pool_size}, "
+                f"serverSelectionTimeoutMS={settings.mongodb_server_selection_timeout_ms})"
+            )
+    return _client
+
 
 def get_collection(collection_name: str = "inputs"):
     """
     Get MongoDB collection instance.
+    Collection handles are cached per name; no network round trip happens here.
     
     Args:
         collection_name: Name of the collection. Defaults to "inputs".
     
     Returns:
-        MongoDB collection instance or None if connection fails.
+        MongoDB collection instance or None if the client cannot be created.
     """
-    global _client
+    if not settings.mongodb_uri:
+        logger.warning("MONGODB_URI not configured")
+        return None
     
     try:
-        if _client is None:
-            _client = MongoClient(settings.mongodb_uri)
-        
-        db = _client[settings.mongodb_db_name]
-        collection = db[collection_name]
-        logger.info(f"Connected to MongoDB collection '{collection_name}' successfully")
+        client = _get_client()
+        collection = _collections.get(collection_name)
+        if collection is None:
+            collection = client[settings.mongodb_db_name][collection_name]
+            _collections[collection_name] = collection
+            logger.debug(f"Created MongoDB collection handle '{collection_name}'")
         return collection
     except Exception as e:
-        logger.error(f"MongoDB connection failed: {e}", exc_info=True)
+        logger.error(f"MongoDB client initialization failed: {e}", exc_info=True)
         return None
 
 
@@ -107,7 +215,42 @@ def save_url_with_topic(url: str, topic: str) -> None:
         raise HTTPException(status_code=500, detail=f"MongoDB insertion failed: {e}")
 
 
-def save_relevance_data(topic: str, details: str, url: str, core_text: str, date: datetime = None) -> None:
+def build_relevance_document(topic: str, details: str, url: str, core_text: str, date: datetime = None,
+                             relevance_score: float = None) -> dict:
+    """
+    Build a relevance data document (Topic and data).
+    Shared by the sync and async data access layers so both store the same shape.
+    
+    Args:
+        topic (str): The topic.
+        details (str): The details.
+        url (str): The URL.
+        core_text (str): The core text extracted from the URL.
+        date (datetime, optional): The date. Defaults to current UTC time.
+        relevance_score (float, optional): Relevance of the core text to the request.
+    
+    Returns:
+        dict: Document ready for insertion.
+    """
+    if date is None:
+        date = datetime.utcnow()
+    
+    return {
+        "topic": topic,
+        "details": details,
+        "details_vector": [round(float(x), 5) for x in embed_text(details)],
+        "url": url,
+        "core_text": core_text,
+        "minhash_signature": signature_to_list(minhash_signature(core_text)),
+        "relevance_score": relevance_score,
+        "date": date,
+        "timestamp": datetime.utcnow(),
+        "created_at": datetime.utcnow().isoformat()
+    }
+
+
+def save_relevance_data(topic: str, details: str, url: str, core_text: str, date: datetime = None,
+                        relevance_score: float = None) -> None:
     """
     Save relevance data to MongoDB (Topic and data).
     Saves topic, details, url, core_text, and date for each URL/core_text combination.
@@ -118,6 +261,7 @@ def save_relevance_data(topic: str, details: str, url: str, core_text: str, date
         url (str): The URL.
         core_text (str): The core text extracted from the URL.
         date (datetime, optional): The date. Defaults to current UTC time.
+        relevance_score (float, optional): Relevance of the core text to the request.
     """
     # Use "Topic and data" collection as specified
     collection = get_collection("Topic and data")
@@ -125,21 +269,295 @@ def save_relevance_data(topic: str, details: str, url: str, core_text: str, date
         logger.warning("MongoDB collection not available, skipping save")
         return
     
-    if date is None:
-        date = datetime.utcnow()
-    
     try:
-        document = {
-            "topic": topic,
-            "details": details,
-            "url": url,
-            "core_text": core_text,
-            "date": date,
-            "timestamp": datetime.utcnow(),
-            "created_at": datetime.utcnow().isoformat()
-        }
-        collection.insert_one(document)
+        document = build_relevance_document(topic, details, url, core_text, date, relevance_score)
+        get_breaker("mongo").call(collection.insert_one, document)
         logger.info(f"Relevance data saved to 'Topic and data' collection: topic='{topic}', URL: {url}")
     except Exception as e:
         logger.error(f"MongoDB insertion failed for relevance data: {e}", exc_info=True)
-        # Don't raise exception, just log error to avoid breaking the workflow
\ No newline at end of file
+        # Don't raise exception, just log error to avoid breaking the workflow
+
+
+def find_recent_topic_documents(topic: str, since: datetime) -> list:
+    """
+    Find stored relevance data (Topic and data) for a topic, newest first.
+    
+    Args:
+        topic (str): The topic.
+        since (datetime): Only documents with a date on or after this are returned.
+    
+    Returns:
+        list: Matching documents, or an empty list if the collection is not available or the lookup fails.
+    """
+    collection = get_collection("Topic and data")
+    if collection is None:
+        logger.warning("MongoDB collection not available, skipping topic lookup")
+        return []
+    
+    try:
+        return get_breaker("mongo").call(
+            lambda: list(collection.find({"topic": topic, "date": {"$gte": since}}).sort("date", -1))
+        )
+    except Exception as e:
+        logger.error(f"Failed to look up stored documents for topic '{topic}': {e}")
+        return []
+
+
+def find_stored_core_texts(topic: str, urls: list, since: datetime) -> dict:
+    """
+    Find the newest stored core text for each of the given URLs (Topic and data).
+    
+    Args:
+        topic (str): The topic.
+        urls (list): URLs to look up.
+        since (datetime): Only documents with a date on or after this are considered.
+    
+    Returns:
+        dict: URL -> stored core text, for the URLs that were found.
+    """
+    collection = get_collection("Topic and data")
+    if collection is None or not urls:
+        return {}
+    
+    query = {"topic": topic, "url": {"$in": urls}, "date": {"$gte": since}}
+    try:
+        docs = get_breaker("mongo").call(lambda: list(collection.find(query, {"url": 1, "core_text": 1}).sort("date", -1)))
+    except Exception as e:
+        logger.error(f"Failed to look up stored core texts for topic '{topic}': {e}")
+        return {}
+    stored = {}
+    for doc in docs:
+        if doc.get("core_text") and doc["url"] not in stored:
+            stored[doc["url"]] = doc["core_text"]
+    return stored
+
+
+def find_recent_details(topic: str, since: datetime) -> list:
+    """
+    Get the distinct stored details of a topic (with their persisted vectors) for the similarity search.
+    Groups documents server-side so each details value is returned once; only the
+    topic's documents are scanned, and details from other topics never match.
+    
+    Args:
+        topic (str): The topic.
+        since (datetime): Only documents with a date on or after this are considered.
+    
+    Returns:
+        list: Dicts with "details", "details_vector", "topic" and latest "date".
+    """
+    collection = get_collection("Topic and data")
+    if collection is None:
+        logger.warning("MongoDB collection not available, skipping details lookup")
+        return []
+    
+    pipeline = [
+        {"$match": {"topic": topic, "date": {"$gte": since}, "details": {"$nin": ["", None]}}},
+        {"$sort": {"date": -1}},
+        {"$group": {
+            "_id": "$details",
+            "details_vector": {"$first": "$details_vector"},
+            "topic": {"$first": "$topic"},
+            "date": {"$first": "$date"},
+        }},
+    ]
+    try:
+        docs = get_breaker("mongo").call(lambda: list(collection.aggregate(pipeline)))
+    except Exception as e:
+        logger.error(f"Failed to look up stored details for topic '{topic}': {e}")
+        return []
+    return [{**doc, "details": doc["_id"]} for doc in docs]
+
+
+def find_recent_documents_by_details(topic: str, details_values: list, since: datetime) -> list:
+    """
+    Find stored relevance data (Topic and data) of a topic for any of the given details, newest first.
+    
+    Args:
+        topic (str): The topic.
+        details_values (list): Stored details values to match exactly.
+        since (datetime): Only documents with a date on or after this are returned.
+    
+    Returns:
+        list: Matching documents, or an empty list if the collection is not available or the lookup fails.
+    """
+    collection = get_collection("Topic and data")
+    if collection is None or not details_values:
+        return []
+    
+    query = {"topic": topic, "details": {"$in": details_values}, "date": {"$gte": since}}
+    try:
+        return get_breaker("mongo").call(lambda: list(collection.find(query).sort("date", -1)))
+    except Exception as e:
+        logger.error(f"Failed to look up stored documents by details for topic '{topic}': {e}")
+        return []
+
+
+def find_cached_transcripts(video_ids: list) -> dict:
+    """
+    Find cached YouTube transcripts.
+    
+    Args:
+        video_ids: YouTube video IDs
+    
+    Returns:
+        dict: Video ID -> transcript text, for the videos that are cached.
+    """
+    collection = get_collection("Transcripts")
+    if collection is None or not video_ids:
+        return {}
+    
+    try:
+        docs = get_breaker("mongo").call(
+            lambda: list(collection.find({"video_id": {"$in": list(video_ids)}}, {"video_id": 1, "text": 1}))
+        )
+    except Exception as e:
+        logger.error(f"Failed to look up cached transcripts: {e}")
+        return {}
+    return {doc["video_id"]: doc["text"] for doc in docs}
+
+
+def save_transcript(video_id: str, text: str) -> None:
+    """
+    Cache a YouTube transcript by video ID (replacing an older copy).
+    
+    Args:
+        video_id: YouTube video ID
+        text: Normalized transcript text
+    """
+    collection = get_collection("Transcripts")
+    if collection is None:
+        logger.warning("MongoDB collection not available, skipping transcript cache")
+        return
+    
+    try:
+        get_breaker("mongo").call(
+            collection.update_one,
+            {"video_id": video_id},
+            {"$set": {"text": text, "date": datetime.utcnow()}},
+            upsert=True
+        )
+        logger.debug(f"Transcript cached for video {video_id}")
+    except Exception as e:
+        logger.error(f"Failed to cache transcript for video {video_id}: {e}")
+
+
+def reserve_budget(source: str, day: str, cost: float, limit: float) -> Optional[tuple[bool, float]]:
+    """
+    Atomically add a cost to a source's daily spend (API budget) if the total stays within the limit.
+    The ledger has one document per (source, day); the check and the $inc are a single
+    conditional upsert, so concurrent workers can never overspend together.
+    
+    Args:
+        source: Budget source (youtube, tavily or openai)
+        day: Budget day (ISO date, UTC)
+        cost: Cost to reserve
+        limit: Daily budget of the source
+    
+    Returns:
+        (reserved, spent): whether the cost was reserved and the day's spend afterwards,
+        or None if the ledger is not available.
+    """
+    collection = get_collection("API budget")
+    if collection is None:
+        return None
+    
+    key = f"{source}:{day}"
+    try:
+        if cost <= limit:
+            try:
+                doc = get_breaker("mongo").call(
+                    collection.find_one_and_update,
+                    {"_id": key, "spent": {"$lte": limit - cost}},
+                    {"$inc": {"spent": cost}, "$setOnInsert": {"source": source, "day": day, "created_at": datetime.utcnow()}},
+                    upsert=True,
+                    return_document=ReturnDocument.AFTER
+                )
+                return True, doc.get("spent", cost)
+            except errors.DuplicateKeyError:
+                # The day's document exists but the cost does not fit: the filter did not
+                # match and the upsert collided with the existing _id
+                pass
+        doc = get_breaker("mongo").call(collection.find_one, {"_id": key})
+        return False, (doc or {}).get("spent", 0.0)
+    except Exception as e:
+        logger.warning(f"Budget ledger not available for {source}: {e}")
+        return None
+
+
+def add_budget_spend(source: str, day: str, amount: float) -> Optional[float]:
+    """
+    Atomically add an amount (negative to refund) to a source's daily spend (API budget).
+    
+    Args:
+        source: Budget source (youtube, tavily or openai)
+        day: Budget day (ISO date, UTC)
+        amount: Amount to add
+    
+    Returns:
+        The day's total spend after the update, or None if the ledger is not available.
+    """
+    collection = get_collection("API budget")
+    if collection is None:
+        return None
+    
+    try:
+        doc = get_breaker("mongo").call(
+            collection.find_one_and_update,
+            {"_id": f"{source}:{day}"},
+            {"$inc": {"spent": amount}, "$setOnInsert": {"source": source, "day": day, "created_at": datetime.utcnow()}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        return doc.get("spent", 0.0)
+    except Exception as e:
+        logger.warning(f"Budget ledger not available for {source}: {e}")
+        return None
+
+
+def find_budget_spend(day: str) -> Optional[dict]:
+    """
+    Get each source's spend for a day (API budget).
+    
+    Args:
+        day: Budget day (ISO date, UTC)
+    
+    Returns:
+        dict: source -> spent, or None if the ledger is not available.
+    """
+    collection = get_collection("API budget")
+    if collection is None:
+        return None
+    
+    try:
+        docs = get_breaker("mongo").call(lambda: list(collection.find({"day": day}, {"source": 1, "spent": 1})))
+        return {doc["source"]: doc.get("spent", 0.0) for doc in docs}
+    except Exception as e:
+        logger.warning(f"Budget ledger not available: {e}")
+        return None
+
+
+def ensure_indexes() -> None:
+    """
+    Create the indexes used by the topic and details lookups (Topic and data),
+    the expiry index for single-flight leases (Pipeline leases), the video ID
+    index for cached transcripts (Transcripts) and the day index of the API budget ledger.
+    Safe to call repeatedly; MongoDB skips indexes that already exist.
+    """
+    collection = get_collection("Topic and data")
+    if collection is None:
+        return
+    
+    try:
+        collection.create_index([("topic", 1), ("date", -1)])
+        collection.create_index([("topic", 1), ("details", 1), ("date", -1)])
+        collection.create_index([("date", -1)])
+        collection.create_index([("topic", 1), ("url", 1), ("date", -1)])
+        # Expired leases are removed by MongoDB an hour after they expire
+        get_collection("Pipeline leases").create_index("expires_at", expireAfterSeconds=3600)
+        get_collection("Transcripts").create_index("video_id", unique=True)
+        # Ledger days are kept for 90 days
+        get_collection("API budget").create_index("day")
+        get_collection("API budget").create_index("created_at", expireAfterSeconds=90 * 24 * 3600)
+        logger.info("MongoDB indexes ensured for 'Topic and data', 'Pipeline leases', 'Transcripts' and 'API budget'")
+    except Exception as e:
+        logger.warning(f"Could not create MongoDB indexes: {e}")
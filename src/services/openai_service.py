@@ -2,13 +2,18 @@
 OpenAI API service for LLM operations.
 """
 
-from typing import Optional, Any
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Any, List
 from langchain_openai import ChatOpenAI
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from pydantic import BaseModel, Field
 from src.config.logger import get_logger
 from src.config.settings import settings
 from src.graph.consts import PREDEFINED_TOPICS
+from src.services import budget_service, http_transport_service
+from src.services.circuit_breaker_service import get_breaker
+from src.services.summarizer_service import estimate_tokens
 
 logger = get_logger("OpenAI")
 
@@ -21,6 +26,11 @@ MAX_SOURCE_CONTENT_LENGTH = 12000
 _openai_client: Optional[ChatOpenAI] = None
 _openai_structured_client: Optional[Any] = None
 _openai_relevance_client: Optional[Any] = None
+_openai_batch_relevance_client: Optional[Any] = None
+_openai_summary_client: Optional[ChatOpenAI] = None
+
+# Shared limiter: caps concurrent OpenAI requests across threads (generation, rating, map-reduce)
+_llm_limiter = threading.BoundedSemaphore(settings.openai_max_concurrency)
 
 
 class ContentStructure(BaseModel):
@@ -35,6 +45,17 @@ class RelevanceScore(BaseModel):
     explanation: str = Field(description="Brief explanation of the relevance score")
 
 
+class SourceRelevance(BaseModel):
+    """Relevance score of one numbered source in a batch rating."""
+    index: int = Field(description="Number of the source, as given in the request")
+    relevance_score: float = Field(description="Relevance score from 0.0 to 1.0", ge=0.0, le=1.0)
+
+
+class BatchRelevanceScores(BaseModel):
+    """Structure for batch relevance rating output."""
+    scores: List[SourceRelevance] = Field(description="One score per source")
+
+
 def _get_openai_client() -> Optional[ChatOpenAI]:
     """
     Get or create OpenAI client instance.
@@ -53,7 +74,7 @@ def _get_openai_client() -> Optional[ChatOpenAI]:
         return None
     
     try:
-        _openai_client = ChatOpenAI(api_key=settings.openai_api_key, model="gpt-4")
+        _openai_client = ChatOpenAI(api_key=settings.openai_api_key, http_client=http_transport_service.get_client(), model="gpt-4")
         logger.info("OpenAI client initialized successfully")
         return _openai_client
     except Exception as e:
@@ -78,7 +99,7 @@ def _get_openai_structured_client() -> Optional[Any]:
         return None
     
     try:
-        llm = ChatOpenAI(api_key=settings.openai_api_key)
+        llm = ChatOpenAI(api_key=settings.openai_api_key, http_client=http_transport_service.get_client())
         _openai_structured_client = llm.with_structured_output(ContentStructure)
         logger.info("OpenAI structured client initialized successfully")
         return _openai_structured_client
@@ -115,6 +136,32 @@ def truncate_source_content(source_content: str, max_length: int = MAX_SOURCE_CO
     return truncated + "\n\n[Content truncated due to length limits...]"
 
 
+def _invoke_limited(chain: Any, inputs: dict) -> Any:
+    """
+    Invoke a chain while holding a slot of the shared OpenAI limiter
+    (through the OpenAI circuit breaker).
+    
+    Args:
+        chain: LangChain runnable
+        inputs: Chain inputs
+    
+    Returns:
+        The chain result
+    """
+    with _llm_limiter:
+        result = get_breaker("openai").call(chain.invoke, inputs)
+    budget_service.record(budget_service.OPENAI, _count_tokens(inputs, result))
+    return result
+
+
+def _count_tokens(inputs: dict, result: Any) -> int:
+    """Tokens used by a call: reported usage when the result carries it, otherwise estimated from the text."""
+    usage = getattr(result, "usage_metadata", None)
+    if isinstance(usage, dict) and usage.get("total_tokens"):
+        return usage["total_tokens"]
+    return estimate_tokens(str(inputs)) + estimate_tokens(str(result))
+
+
 def _get_openai_relevance_client() -> Optional[Any]:
     """
     Get or create OpenAI client for relevance rating with structured output.
@@ -132,7 +179,7 @@ def _get_openai_relevance_client() -> Optional[Any]:
         return None
     
     try:
-        llm = ChatOpenAI(api_key=settings.openai_api_key)
+        llm = ChatOpenAI(api_key=settings.openai_api_key, http_client=http_transport_service.get_client())
         _openai_relevance_client = llm.with_structured_output(RelevanceScore)
         logger.info("OpenAI relevance client initialized successfully")
         return _openai_relevance_client
@@ -141,6 +188,32 @@ def _get_openai_relevance_client() -> Optional[Any]:
         return None
 
 
+def _get_openai_batch_relevance_client() -> Optional[Any]:
+    """
+    Get or create OpenAI client for batch relevance rating with structured output.
+    
+    Returns:
+        ChatOpenAI client with BatchRelevanceScores structured output or None if API key is not configured.
+    """
+    global _openai_batch_relevance_client
+    
+    if _openai_batch_relevance_client is not None:
+        return _openai_batch_relevance_client
+    
+    if not settings.openai_api_key:
+        logger.warning("OPENAI_API_KEY not configured")
+        return None
+    
+    try:
+        llm = ChatOpenAI(api_key=settings.openai_api_key, http_client=http_transport_service.get_client())
+        _openai_batch_relevance_client = llm.with_structured_output(BatchRelevanceScores)
+        logger.info("OpenAI batch relevance client initialized successfully")
+        return _openai_batch_relevance_client
+    except Exception as e:
+        logger.error(f"Failed to initialize OpenAI batch relevance client: {e}", exc_info=True)
+        return None
+
+
 def extract_topic_and_details(messages: list) -> ContentStructure:
     """
     Extract topic and details from user messages using OpenAI.
@@ -185,7 +258,7 @@ def extract_topic_and_details(messages: list) -> ContentStructure:
     )
     
     chain = topic_extraction_prompt | structured_client
-    result = chain.invoke({"messages": messages})
+    result = _invoke_limited(chain, {"messages": messages})
     
     logger.info(f"Extracted topic: {result.topic}, details: {result.details}")
     return result
@@ -204,6 +277,11 @@ def rate_relevance(user_request: str, core_text: str) -> RelevanceScore:
     """
     logger.info("Rating relevance of core text to user request")
     
+    # Without budget every source is kept with a neutral score instead of being rated
+    if budget_service.get_level(budget_service.OPENAI) == budget_service.HARD:
+        logger.warning("OpenAI daily budget spent - skipping relevance rating")
+        return RelevanceScore(relevance_score=0.5, explanation="Not rated: OpenAI daily budget spent")
+    
     relevance_client = _get_openai_relevance_client()
     if not relevance_client:
         raise ValueError("OpenAI relevance client not available - OPENAI_API_KEY not configured")
@@ -235,7 +313,7 @@ def rate_relevance(user_request: str, core_text: str) -> RelevanceScore:
     )
     
     chain = relevance_rating_prompt | relevance_client
-    result = chain.invoke({
+    result = _invoke_limited(chain, {
         "user_request": user_request,
         "core_text": truncated_core_text
     })
@@ -244,6 +322,84 @@ def rate_relevance(user_request: str, core_text: str) -> RelevanceScore:
     return result
 
 
+def rate_relevance_batch(user_request: str, core_texts: list[str]) -> list[float]:
+    """
+    Rate how well each core text matches user request with a single OpenAI call.
+    
+    Args:
+        user_request: The user's original request
+        core_texts: The core texts to evaluate
+    
+    Returns:
+        One relevance score per core text, in order (0.5 for texts the model did not score,
+        and for all texts when OpenAI is not configured, over budget or unavailable)
+    """
+    if not core_texts:
+        return []
+    logger.info(f"Rating relevance of {len(core_texts)} core texts to user request in one call")
+    
+    # Without budget every source is kept with a neutral score instead of being rated
+    if budget_service.get_level(budget_service.OPENAI) == budget_service.HARD:
+        logger.warning("OpenAI daily budget spent - skipping relevance rating")
+        return [0.5] * len(core_texts)
+    
+    relevance_client = _get_openai_batch_relevance_client()
+    if not relevance_client:
+        logger.warning("OpenAI relevance client not available - OPENAI_API_KEY not configured, skipping relevance rating")
+        return [0.5] * len(core_texts)
+    
+    # Share the content budget of a single rating (~15,000 tokens) between the sources,
+    # at most 10,000 chars each as for a single rating
+    MAX_BATCH_RELEVANCE_TEXT_LENGTH = 40000
+    per_text_length = min(10000, MAX_BATCH_RELEVANCE_TEXT_LENGTH // len(core_texts))
+    numbered_sources = "\n\n".join(
+        f"[Source {i}]\n{truncate_source_content(text, max_length=per_text_length)}"
+        for i, text in enumerate(core_texts)
+    )
+    
+    relevance_rating_prompt = ChatPromptTemplate.from_messages(
+        [
+            (
+                "system",
+                """You are a content relevance evaluator. Your task is to rate how well each numbered source matches a user's content request.
+                Rate each source independently on a scale from 0.0 (completely irrelevant) to 1.0 (highly relevant).
+                Consider:
+                - How well the text addresses the user's topic and details
+                - The quality and depth of information
+                - The usefulness for creating social media content
+                
+                Return exactly one score for every source, with its source number as the index."""
+            ),
+            (
+                "user",
+                "User Request: {user_request}\n\nSources:\n{sources}"
+            ),
+        ]
+    )
+    
+    chain = relevance_rating_prompt | relevance_client
+    try:
+        result = _invoke_limited(chain, {
+            "user_request": user_request,
+            "sources": numbered_sources
+        })
+    except Exception as e:
+        logger.warning(f"Relevance rating failed, keeping all sources with a neutral score: {e}")
+        return [0.5] * len(core_texts)
+    
+    scores = [0.5] * len(core_texts)
+    rated = set()
+    for item in result.scores:
+        if 0 <= item.index < len(core_texts):
+            scores[item.index] = item.relevance_score
+            rated.add(item.index)
+    if len(rated) < len(core_texts):
+        logger.warning(f"Model scored {len(rated)} of {len(core_texts)} sources, using 0.5 for the rest")
+    
+    logger.info(f"Relevance scores: {scores}")
+    return scores
+
+
 def generate_linkedin_content(topic: str, details: str, source_content: str) -> str:
     """
     Generate LinkedIn post content using OpenAI.
@@ -291,7 +447,7 @@ def generate_linkedin_content(topic: str, details: str, source_content: str) ->
     )
     
     chain = linkedin_generation_prompt | client
-    result = chain.invoke({
+    result = _invoke_limited(chain, {
         "topic": topic,
         "details": details,
         "source_content": truncated_content
@@ -347,7 +503,7 @@ def generate_video_script(topic: str, details: str, source_content: str) -> str:
     )
     
     chain = video_generation_prompt | client
-    result = chain.invoke({
+    result = _invoke_limited(chain, {
         "topic": topic,
         "details": details,
         "source_content": truncated_content
@@ -357,3 +513,158 @@ def generate_video_script(topic: str, details: str, source_content: str) -> str:
     logger.info("Instagram/TikTok script generated successfully")
     return content
 
+
+
+def _get_openai_summary_client() -> Optional[ChatOpenAI]:
+    """
+    Get or create the small, fast OpenAI client used for map-reduce chunk summaries.
+    
+    Returns:
+        ChatOpenAI client or None if API key is not configured.
+    """
+    global _openai_summary_client
+    
+    if _openai_summary_client is not None:
+        return _openai_summary_client
+    
+    if not settings.openai_api_key:
+        logger.warning("OPENAI_API_KEY not configured")
+        return None
+    
+    try:
+        _openai_summary_client = ChatOpenAI(api_key=settings.openai_api_key, http_client=http_transport_service.get_client(), model=settings.map_reduce_model, temperature=0)
+        logger.info(f"OpenAI summary client initialized successfully (model={settings.map_reduce_model})")
+        return _openai_summary_client
+    except Exception as e:
+        logger.error(f"Failed to initialize OpenAI summary client: {e}", exc_info=True)
+        return None
+
+
+def split_into_chunks(source_content: str, chunk_length: int) -> List[str]:
+    """
+    Split source content into chunks, cutting at sentence or line boundaries where possible.
+    
+    Args:
+        source_content: The source content to split
+        chunk_length: Maximum character length of a chunk
+    
+    Returns:
+        List of chunks in original order
+    """
+    chunks = []
+    start = 0
+    while start < len(source_content):
+        end = min(start + chunk_length, len(source_content))
+        if end < len(source_content):
+            window = source_content[start:end]
+            cut_point = max(window.rfind('.'), window.rfind('\n'))
+            if cut_point > chunk_length * 0.8:  # Only use cut point if it's not too early
+                end = start + cut_point + 1
+        chunk = source_content[start:end].strip()
+        if chunk:
+            chunks.append(chunk)
+        start = end
+    return chunks
+
+
+def summarize_chunk(topic: str, details: str, chunk: str, max_words: int) -> str:
+    """
+    Summarize one chunk of source content with the small model (map step).
+    
+    Args:
+        topic: General topic category
+        details: Specific details or sub-topics
+        chunk: Chunk of source content
+        max_words: Word limit for the summary
+    
+    Returns:
+        Chunk summary
+    """
+    client = _get_openai_summary_client()
+    if not client:
+        raise ValueError("OpenAI summary client not available - OPENAI_API_KEY not configured")
+    
+    chunk_summary_prompt = ChatPromptTemplate.from_messages(
+        [
+            (
+                "system",
+                """You condense source material for a social media writer.
+                Summarize the text in at most {max_words} words.
+                Keep concrete facts, numbers, names, quotes and dates that relate to the topic and details.
+                Drop navigation, ads and anything unrelated. Do not add information that is not in the text."""
+            ),
+            (
+                "user",
+                "Topic: {topic}\nDetails: {details}\n\nText:\n{chunk}"
+            ),
+        ]
+    )
+    
+    chain = chunk_summary_prompt | client
+    result = _invoke_limited(chain, {
+        "topic": topic,
+        "details": details,
+        "chunk": chunk,
+        "max_words": max_words
+    })
+    return result.content if hasattr(result, 'content') else str(result)
+
+
+def map_reduce_source_content(topic: str, details: str, source_content: str) -> str:
+    """
+    Condense long source content by summarizing its chunks concurrently (map)
+    and joining the summaries in order (reduce).
+    All chunks run at once under the shared limiter, so wall-clock time is about one
+    chunk's latency; chunk summaries are sized so the digest fits MAX_SOURCE_CONTENT_LENGTH.
+    
+    Args:
+        topic: General topic category
+        details: Specific details or sub-topics
+        source_content: The source content to condense
+    
+    Returns:
+        Combined digest (chunks that fail to summarize are kept truncated)
+    """
+    chunks = split_into_chunks(source_content, settings.map_reduce_chunk_chars)
+    if len(chunks) > settings.map_reduce_max_chunks:
+        logger.warning(f"Source content has {len(chunks)} chunks, summarizing the first {settings.map_reduce_max_chunks}")
+        chunks = chunks[:settings.map_reduce_max_chunks]
+    
+    # ~6 characters per word including spaces
+    chunk_budget = MAX_SOURCE_CONTENT_LENGTH // len(chunks)
+    max_words = max(chunk_budget // 6, 50)
+    
+    def summarize(chunk: str) -> str:
+        try:
+            return summarize_chunk(topic, details, chunk, max_words)
+        except Exception as e:
+            logger.error(f"Chunk summary failed, keeping truncated chunk: {e}", exc_info=True)
+            return truncate_source_content(chunk, max_length=chunk_budget)
+    
+    with ThreadPoolExecutor(max_workers=len(chunks), thread_name_prefix="map-reduce") as executor:
+        summaries = list(executor.map(summarize, chunks))
+    
+    digest = "\n\n".join(s.strip() for s in summaries if s and s.strip())
+    logger.info(f"Map-reduce condensed {len(source_content)} characters in {len(chunks)} chunks to {len(digest)} characters")
+    return truncate_source_content(digest)
+
+
+def prepare_source_content(topic: str, details: str, source_content: str) -> str:
+    """
+    Fit source content into the generation prompt.
+    Long content is condensed with map-reduce when enabled (and within budget), otherwise truncated.
+    
+    Args:
+        topic: General topic category
+        details: Specific details or sub-topics
+        source_content: The source content
+    
+    Returns:
+        Source content that fits MAX_SOURCE_CONTENT_LENGTH
+    """
+    if settings.map_reduce_enabled and len(source_content) > MAX_SOURCE_CONTENT_LENGTH:
+        # Past the soft budget limit the extra summary calls are skipped
+        if budget_service.get_level(budget_service.OPENAI) == budget_service.OK:
+            return map_reduce_source_content(topic, details, source_content)
+        logger.info("OpenAI budget past its soft limit - truncating instead of map-reduce")
+    return truncate_source_content(source_content)
@@ -0,0 +1,254 @@
+"""
+Background topic pre-warmer.
+Periodically runs the discovery and extraction stages for PREDEFINED_TOPICS and the
+most-requested details from recent traffic, and stores the results in the
+"Topic and data" collection so check_db_node finds warm data.
+"""
+
+import asyncio
+import threading
+from collections import Counter, deque
+from datetime import datetime, timedelta
+from typing import Optional, List, Tuple
+from src.config.logger import get_logger
+from src.config.settings import settings
+from src.graph.consts import PREDEFINED_TOPICS
+
+logger = get_logger("Prewarm")
+
+# Wait before the first cycle so startup and the first user requests are not competing with it
+_INITIAL_DELAY_SECONDS = 30
+# How far back "recent traffic" reaches and how many requests are remembered
+_TRAFFIC_WINDOW = timedelta(hours=24)
+_MAX_TRACKED_REQUESTS = 2000
+
+_lock = threading.Lock()
+_recent_requests: deque = deque(maxlen=_MAX_TRACKED_REQUESTS)
+_task: Optional[asyncio.Task] = None
+_status = {
+    "running": False,
+    "last_cycle_started": None,
+    "last_cycle_finished": None,
+    "next_cycle_at": None,
+    "budget_day": None,
+    "runs_today": 0,
+    "last_results": [],
+}
+
+
+def _normalize_details(details: str) -> str:
+    """Case and whitespace insensitive form of details, used for traffic counts and warm checks."""
+    return " ".join((details or "").lower().split())
+
+
+def record_topic_request(topic: str, details: str) -> None:
+    """
+    Remember a user request so its details can be pre-warmed.
+
+    Args:
+        topic: Requested topic
+        details: Requested details
+    """
+    if not topic or not details:
+        return
+    with _lock:
+        _recent_requests.append((datetime.utcnow(), topic, _normalize_details(details)))
+
+
+def get_most_requested_details(limit: int) -> List[Tuple[str, str]]:
+    """
+    Get the most-requested (topic, details) pairs from recent traffic.
+
+    Args:
+        limit: Maximum number of pairs to return
+
+    Returns:
+        List of (topic, details), most requested first
+    """
+    cutoff = datetime.utcnow() - _TRAFFIC_WINDOW
+    with _lock:
+        counts = Counter((topic, details) for ts, topic, details in _recent_requests if ts >= cutoff)
+    return [pair for pair, _ in counts.most_common(limit)]
+
+
+def _is_warm(topic: str, details: str, since: datetime) -> bool:
+    """
+    Check whether stored data for the target is newer than the given date.
+    Details are compared normalized: tracked details are lowercased, while the pipeline
+    stores them as the user typed them.
+    """
+    from src.services.mongo_service import find_recent_topic_documents, find_recent_details
+
+    if details:
+        normalized = _normalize_details(details)
+        return any(_normalize_details(doc["details"]) == normalized for doc in find_recent_details(topic, since))
+    return bool(find_recent_topic_documents(topic, since))
+
+
+def refresh_topic(topic: str, details: str = "") -> int:
+    """
+    Run discovery and extraction for a topic and store the results (Topic and data).
+
+    Args:
+        topic: Topic to refresh
+        details: Optional details
+
+    Returns:
+        Number of documents stored
+    """
+    # Imported lazily: nodes import the services package
+    from src.graph.nodes.find_url_node import find_url_node
+    from src.graph.nodes.core_text_extraction_node import core_text_extraction_node
+    from src.services.mongo_service import save_relevance_data
+
+    state = {"topic": topic, "details": details}
+    state.update(find_url_node(state))
+    if not state.get("urls"):
+        return 0
+    state.update(core_text_extraction_node(state))
+
+    # Store newly extracted texts; texts reused from the DB are already there
+    stored_urls = set(state.get("stored_text_urls") or [])
+    new_sources = [
+        (url, text) for url, text in zip(state.get("core_text_urls") or [], state.get("core_texts") or [])
+        if url not in stored_urls
+    ]
+    current_date = datetime.utcnow()
+    for url, text in new_sources:
+        save_relevance_data(topic=topic, details=details, url=url, core_text=text, date=current_date)
+    return len(new_sources)
+
+
+def _build_targets() -> List[Tuple[str, str]]:
+    """Pre-warm targets: most-requested details first, then every predefined topic."""
+    targets = get_most_requested_details(settings.prewarm_top_details)
+    targets += [(topic, "") for topic in PREDEFINED_TOPICS]
+    return list(dict.fromkeys(targets))
+
+
+def _take_budget() -> bool:
+    """Reserve one run from today's budget. Returns False if the daily budget is spent."""
+    today = datetime.utcnow().date().isoformat()
+    with _lock:
+        if _status["budget_day"] != today:
+            _status["budget_day"] = today
+            _status["runs_today"] = 0
+        if _status["runs_today"] >= settings.prewarm_daily_budget:
+            return False
+        _status["runs_today"] += 1
+        return True
+
+
+async def run_prewarm_cycle() -> List[dict]:
+    """
+    Run one pre-warm cycle over all targets.
+    Targets with data newer than the pre-warm interval are skipped; at most
+    prewarm_max_runs_per_cycle refreshes run, prewarm_max_concurrency at a time.
+
+    Returns:
+        List of per-target results
+    """
+    with _lock:
+        _status["running"] = True
+        _status["last_cycle_started"] = datetime.utcnow()
+
+    semaphore = asyncio.Semaphore(settings.prewarm_max_concurrency)
+    fresh_since = datetime.utcnow() - timedelta(seconds=settings.prewarm_interval_seconds)
+    runs_left = settings.prewarm_max_runs_per_cycle
+
+    async def warm(topic: str, details: str) -> dict:
+        result = {"topic": topic, "details": details, "status": "ok", "documents": 0}
+        async with semaphore:
+            try:
+                result["documents"] = await asyncio.to_thread(refresh_topic, topic, details)
+            except Exception as e:
+                logger.error(f"Pre-warm failed for topic '{topic}', details '{details}': {e}", exc_info=True)
+                result["status"] = "error"
+                result["error"] = str(e)
+        return result
+
+    results = []
+    tasks = []
+    try:
+        for topic, details in _build_targets():
+            if runs_left <= 0:
+                results.append({"topic": topic, "details": details, "status": "skipped_cycle_budget"})
+                continue
+            if await asyncio.to_thread(_is_warm, topic, details, fresh_since):
+                results.append({"topic": topic, "details": details, "status": "warm"})
+                continue
+            if not _take_budget():
+                results.append({"topic": topic, "details": details, "status": "skipped_daily_budget"})
+                continue
+            runs_left -= 1
+            tasks.append(asyncio.create_task(warm(topic, details)))
+
+        results += await asyncio.gather(*tasks)
+    finally:
+        with _lock:
+            _status["running"] = False
+            _status["last_cycle_finished"] = datetime.utcnow()
+            _status["last_results"] = results
+
+    refreshed = sum(1 for r in results if r["status"] == "ok")
+    logger.info(f"Pre-warm cycle finished: {refreshed} refreshed, {len(results) - refreshed} skipped or failed")
+    return results
+
+
+async def _prewarm_loop() -> None:
+    """Run pre-warm cycles forever, sleeping prewarm_interval_seconds between them."""
+    delay = _INITIAL_DELAY_SECONDS
+    while True:
+        with _lock:
+            _status["next_cycle_at"] = datetime.utcnow() + timedelta(seconds=delay)
+        await asyncio.sleep(delay)
+        try:
+            await run_prewarm_cycle()
+        except Exception as e:
+            logger.error(f"Pre-warm cycle failed: {e}", exc_info=True)
+        delay = settings.prewarm_interval_seconds
+
+
+def start_prewarmer() -> None:
+    """Start the background pre-warm loop on the running event loop (if enabled)."""
+    global _task
+
+    if not settings.prewarm_enabled:
+        logger.info("Topic pre-warmer disabled")
+        return
+    if _task is None or _task.done():
+        _task = asyncio.create_task(_prewarm_loop())
+        logger.info(f"Topic pre-warmer started (interval={settings.prewarm_interval_seconds}s)")
+
+
+async def stop_prewarmer() -> None:
+    """Cancel the background pre-warm loop."""
+    global _task
+
+    if _task is not None:
+        _task.cancel()
+        try:
+            await _task
+        except asyncio.CancelledError:
+            pass
+        _task = None
+        logger.info("Topic pre-warmer stopped")
+
+
+def get_prewarm_status() -> dict:
+    """
+    Get the pre-warmer status and budget.
+
+    Returns:
+        dict: Status of the scheduler, the last cycle and today's budget.
+    """
+    with _lock:
+        return {
+            **_status,
+            "enabled": settings.prewarm_enabled,
+            "interval_seconds": settings.prewarm_interval_seconds,
+            "max_concurrency": settings.prewarm_max_concurrency,
+            "max_runs_per_cycle": settings.prewarm_max_runs_per_cycle,
+            "daily_budget": settings.prewarm_daily_budget,
+            "last_results": list(_status["last_results"]),
+        }
@@ -2,14 +2,58 @@
 Reddit API service for searching Reddit posts and comments.
 """
 
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Optional, Dict, Any
 from src.config.logger import get_logger
 from src.config.settings import settings
+from src.services import http_transport_service
+from src.services.circuit_breaker_service import get_breaker
 
 logger = get_logger("Reddit")
 
 _reddit_client: Optional[Any] = None
 
+# Reddit's maximum page size for listings
+MAX_LISTING_LIMIT = 100
+
+
+class RedditPost:
+    """Compact post record parsed from listing JSON (no lazy praw attributes)."""
+
+    __slots__ = ("title", "url", "permalink", "score", "num_comments", "selftext", "subreddit", "created_utc", "author")
+
+    def __init__(self, title: str, url: str, permalink: str, score: int, num_comments: int,
+                 selftext: str, subreddit: str, created_utc: float, author: str):
+        self.title = title
+        self.url = url
+        self.permalink = permalink
+        self.score = score
+        self.num_comments = num_comments
+        self.selftext = selftext
+        self.subreddit = subreddit
+        self.created_utc = created_utc
+        self.author = author
+
+    @classmethod
+    def from_listing_data(cls, data: Dict[str, Any]) -> "RedditPost":
+        """Build a record from the "data" object of a listing child (kind t3)."""
+        selftext = data.get("selftext") or ""
+        return cls(
+            title=data.get("title", ""),
+            url=data.get("url", ""),
+            permalink=f"https://www.reddit.com{data.get('permalink', '')}",
+            score=data.get("score", 0),
+            num_comments=data.get("num_comments", 0),
+            selftext=selftext[:500],  # Limit text length
+            subreddit=data.get("subreddit", ""),
+            created_utc=data.get("created_utc", 0),
+            author=data.get("author") or "[deleted]",
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Same shape as the dicts returned by search_reddit_posts."""
+        return {name: getattr(self, name) for name in self.__slots__}
+
 
 def get_reddit_client() -> Optional[Any]:
     """
@@ -34,7 +78,8 @@ def get_reddit_client() -> Optional[Any]:
         _reddit_client = praw.Reddit(
             client_id=settings.reddit_client_id,
             client_secret=settings.reddit_client_secret,
-            user_agent=settings.reddit_user_agent or "multiagent-rag-app/1.0"
+            user_agent=settings.reddit_user_agent or "multiagent-rag-app/1.0",
+            requestor_kwargs={"session": http_transport_service.create_session(), "timeout": settings.http_timeout_seconds}
         )
         logger.info("Reddit client initialized successfully")
         return _reddit_client
@@ -168,7 +213,7 @@ def get_subreddit_posts(subreddit: str, limit: int = 10, sort: str = "hot") -> L
 
 def get_post_comments(post_url: str, limit: int = 10) -> List[Dict[str, Any]]:
     """
-    Get comments from a Reddit post.
+    Get the top-scored top-level comments from a Reddit post.
     
     Args:
         post_url: Reddit post URL or permalink
@@ -186,11 +231,15 @@ def get_post_comments(post_url: str, limit: int = 10) -> List[Dict[str, Any]]:
         return []
     
     try:
-        submission = reddit.submission(url=post_url)
-        submission.comments.replace_more(limit=0)  # Remove "more comments" placeholders
+        def fetch_top_level() -> list:
+            submission = reddit.submission(url=post_url)
+            submission.comment_sort = "top"
+            submission.comment_limit = limit
+            submission.comments.replace_more(limit=0)  # Remove "more comments" placeholders
+            return submission.comments[:limit]  # Top-level comments only
         
         comments = []
-        for comment in submission.comments.list()[:limit]:
+        for comment in get_breaker("reddit").call(fetch_top_level):
             if hasattr(comment, 'body'):  # Skip deleted/removed comments
                 comment_data = {
                     "body": comment.body[:500] if comment.body else "",  # Limit text length
@@ -207,3 +256,194 @@ def get_post_comments(post_url: str, limit: int = 10) -> List[Dict[str, Any]]:
         logger.error(f"Error fetching post comments: {e}", exc_info=True)
         return []
 
+
+
+def parse_listing(payload: Dict[str, Any]) -> List[RedditPost]:
+    """
+    Parse Reddit listing JSON into compact post records.
+    
+    Args:
+        payload: Listing JSON ({"kind": "Listing", "data": {"children": [...]}})
+    
+    Returns:
+        List of RedditPost records (non-post children are skipped)
+    """
+    children = (payload or {}).get("data", {}).get("children", [])
+    return [RedditPost.from_listing_data(child["data"]) for child in children if child.get("kind") == "t3"]
+
+
+def search_reddit_posts_lean(query: str, subreddit: Optional[str] = None, limit: int = 10, sort: str = "hot",
+                             time_filter: str = "month") -> List[RedditPost]:
+    """
+    Search Reddit posts with one raw listing request.
+    The time window is filtered server-side and the JSON is parsed straight into
+    compact records, so no praw model objects or lazy attribute fetches are involved.
+    
+    Args:
+        query: Search query string
+        subreddit: Optional subreddit name to search within (defaults to all of Reddit)
+        limit: Maximum number of posts to return (at most 100)
+        sort: Sort order - "hot", "new", "top", "relevance", "comments"
+        time_filter: Server-side time window - "hour", "day", "week", "month", "year", "all"
+    
+    Returns:
+        List of RedditPost records
+    """
+    reddit = get_reddit_client()
+    if not reddit:
+        logger.warning("Reddit client not available - Reddit search disabled")
+        return []
+    
+    params = {
+        "q": query,
+        "sort": sort,
+        "t": time_filter,
+        "limit": min(limit, MAX_LISTING_LIMIT),
+        "restrict_sr": "on" if subreddit else "off",
+        "raw_json": 1,
+    }
+    try:
+        logger.info(f"Searching Reddit (lean) for: {query}, subreddit: {subreddit or 'all'}, t={time_filter}")
+        payload = get_breaker("reddit").call(
+            reddit.request, method="GET", path=f"/r/{subreddit or 'all'}/search", params=params
+        )
+        posts = parse_listing(payload)
+        logger.info(f"Successfully found {len(posts)} Reddit posts")
+        return posts
+    except Exception as e:
+        logger.error(f"Error searching Reddit: {e}", exc_info=True)
+        return []
+
+
+def get_subreddit_posts_lean(subreddit: str, limit: int = 10, sort: str = "top",
+                             time_filter: str = "month") -> List[RedditPost]:
+    """
+    Get posts from a subreddit listing with one raw request (see search_reddit_posts_lean).
+    
+    Args:
+        subreddit: Subreddit name (e.g., "python", "technology")
+        limit: Maximum number of posts to return (at most 100)
+        sort: Sort order - "hot", "new", "top"
+        time_filter: Server-side time window for "top" - "hour", "day", "week", "month", "year", "all"
+    
+    Returns:
+        List of RedditPost records
+    """
+    reddit = get_reddit_client()
+    if not reddit:
+        logger.warning("Reddit client not available")
+        return []
+    
+    if sort not in ("hot", "new", "top"):
+        sort = "hot"  # Default to hot
+    params = {"limit": min(limit, MAX_LISTING_LIMIT), "t": time_filter, "raw_json": 1}
+    try:
+        logger.info(f"Fetching posts from r/{subreddit} (lean), sort: {sort}, t={time_filter}")
+        payload = get_breaker("reddit").call(reddit.request, method="GET", path=f"/r/{subreddit}/{sort}", params=params)
+        posts = parse_listing(payload)
+        logger.info(f"Successfully fetched {len(posts)} posts from r/{subreddit}")
+        return posts
+    except Exception as e:
+        logger.error(f"Error fetching subreddit posts: {e}", exc_info=True)
+        return []
+
+
+def get_routed_posts(subreddits: List[str], query: str = "", limit: int = 10,
+                     time_filter: str = "month") -> List[List[RedditPost]]:
+    """
+    Fetch listings from several subreddits concurrently.
+    With a query each subreddit is searched (restricted to it); without one its top listing is used.
+    
+    Args:
+        subreddits: Subreddit names
+        query: Optional search query
+        limit: Maximum number of posts per subreddit
+        time_filter: Server-side time window
+    
+    Returns:
+        One list of RedditPost records per subreddit, in the same order
+    """
+    if not subreddits:
+        return []
+    
+    def fetch(subreddit: str) -> List[RedditPost]:
+        if query:
+            return search_reddit_posts_lean(query, subreddit=subreddit, limit=limit, sort="top", time_filter=time_filter)
+        return get_subreddit_posts_lean(subreddit, limit=limit, sort="top", time_filter=time_filter)
+    
+    with ThreadPoolExecutor(max_workers=len(subreddits)) as executor:
+        return list(executor.map(fetch, subreddits))
+
+
+def merge_by_engagement(listings: List[List[RedditPost]]) -> List[RedditPost]:
+    """
+    Merge per-subreddit listings into one ranking by normalized engagement.
+    Engagement (score + comments) is divided by the best post's engagement in the same
+    subreddit, so a small subreddit's top post ranks alongside a large one's.
+    
+    Args:
+        listings: One list of posts per subreddit
+    
+    Returns:
+        Posts ordered by normalized engagement (ties by raw engagement), one per URL
+    """
+    ranked = []
+    for posts in listings:
+        if not posts:
+            continue
+        best = max(p.score + p.num_comments for p in posts) or 1
+        ranked += [((p.score + p.num_comments) / best, p.score + p.num_comments, p) for p in posts]
+    
+    ranked.sort(key=lambda item: (item[0], item[1]), reverse=True)
+    merged = []
+    seen_urls = set()
+    for _, _, post in ranked:
+        if post.url in seen_urls:
+            continue
+        seen_urls.add(post.url)
+        merged.append(post)
+    return merged
+
+
+def build_discussion_text(post: RedditPost, comments: List[Dict[str, Any]]) -> str:
+    """
+    Build one compact text record for a Reddit thread: title, post text and top comments.
+    
+    Args:
+        post: The thread's post
+        comments: Its top comments (as returned by get_post_comments)
+    
+    Returns:
+        Text for the rating stage
+    """
+    lines = [f"r/{post.subreddit}: {post.title}"]
+    if post.selftext:
+        lines.append(" ".join(post.selftext.split()))
+    bodies = [
+        (comment["score"], " ".join(comment["body"].split())) for comment in comments
+        if comment.get("body") and comment["body"] not in ("[deleted]", "[removed]")
+    ]
+    if bodies:
+        lines.append("Top comments:")
+        lines += [f"- ({score} points) {body}" for score, body in bodies]
+    return "\n".join(lines)
+
+
+def get_discussion_texts(posts: List[RedditPost], comment_limit: int = 8) -> List[List[str]]:
+    """
+    Fetch top comments for several threads concurrently (at most REDDIT_COMMENT_CONCURRENCY
+    at a time) and build one discussion text per thread.
+    
+    Args:
+        posts: Threads to harvest
+        comment_limit: Maximum number of top-level comments per thread
+    
+    Returns:
+        List of [permalink, discussion text] pairs, in the order of posts
+    """
+    if not posts:
+        return []
+    
+    with ThreadPoolExecutor(max_workers=min(len(posts), settings.reddit_comment_concurrency)) as executor:
+        comment_lists = list(executor.map(lambda post: get_post_comments(post.permalink, comment_limit), posts))
+    return [[post.permalink, build_discussion_text(post, comments)] for post, comments in zip(posts, comment_lists)]
@@ -0,0 +1,134 @@
+"""
+Local text similarity service for matching stored topic details.
+Builds hashed bag-of-features vectors (word unigrams, word bigrams and character
+trigrams) with NumPy and ranks candidates by vectorized cosine similarity.
+Vectors are persisted with the documents, so hashing must be stable across processes.
+"""
+
+import re
+import zlib
+from typing import List, Tuple, Optional
+import numpy as np
+from src.config.logger import get_logger
+
+logger = get_logger("Similarity")
+
+VECTOR_DIM = 512
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+# Feature weights: whole words carry most of the meaning, trigrams absorb wording variations
+_UNIGRAM_WEIGHT = 1.0
+_BIGRAM_WEIGHT = 0.7
+_TRIGRAM_WEIGHT = 0.3
+
+
+def _features(text: str) -> Tuple[List[str], List[float]]:
+    """
+    Split text into weighted features.
+
+    Args:
+        text: Text to featurize
+
+    Returns:
+        Tuple of (features, weights)
+    """
+    tokens = _TOKEN_PATTERN.findall(text.lower())
+    features = []
+    weights = []
+
+    for token in tokens:
+        features.append(f"w:{token}")
+        weights.append(_UNIGRAM_WEIGHT)
+        padded = f"#{token}#"
+        for i in range(len(padded) - 2):
+            features.append(f"c:{padded[i:i + 3]}")
+            weights.append(_TRIGRAM_WEIGHT)
+
+    for first, second in zip(tokens, tokens[1:]):
+        features.append(f"b:{first} {second}")
+        weights.append(_BIGRAM_WEIGHT)
+
+    return features, weights
+
+
+def embed_text(text: str, dim: int = VECTOR_DIM) -> np.ndarray:
+    """
+    Compute an L2-normalized hashed feature vector for a text.
+
+    Args:
+        text: Text to embed (e.g., request details)
+        dim: Vector dimension
+
+    Returns:
+        float32 vector of length dim (all zeros for empty text)
+    """
+    features, weights = _features(text or "")
+    if not features:
+        return np.zeros(dim, dtype=np.float32)
+
+    hashes = np.fromiter((zlib.crc32(f.encode("utf-8")) for f in features), dtype=np.uint64, count=len(features))
+    indices = (hashes % dim).astype(np.int64)
+    # Signed hashing keeps collisions from inflating similarity
+    signs = np.where((hashes >> 31) & 1, -1.0, 1.0)
+    vector = np.bincount(indices, weights=signs * np.asarray(weights), minlength=dim).astype(np.float32)
+
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm > 0 else vector
+
+
+def cosine_similarities(query: np.ndarray, matrix: np.ndarray) -> np.ndarray:
+    """
+    Compute cosine similarity between a query vector and each row of a matrix.
+
+    Args:
+        query: Vector of shape (dim,)
+        matrix: Matrix of shape (n, dim)
+
+    Returns:
+        Array of shape (n,) with similarities (0.0 for zero rows)
+    """
+    if matrix.size == 0:
+        return np.zeros(0, dtype=np.float32)
+
+    row_norms = np.linalg.norm(matrix, axis=1)
+    query_norm = np.linalg.norm(query)
+    denominators = row_norms * query_norm
+    dots = matrix @ query
+    return np.divide(dots, denominators, out=np.zeros_like(dots), where=denominators > 0)
+
+
+def _stored_vector(candidate: dict, dim: int) -> np.ndarray:
+    """Use the persisted vector if it matches the current dimension, otherwise recompute it."""
+    stored: Optional[list] = candidate.get("details_vector")
+    if stored is not None and len(stored) == dim:
+        return np.asarray(stored, dtype=np.float32)
+    return embed_text(candidate.get("details", ""), dim)
+
+
+def find_similar_details(details: str, candidates: List[dict], threshold: float) -> List[Tuple[str, float]]:
+    """
+    Rank stored details by similarity to the requested details.
+
+    Args:
+        details: Requested details
+        candidates: Dicts with "details" and optional persisted "details_vector"
+        threshold: Minimum cosine similarity to keep a match
+
+    Returns:
+        List of (stored details, similarity) above threshold, best match first
+    """
+    candidates = [c for c in candidates if c.get("details")]
+    if not details or not candidates:
+        return []
+
+    query = embed_text(details)
+    matrix = np.vstack([_stored_vector(c, VECTOR_DIM) for c in candidates])
+    scores = cosine_similarities(query, matrix)
+
+    order = np.argsort(-scores)
+    matches = [(candidates[i]["details"], float(scores[i])) for i in order if scores[i] >= threshold]
+
+    best = float(scores[order[0]])
+    logger.info(f"Details similarity search over {len(candidates)} candidates: best={best:.2f}, matches={len(matches)}")
+    return matches
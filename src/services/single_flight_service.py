@@ -0,0 +1,217 @@
+"""
+Single-flight coordination for pipeline stages.
+Concurrent runs of the same stage for the same normalized (topic, details) and the same
+stage inputs share one execution: the first caller (the leader) does the external work and the others wait
+for its result. Across workers, the leader is elected with a lease document in the
+"Pipeline leases" collection, and the result is stored on the lease for the others.
+"""
+
+import copy
+import hashlib
+import json
+import os
+import socket
+import time
+import threading
+from uuid import uuid4
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from datetime import datetime, timedelta
+from typing import Callable, TypeVar, Optional, Any
+from pymongo import errors
+from src.config.logger import get_logger
+from src.config.settings import settings
+from src.services import metrics_service
+
+logger = get_logger("SingleFlight")
+
+T = TypeVar("T")
+
+LEASE_COLLECTION = "Pipeline leases"
+_POLL_INTERVAL_SECONDS = 0.5
+_WORKER_ID = f"{socket.gethostname()}:{os.getpid()}"
+
+_lock = threading.Lock()
+_inflight: dict[str, Future] = {}
+
+
+def _inputs_digest(inputs: Any) -> str:
+    """Stable short hash of JSON-serializable stage inputs (dict key order does not matter)."""
+    payload = json.dumps(inputs, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def normalize_key(stage: str, topic: str, details: str, inputs: Any = None) -> str:
+    """
+    Build the single-flight key for a stage, normalized (topic, details) and stage inputs.
+
+    Args:
+        stage: Pipeline stage name (e.g., "find_url")
+        topic: Topic
+        details: Details
+        inputs: Optional JSON-serializable inputs the stage result depends on (e.g., the URLs
+            to extract); runs with different inputs get different keys
+
+    Returns:
+        Key string (topic and details are case and whitespace insensitive)
+    """
+    normalized_topic = " ".join((topic or "").lower().split())
+    normalized_details = " ".join((details or "").lower().split())
+    key = f"{stage}|{normalized_topic}|{normalized_details}"
+    if inputs is not None:
+        key += f"|{_inputs_digest(inputs)}"
+    return key
+
+
+def _acquire_lease(collection: Any, key: str, owner: str) -> bool:
+    """
+    Try to take the lease for a key. Succeeds if there is no lease or the existing one expired.
+
+    Returns:
+        True if this worker is now the leader
+    """
+    now = datetime.utcnow()
+    try:
+        collection.update_one(
+            {"_id": key, "expires_at": {"$lt": now}},
+            {"$set": {
+                "owner": owner,
+                "status": "running",
+                "result": None,
+                "started_at": now,
+                "expires_at": now + timedelta(seconds=settings.single_flight_lease_seconds),
+            }},
+            upsert=True,
+        )
+        return True
+    except errors.DuplicateKeyError:
+        # Lease document exists and has not expired: another worker is (or just was) the leader
+        return False
+
+
+def _complete_lease(collection: Any, key: str, owner: str, result: Any) -> None:
+    """Store the leader's result on the lease so waiting workers can reuse it for a short time."""
+    now = datetime.utcnow()
+    collection.update_one(
+        {"_id": key, "owner": owner},
+        {"$set": {
+            "status": "done",
+            "result": {"value": result},
+            "completed_at": now,
+            "expires_at": now + timedelta(seconds=settings.single_flight_result_ttl_seconds),
+        }},
+    )
+
+
+def _wait_for_remote_result(collection: Any, key: str) -> Optional[dict]:
+    """
+    Wait for another worker's leader to finish.
+
+    Returns:
+        {"value": result} when the remote leader finished, None if the lease was
+        released, expired, could not be read or the wait timed out (caller should run the work itself)
+    """
+    deadline = time.monotonic() + settings.single_flight_wait_timeout_seconds
+    while time.monotonic() < deadline:
+        try:
+            lease = collection.find_one({"_id": key})
+        except Exception as e:
+            logger.warning(f"Could not read lease for '{key}': {e}")
+            return None
+        if lease is None or lease.get("expires_at", datetime.min) < datetime.utcnow():
+            return None
+        if lease.get("status") == "done":
+            return lease.get("result")
+        time.sleep(_POLL_INTERVAL_SECONDS)
+    return None
+
+
+def _run_as_leader(key: str, fn: Callable[[], T]) -> T:
+    """Run fn as the in-process leader, coordinating with other workers if enabled."""
+    if not settings.single_flight_distributed:
+        return fn()
+
+    from src.services.mongo_service import get_collection
+
+    collection = get_collection(LEASE_COLLECTION)
+    if collection is None:
+        return fn()
+
+    owner = f"{_WORKER_ID}:{uuid4().hex}"
+    try:
+        is_leader = _acquire_lease(collection, key, owner)
+    except Exception as e:
+        logger.warning(f"Could not acquire lease for '{key}', running locally: {e}")
+        return fn()
+
+    if not is_leader:
+        remote = _wait_for_remote_result(collection, key)
+        if remote is not None:
+            metrics_service.increment("single_flight.remote_shared")
+            logger.info(f"Reused result of another worker for '{key}'")
+            return remote["value"]
+        logger.info(f"Remote leader for '{key}' did not finish, running locally")
+        return fn()
+
+    try:
+        result = fn()
+    except BaseException:
+        try:
+            collection.delete_one({"_id": key, "owner": owner})
+        except Exception as e:
+            # The lease expires on its own; the leader's error is the one to surface
+            logger.warning(f"Could not release lease for '{key}': {e}")
+        raise
+    try:
+        _complete_lease(collection, key, owner, result)
+    except Exception as e:
+        logger.warning(f"Could not store single-flight result for '{key}': {e}")
+    return result
+
+
+def run_single_flight(stage: str, topic: str, details: str, fn: Callable[[], T], inputs: Any = None) -> T:
+    """
+    Run a pipeline stage once per normalized (topic, details) and inputs across concurrent callers.
+
+    Args:
+        stage: Pipeline stage name (part of the key)
+        topic: Topic
+        details: Details
+        fn: Zero-argument function doing the work; its result must be BSON-serializable
+            when distributed single-flight is enabled
+        inputs: Optional JSON-serializable inputs fn depends on; only callers with equal
+            inputs share a result
+
+    Returns:
+        The result of fn, from this call or from the shared in-flight run
+    """
+    if not settings.single_flight_enabled:
+        return fn()
+
+    key = normalize_key(stage, topic, details, inputs)
+    with _lock:
+        future = _inflight.get(key)
+        is_leader = future is None
+        if is_leader:
+            future = Future()
+            _inflight[key] = future
+
+    if not is_leader:
+        metrics_service.increment("single_flight.shared")
+        logger.info(f"Waiting for in-flight run of '{key}'")
+        try:
+            return copy.deepcopy(future.result(timeout=settings.single_flight_wait_timeout_seconds))
+        except FutureTimeoutError:
+            logger.warning(f"In-flight run of '{key}' timed out, running locally")
+            return fn()
+
+    metrics_service.increment("single_flight.leader")
+    try:
+        result = _run_as_leader(key, fn)
+        future.set_result(result)
+        return result
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _lock:
+            _inflight.pop(key, None)
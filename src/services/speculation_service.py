@@ -0,0 +1,202 @@
+"""
+Speculative background prefetch while waiting for the ASK_DATE yes/no reply.
+When stored content is offered to the user, fresh discovery and extraction start in
+the background. A "no" reply attaches to the in-flight (or finished) result, a "yes"
+reply cancels it. Speculation is capped by concurrency and a daily budget.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, Future, CancelledError, TimeoutError as FutureTimeoutError
+from datetime import datetime
+from typing import Optional
+from src.config.logger import get_logger
+from src.config.settings import settings
+from src.services import metrics_service
+from src.services.single_flight_service import normalize_key
+
+logger = get_logger("Speculation")
+
+# How long a "no" reply waits for an in-flight speculation before giving up on it
+_ATTACH_TIMEOUT_SECONDS = 240
+
+_lock = threading.Lock()
+_executor: Optional[ThreadPoolExecutor] = None
+_speculations: dict = {}
+_budget = {"day": None, "used": 0}
+
+
+class _Speculation:
+    """A background prefetch for one conversation."""
+
+    __slots__ = ("key", "future", "cancel_event", "started_at")
+
+    def __init__(self, key: str, future: Future, cancel_event: threading.Event):
+        self.key = key
+        self.future = future
+        self.cancel_event = cancel_event
+        self.started_at = time.monotonic()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Get or create the speculation thread pool."""
+    global _executor
+
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.speculative_max_concurrent,
+            thread_name_prefix="speculation"
+        )
+    return _executor
+
+
+def _prefetch(topic: str, details: str, cancel_event: threading.Event) -> Optional[dict]:
+    """
+    Run discovery, transcript ingestion (when enabled) and extraction, stopping between
+    stages if cancelled. The stages are the graph's own nodes, so YouTube URLs use their
+    transcripts here as well instead of page extraction.
+
+    Returns:
+        Dict with "urls", "core_texts", "core_text_urls", "stored_text_urls" and
+        "failed_results", or None if cancelled
+    """
+    # Imported lazily: nodes import the services package
+    from src.graph.nodes.find_url_node import find_url_node
+    from src.graph.nodes.core_text_extraction_node import core_text_extraction_node
+    from src.graph.nodes.transcript_ingestion_node import transcript_ingestion_node
+
+    state = {"topic": topic, "details": details}
+    state.update(find_url_node(state))
+    if cancel_event.is_set():
+        logger.info(f"Speculation for topic '{topic}' cancelled after discovery")
+        return None
+    if state.get("urls"):
+        if settings.youtube_transcripts_enabled:
+            state.update(transcript_ingestion_node(state))
+        state.update(core_text_extraction_node(state))
+    return {
+        "urls": state.get("urls", []),
+        "core_texts": state.get("core_texts", []),
+        "core_text_urls": state.get("core_text_urls", []),
+        "stored_text_urls": state.get("stored_text_urls", []),
+        "failed_results": state.get("failed_results", []),
+    }
+
+
+def _evict_expired() -> None:
+    """Cancel speculations whose conversation never replied. Caller holds the lock."""
+    now = time.monotonic()
+    for conversation_id, speculation in list(_speculations.items()):
+        if now - speculation.started_at > settings.speculative_ttl_seconds:
+            speculation.cancel_event.set()
+            speculation.future.cancel()
+            del _speculations[conversation_id]
+            metrics_service.increment("speculation.expired")
+
+
+def _take_budget() -> bool:
+    """Reserve one speculation from today's budget. Caller holds the lock."""
+    today = datetime.utcnow().date().isoformat()
+    if _budget["day"] != today:
+        _budget["day"] = today
+        _budget["used"] = 0
+    if _budget["used"] >= settings.speculative_daily_budget:
+        return False
+    _budget["used"] += 1
+    return True
+
+
+def start_speculative_prefetch(conversation_id: Optional[str], topic: str, details: str) -> bool:
+    """
+    Start a background prefetch for a conversation waiting on the date question.
+
+    Args:
+        conversation_id: Conversation waiting for the reply
+        topic: Topic
+        details: Details
+
+    Returns:
+        True if a speculation is running for the conversation
+    """
+    if not settings.speculative_prefetch_enabled or not conversation_id or not topic:
+        return False
+
+    with _lock:
+        _evict_expired()
+        if conversation_id in _speculations:
+            return True
+        active = sum(1 for s in _speculations.values() if not s.future.done())
+        if active >= settings.speculative_max_concurrent:
+            metrics_service.increment("speculation.skipped_concurrency")
+            logger.info(f"Speculation skipped for {conversation_id}: {active} already running")
+            return False
+        if not _take_budget():
+            metrics_service.increment("speculation.skipped_budget")
+            logger.info(f"Speculation skipped for {conversation_id}: daily budget spent")
+            return False
+
+        cancel_event = threading.Event()
+        future = _get_executor().submit(_prefetch, topic, details, cancel_event)
+        _speculations[conversation_id] = _Speculation(normalize_key("speculation", topic, details), future, cancel_event)
+
+    metrics_service.increment("speculation.started")
+    logger.info(f"Started speculative prefetch for {conversation_id}: topic '{topic}', details '{details}'")
+    return True
+
+
+def cancel_speculative_prefetch(conversation_id: Optional[str]) -> None:
+    """
+    Cancel a conversation's speculation (the user accepted the stored content).
+
+    Args:
+        conversation_id: Conversation id
+    """
+    with _lock:
+        speculation = _speculations.pop(conversation_id, None)
+    if speculation is None:
+        return
+
+    speculation.cancel_event.set()
+    speculation.future.cancel()
+    metrics_service.increment("speculation.cancelled")
+    logger.info(f"Cancelled speculative prefetch for {conversation_id}")
+
+
+def take_speculative_prefetch(conversation_id: Optional[str], topic: str, details: str) -> Optional[dict]:
+    """
+    Attach to a conversation's speculation (the user rejected the stored content).
+    Waits for the result if it is still running.
+
+    Args:
+        conversation_id: Conversation id
+        topic: Topic of the current request (must match the speculation)
+        details: Details of the current request (must match the speculation)
+
+    Returns:
+        Dict with "urls", "core_texts", "core_text_urls", "stored_text_urls" and "failed_results",
+        or None if there is no usable speculation
+    """
+    with _lock:
+        speculation = _speculations.pop(conversation_id, None)
+    if speculation is None:
+        return None
+
+    if speculation.key != normalize_key("speculation", topic, details):
+        speculation.cancel_event.set()
+        speculation.future.cancel()
+        metrics_service.increment("speculation.mismatch")
+        logger.info(f"Speculation for {conversation_id} was for a different topic, discarding")
+        return None
+
+    try:
+        result = speculation.future.result(timeout=_ATTACH_TIMEOUT_SECONDS)
+    except (CancelledError, FutureTimeoutError):
+        return None
+    except Exception as e:
+        logger.warning(f"Speculative prefetch for {conversation_id} failed: {e}")
+        return None
+
+    if result:
+        metrics_service.increment("speculation.hit")
+        logger.info(f"Using speculative prefetch for {conversation_id}: {len(result['urls'])} URLs")
+    return result
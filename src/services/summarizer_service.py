@@ -0,0 +1,134 @@
+"""
+Local extractive summarizer for long source texts.
+Ranks sentences with TextRank over TF-IDF sentence vectors (NumPy) and keeps the most
+central ones, in their original order, within a token budget. No LLM call is made.
+"""
+
+import math
+import re
+from typing import List
+import numpy as np
+from src.config.logger import get_logger
+
+logger = get_logger("Summarizer")
+
+# Same rough estimate as the prompt limits in openai_service: 1 token ≈ 4 characters
+CHARS_PER_TOKEN = 4
+
+_SENTENCE_PATTERN = re.compile(r"(?<=[.!?])\s+|\n+")
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+_DAMPING = 0.85
+_MAX_ITERATIONS = 50
+_TOLERANCE = 1e-6
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of tokens in a text."""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def split_sentences(text: str) -> List[str]:
+    """
+    Split text into sentences (on sentence punctuation and line breaks).
+
+    Args:
+        text: Text to split
+
+    Returns:
+        Non-empty, stripped sentences
+    """
+    return [s.strip() for s in _SENTENCE_PATTERN.split(text or "") if s.strip()]
+
+
+def _tfidf_matrix(sentences: List[str]) -> np.ndarray:
+    """
+    Build L2-normalized TF-IDF vectors, one row per sentence.
+
+    Args:
+        sentences: Sentences to vectorize
+
+    Returns:
+        Matrix of shape (n_sentences, n_terms)
+    """
+    tokenized = [_TOKEN_PATTERN.findall(s.lower()) for s in sentences]
+    vocabulary = {}
+    for tokens in tokenized:
+        for token in tokens:
+            vocabulary.setdefault(token, len(vocabulary))
+
+    counts = np.zeros((len(sentences), max(len(vocabulary), 1)), dtype=np.float32)
+    for row, tokens in enumerate(tokenized):
+        if tokens:
+            np.add.at(counts[row], [vocabulary[t] for t in tokens], 1.0)
+
+    document_frequency = (counts > 0).sum(axis=0)
+    idf = np.log((1 + len(sentences)) / (1 + document_frequency)) + 1.0
+    tfidf = counts * idf
+
+    norms = np.linalg.norm(tfidf, axis=1, keepdims=True)
+    return np.divide(tfidf, norms, out=np.zeros_like(tfidf), where=norms > 0)
+
+
+def rank_sentences(sentences: List[str]) -> np.ndarray:
+    """
+    Score sentences by TextRank centrality over their cosine similarity graph.
+
+    Args:
+        sentences: Sentences to rank
+
+    Returns:
+        Array of scores, one per sentence (higher is more central)
+    """
+    n = len(sentences)
+    if n == 0:
+        return np.zeros(0, dtype=np.float32)
+
+    vectors = _tfidf_matrix(sentences)
+    similarity = vectors @ vectors.T
+    np.fill_diagonal(similarity, 0.0)
+
+    # Row-normalize into a transition matrix; sentences without neighbours jump uniformly
+    row_sums = similarity.sum(axis=1, keepdims=True)
+    transition = np.divide(similarity, row_sums, out=np.full_like(similarity, 1.0 / n), where=row_sums > 0)
+
+    scores = np.full(n, 1.0 / n, dtype=np.float32)
+    for _ in range(_MAX_ITERATIONS):
+        updated = (1 - _DAMPING) / n + _DAMPING * (transition.T @ scores)
+        if np.abs(updated - scores).sum() < _TOLERANCE:
+            scores = updated
+            break
+        scores = updated
+    return scores
+
+
+def summarize_text(text: str, max_tokens: int) -> str:
+    """
+    Compress a text to its most central sentences within a token budget.
+
+    Args:
+        text: Source text
+        max_tokens: Token budget for the summary
+
+    Returns:
+        The text itself if it fits the budget, otherwise the selected sentences in original order
+    """
+    if not text or estimate_tokens(text) <= max_tokens:
+        return text
+
+    sentences = split_sentences(text)
+    if len(sentences) < 2:
+        return text[:max_tokens * CHARS_PER_TOKEN]
+
+    scores = rank_sentences(sentences)
+    selected = []
+    used = 0
+    for index in np.argsort(-scores, kind="stable"):
+        cost = estimate_tokens(sentences[index]) + 1
+        if used + cost > max_tokens:
+            continue
+        selected.append(int(index))
+        used += cost
+
+    summary = " ".join(sentences[i] for i in sorted(selected))
+    logger.debug(f"Summarized {estimate_tokens(text)} tokens to {estimate_tokens(summary)} ({len(selected)}/{len(sentences)} sentences)")
+    return summary
@@ -2,16 +2,25 @@
 Tavily API service for search and content extraction.
 """
 
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
 from typing import List, Optional
 from datetime import datetime, timedelta
 from tavily import TavilyClient
 from src.config.logger import get_logger
 from src.config.settings import settings
+from src.services import metrics_service, budget_service, http_transport_service
+from src.services.circuit_breaker_service import get_breaker
+from src.services.text_cleaning_service import clean_texts
 
 logger = get_logger("Tavily")
 
 _tavily_client = None
 
+# Extra wait on top of the per-request extract timeout before a batch counts as timed out
+_EXTRACT_TIMEOUT_GRACE_SECONDS = 5
+
 
 def _get_tavily_client() -> Optional[TavilyClient]:
     """Get or create Tavily client instance."""
@@ -25,7 +34,8 @@ def _get_tavily_client() -> Optional[TavilyClient]:
         return None
     
     try:
-        _tavily_client = TavilyClient(api_key=settings.tavily_api_key)
+        # Connections are pooled with the other services' (shared transport)
+        _tavily_client = TavilyClient(api_key=settings.tavily_api_key, session=http_transport_service.create_session())
         logger.info("Tavily client initialized")
         return _tavily_client
     except Exception as e:
@@ -33,13 +43,16 @@ def _get_tavily_client() -> Optional[TavilyClient]:
         return None
 
 
-def search_tavily(query: str, max_results: int = 5) -> List[dict]:
+def search_tavily(query: str, max_results: int = 5, include_raw_content: bool = False,
+                  search_depth: str = "advanced") -> List[dict]:
     """
     Search Tavily for relevant content.
     
     Args:
         query: Search query
         max_results: Maximum number of results
+        include_raw_content: Also return the page text of each result (raw_content)
+        search_depth: "basic" (faster, cheaper) or "advanced"
     
     Returns:
         List of search results with content
@@ -49,18 +62,32 @@ def search_tavily(query: str, max_results: int = 5) -> List[dict]:
         logger.warning("Tavily client not available")
         return []
     
+    # Past the soft budget limit advanced searches are downgraded to basic
+    if search_depth == "advanced" and budget_service.get_level(budget_service.TAVILY) != budget_service.OK:
+        logger.info("Tavily budget past its soft limit - using basic search depth")
+        search_depth = "basic"
+    credits = budget_service.TAVILY_SEARCH_CREDITS.get(search_depth, 1)
+    if not budget_service.reserve(budget_service.TAVILY, credits):
+        return []
+    
     try:
-        logger.info(f"Searching Tavily for: {query}")
-        response = client.search(
+        logger.info(f"Searching Tavily ({search_depth}) for: {query}")
+        started = time.perf_counter()
+        response = get_breaker("tavily").call(
+            client.search,
             query=query,
             max_results=max_results,
-            search_depth="advanced"
+            search_depth=search_depth,
+            include_raw_content=include_raw_content
         )
+        metrics_service.observe(f"tavily.search.{search_depth}.latency_ms", (time.perf_counter() - started) * 1000)
         
         results = response.get("results", [])
         logger.info(f"Tavily search returned {len(results)} results")
         return results
     except Exception as e:
+        # Rejected or failed calls are not billed: give the reserved credits back
+        budget_service.release(budget_service.TAVILY, credits)
         logger.error(f"Tavily search failed: {e}", exc_info=True)
         return []
 
@@ -77,137 +104,350 @@ def get_viral_urls_from_last_month(topic: str, details: str, limit: int = 2) ->
     Returns:
         List of URLs from Tavily search results from the last month
     """
+    return [result["url"] for result in get_viral_results_from_last_month(topic, details, limit)]
+
+
+def _result_age_days(result: dict) -> Optional[int]:
+    """
+    Age of a search result in days, from its published_date.
+    
+    Returns:
+        Age in days, or None if the result has no parseable date
+    """
+    published_date = result.get("published_date")
+    if not published_date:
+        return None
+    
+    try:
+        # Handle different date formats
+        if isinstance(published_date, str):
+            if "Z" in published_date:
+                pub_date = datetime.fromisoformat(published_date.replace("Z", "+00:00"))
+            else:
+                pub_date = datetime.fromisoformat(published_date)
+        else:
+            pub_date = datetime.fromtimestamp(published_date)
+        
+        # Convert to UTC for comparison
+        now = datetime.now(pub_date.tzinfo) if pub_date.tzinfo else datetime.utcnow()
+        return (now - pub_date).days
+    except Exception as e:
+        logger.debug(f"Could not parse date {published_date}: {e}")
+        return None
+
+
+def _filter_recent_results(results: List[dict], limit: int) -> List[dict]:
+    """
+    Keep one result per URL from the last month (results without a parseable date are kept).
+    
+    Args:
+        results: Tavily search results
+        limit: Number of results to keep
+    
+    Returns:
+        Filtered results, in Tavily's order
+    """
+    urls = []
+    kept_results = []
+    for result in results:
+        url = result.get("url", "")
+        if not url or url in urls:
+            continue
+        
+        age_days = _result_age_days(result)
+        if age_days is not None and age_days > 30:
+            continue
+        
+        urls.append(url)
+        kept_results.append(result)
+        logger.debug(f"Found Tavily URL: {url}")
+        
+        if len(kept_results) >= limit:
+            break
+    return kept_results
+
+
+def _escalation_reason(results: List[dict], limit: int) -> Optional[str]:
+    """
+    Decide whether basic-depth results are good enough.
+    
+    Args:
+        results: Filtered basic-depth results
+        limit: Number of results wanted
+    
+    Returns:
+        "too_few", "too_old" or "low_score" if an advanced search is needed, otherwise None
+    """
+    if len(results) < min(settings.tavily_escalate_min_results, limit):
+        return "too_few"
+    
+    ages = [age for age in (_result_age_days(r) for r in results) if age is not None]
+    if ages and sum(ages) / len(ages) > settings.tavily_escalate_max_age_days:
+        return "too_old"
+    
+    scores = [r["score"] for r in results if isinstance(r.get("score"), (int, float))]
+    if scores and max(scores) < settings.tavily_escalate_min_score:
+        return "low_score"
+    return None
+
+
+def get_viral_results_from_last_month(topic: str, details: str, limit: int = 2,
+                                      include_raw_content: bool = False) -> List[dict]:
+    """
+    Get viral Tavily search results from the last month.
+    With adaptive depth, a basic search runs first and escalates to advanced only
+    when its results are too few, too old or too low-scoring.
+    
+    Args:
+        topic: General topic category
+        details: Specific details or sub-topics
+        limit: Number of results to return
+        include_raw_content: Also request the page text of each result in the same search call
+    
+    Returns:
+        List of search results (url, content snippet and optional raw_content), one per URL
+    """
     logger.info(f"Searching Tavily for viral content: {topic}, {details}")
     
     try:
         # Combine topic and details for search query
         query = f"{topic} {details} viral trending".strip() if details else f"{topic} viral trending"
         
-        # Search Tavily - it typically returns recent/viral content
-        results = search_tavily(query, max_results=limit)
-        
-        # Filter and extract URLs, prioritizing by score/engagement if available
-        urls = []
-        for result in results:
-            url = result.get("url", "")
-            if url and url not in urls:
-                # Check if result has date info (Tavily results may include published_date)
-                published_date = result.get("published_date")
-                if published_date:
-                    try:
-                        # Parse date and check if within last month
-                        # Handle different date formats
-                        if isinstance(published_date, str):
-                            if "Z" in published_date:
-                                pub_date = datetime.fromisoformat(published_date.replace("Z", "+00:00"))
-                            else:
-                                pub_date = datetime.fromisoformat(published_date)
-                        else:
-                            pub_date = datetime.fromtimestamp(published_date)
-                        
-                        # Check if within last month
-                        # Convert to UTC for comparison
-                        if pub_date.tzinfo:
-                            now = datetime.now(pub_date.tzinfo)
-                            days_diff = (now - pub_date).days
-                        else:
-                            now = datetime.utcnow()
-                            days_diff = (now - pub_date).days
-                        
-                        if days_diff > 30:
-                            continue
-                    except Exception as e:
-                        logger.debug(f"Could not parse date {published_date}: {e}")
-                        pass  # If date parsing fails, include it anyway
-                
-                urls.append(url)
-                logger.debug(f"Found Tavily URL: {url}")
-                
-                if len(urls) >= limit:
-                    break
+        if not settings.tavily_adaptive_depth_enabled:
+            results = search_tavily(query, max_results=limit, include_raw_content=include_raw_content)
+            kept_results = _filter_recent_results(results, limit)
+        else:
+            results = search_tavily(query, max_results=limit, include_raw_content=include_raw_content, search_depth="basic")
+            kept_results = _filter_recent_results(results, limit)
+            reason = _escalation_reason(kept_results, limit)
+            if reason is not None and budget_service.get_level(budget_service.TAVILY) != budget_service.OK:
+                logger.info(f"Not escalating Tavily search ({reason}): budget past its soft limit")
+                metrics_service.increment("tavily.search.escalation_skipped_budget")
+                reason = None
+            if reason is None:
+                metrics_service.increment("tavily.search.basic_sufficient")
+            else:
+                metrics_service.increment("tavily.search.escalated")
+                metrics_service.increment(f"tavily.search.escalated.{reason}")
+                logger.info(f"Escalating Tavily search to advanced depth ({reason})")
+                results = search_tavily(query, max_results=limit, include_raw_content=include_raw_content, search_depth="advanced")
+                # Keep the basic results if the advanced search fails or finds nothing
+                kept_results = _filter_recent_results(results, limit) or kept_results
         
-        logger.info(f"Found {len(urls)} Tavily URLs from last month")
-        return urls[:limit]
+        logger.info(f"Found {len(kept_results)} Tavily URLs from last month")
+        return kept_results
         
     except Exception as e:
         logger.error(f"Error searching Tavily for viral URLs: {e}", exc_info=True)
         return []
 
 
-def extract_core_text_from_urls(urls: list[str], topic: str, details: str) -> str:
+def _parse_extract_response(response, urls: list[str]) -> tuple[dict[str, str], dict[str, str]]:
     """
-    Extract core relevant text from a URL using Tavily extract API.
+    Parse a Tavily extract response into texts and failures per URL.
     
     Args:
-        url: URL to extract content from
+        response: Response of client.extract
+        urls: URLs that were requested
+    
+    Returns:
+        Tuple of (URL -> raw text, URL -> error)
+    """
+    texts: dict[str, str] = {}
+    failed: dict[str, str] = {}
+
+    # Handle different response formats
+    if isinstance(response, dict):
+        # If response is a dict, check for 'results' or 'content' keys
+        results = response.get("results", [])
+        for failure in response.get("failed_results", []) or []:
+            if isinstance(failure, dict) and failure.get("url"):
+                failed[failure["url"]] = str(failure.get("error") or "extract failed")
+        if not results:
+            # Try 'content' as a direct string (cannot be attributed to a single URL)
+            content = response.get("content", "")
+            if content:
+                logger.info(f"Extracted {len(content)} characters from response content")
+                return {urls[0]: content}, failed
+    elif isinstance(response, list):
+        # If response is a list, iterate through results
+        results = response
+    else:
+        logger.warning(f"Unexpected response type: {type(response)}")
+        results = []
+
+    # Process results list
+    for index, result in enumerate(results):
+        if isinstance(result, dict):
+            # Extract content from result dict
+            raw_content = result.get('raw_content', '') or result.get('content', '')
+            url = result.get('url') or (urls[index] if index < len(urls) else f"unknown-{index}")
+            if raw_content:
+                texts[url] = raw_content.strip()
+                logger.debug(f"Extracted {len(raw_content)} characters from {url}")
+        elif isinstance(result, str):
+            # If result is a string, attribute it to the URL at the same position
+            url = urls[index] if index < len(urls) else f"unknown-{index}"
+            texts[url] = result.strip()
+        else:
+            logger.warning(f"Unexpected result type: {type(result)}")
+    return texts, failed
+
+
+def _extract_batch(client: TavilyClient, batch: list[str]) -> tuple[dict[str, str], dict[str, str]]:
+    """
+    Extract one batch of URLs. Errors fail only this batch.
+    
+    Returns:
+        Tuple of (URL -> raw text, URL -> error)
+    """
+    started = time.perf_counter()
+    try:
+        response = get_breaker("tavily").call(
+            client.extract, urls=batch, include_images=False, timeout=settings.tavily_extract_timeout_seconds
+        )
+        return _parse_extract_response(response, batch)
+    except Exception as e:
+        logger.warning(f"Tavily extract batch failed for {batch}: {e}")
+        return {}, {url: str(e) or type(e).__name__ for url in batch}
+    finally:
+        metrics_service.observe("tavily.extract.batch_latency_ms", (time.perf_counter() - started) * 1000)
+
+
+def extract_core_texts_with_failures(urls: list[str], topic: str, details: str) -> tuple[dict[str, str], dict[str, str]]:
+    """
+    Extract core text per URL using Tavily extract API.
+    URLs are split into batches that run concurrently, each with its own timeout;
+    whatever succeeds is kept and every URL without text is reported as failed.
+    
+    Args:
+        urls: URLs to extract content from
         topic: General topic
         details: Specific details
     
     Returns:
-        Extracted core text relevant to topic/details
+        Tuple of (URL -> cleaned text in request order, URL -> error for failed URLs)
     """
     client = _get_tavily_client()
     if not client:
         logger.warning("Tavily client not available - cannot extract from URL")
-        return ""
+        return {}, {url: "Tavily client not available" for url in urls}
+    
+    if not urls:
+        return {}, {}
+    
+    # Without budget the pipeline continues with stored texts only (cache-only)
+    reserved_credits = math.ceil(len(urls) / budget_service.TAVILY_URLS_PER_EXTRACT_CREDIT)
+    if not budget_service.reserve(budget_service.TAVILY, reserved_credits):
+        return {}, {url: "Tavily daily budget spent" for url in urls}
     
+    query = f"{topic} {details}".strip()
+    batch_size = max(settings.tavily_extract_batch_size, 1)
+    batches = [urls[i:i + batch_size] for i in range(0, len(urls), batch_size)]
+    logger.info(f"Extracting core text from {len(urls)} URLs in {len(batches)} batches using Tavily for: {query}")
+    
+    texts: dict[str, str] = {}
+    failed: dict[str, str] = {}
+    executor = ThreadPoolExecutor(max_workers=len(batches), thread_name_prefix="tavily-extract")
     try:
-        query = f"{topic} {details}".strip()
-        logger.info(f"Extracting core text from {len(urls)} URLs using Tavily for: {query}")
-        
-        # Pass urls directly (it's already a list)
-        response = client.extract(urls=urls, include_images=False)
-        
-        # Debug: log response type and structure
-        logger.debug(f"Tavily extract response type: {type(response)}")
-        if isinstance(response, (dict, list)):
-            logger.debug(f"Tavily extract response length/structure: {len(response) if isinstance(response, (list, dict)) else 'N/A'}")
-        
-        content = ""
-
-        # Handle different response formats
-        if isinstance(response, dict):
-            # If response is a dict, check for 'results' or 'content' keys
-            results = response.get("results", [])
-            if not results:
-                # Try 'content' as a direct string
-                content = response.get("content", "")
-                if content:
-                    logger.info(f"Extracted {len(content)} characters from response content")
-                    return content
-        elif isinstance(response, list):
-            # If response is a list, iterate through results
-            results = response
-        else:
-            logger.warning(f"Unexpected response type: {type(response)}")
-            results = []
-
-        # Process results list
-        for result in results:
-            if isinstance(result, dict):
-                # Extract content from result dict
-                raw_content = result.get('raw_content', '') or result.get('content', '')
-                if raw_content:
-                    content += raw_content + "\n\n"
-                    url = result.get('url', 'unknown')
-                    logger.debug(f"Extracted {len(raw_content)} characters from {url}")
-            elif isinstance(result, str):
-                # If result is a string, use it directly
-                content += result + "\n\n"
-            else:
-                logger.warning(f"Unexpected result type: {type(result)}")
+        futures = {executor.submit(_extract_batch, client, batch): batch for batch in batches}
+        # Tavily enforces the timeout per request; the grace period covers connection setup
+        done, not_done = wait(futures, timeout=settings.tavily_extract_timeout_seconds + _EXTRACT_TIMEOUT_GRACE_SECONDS)
+        for future in done:
+            batch_texts, batch_failed = future.result()
+            texts.update(batch_texts)
+            failed.update(batch_failed)
+        for future in not_done:
+            failed.update({url: "timeout" for url in futures[future]})
+    finally:
+        # Do not wait for batches that timed out
+        executor.shutdown(wait=False, cancel_futures=True)
+    
+    # Only successful extractions are billed: give back the credits reserved for the rest
+    budget_service.release(
+        budget_service.TAVILY, reserved_credits - len(texts) / budget_service.TAVILY_URLS_PER_EXTRACT_CREDIT
+    )
+    
+    for url in urls:
+        if url not in texts and url not in failed:
+            failed[url] = "no content"
+    failed = {url: error for url, error in failed.items() if url not in texts}
+    if failed:
+        metrics_service.increment("tavily.extract.failed_urls", len(failed))
+        logger.warning(f"Tavily extract failed for {len(failed)}/{len(urls)} URLs: {failed}")
+    
+    if not texts:
+        logger.warning(f"No content extracted from urls: {urls}")
+        return {}, failed
+    
+    logger.info(f"Extracted {sum(len(t) for t in texts.values())} characters of core text from {len(texts)}/{len(urls)} URLs")
+    
+    # Keep request order (results Tavily reports under another URL, e.g. after a redirect, go last)
+    ordered = {url: texts.pop(url) for url in urls if url in texts}
+    ordered.update(texts)
+    
+    # Strip navigation, banners and shared page chrome before anything is cached or stored
+    if settings.text_cleaning_enabled:
+        ordered, bytes_removed = clean_texts(ordered)
+        logger.info(f"Text cleaning removed {sum(bytes_removed.values())} bytes across {len(bytes_removed)} sources")
+    return ordered, failed
 
-        if not content:
-            logger.warning(f"No content extracted from urls: {urls}")
-            return ""
-        
-        logger.info(f"Extracted {len(content)} characters of core text from {len(urls)} URLs")
-        
-        return content.strip()
 
-    except Exception as e:
-        logger.error(f"Tavily extraction from URLs failed: {e}", exc_info=True)
-        return ""
+def extract_core_texts_by_url(urls: list[str], topic: str, details: str) -> dict[str, str]:
+    """
+    Extract core text per URL using Tavily extract API.
+    
+    Args:
+        urls: URLs to extract content from
+        topic: General topic
+        details: Specific details
+    
+    Returns:
+        Dict mapping each successfully extracted URL to its cleaned text (in request order)
+    """
+    texts, _ = extract_core_texts_with_failures(urls, topic, details)
+    return texts
+
+
+def extract_core_text_from_urls(urls: list[str], topic: str, details: str) -> str:
+    """
+    Extract core relevant text from URLs using Tavily extract API, combined into one string.
+    
+    Args:
+        urls: URLs to extract content from
+        topic: General topic
+        details: Specific details
+    
+    Returns:
+        Extracted core text relevant to topic/details
+    """
+    texts = extract_core_texts_by_url(urls, topic, details)
+    return "\n\n".join(texts.values())
+
+
+def get_search_result_texts(results: List[dict], min_chars: int) -> dict[str, str]:
+    """
+    Use the text returned with search results as core text (fast mode), so those URLs need no extract call.
+    
+    Args:
+        results: Tavily search results
+        min_chars: Minimum cleaned text length; shorter snippets are left for extract
+    
+    Returns:
+        Dict mapping URL to its text, for results with enough text
+    """
+    texts = {}
+    for result in results:
+        text = (result.get("raw_content") or result.get("content") or "").strip()
+        if result.get("url") and text:
+            texts[result["url"]] = text
+    
+    if settings.text_cleaning_enabled and texts:
+        texts, _ = clean_texts(texts)
+    
+    usable = {url: text for url, text in texts.items() if len(text) >= min_chars}
+    logger.info(f"Fast mode: {len(usable)}/{len(results)} Tavily results have enough search text to skip extract")
+    return usable
 
 
 def extract_core_text(transcript: str, topic: str, details: str) -> str:
@@ -0,0 +1,131 @@
+"""
+Boilerplate and noise stripping for extracted page text (Tavily raw_content).
+Lines stream through a chain of generator filters: whitespace normalization,
+boilerplate line heuristics, link-density filtering and removal of lines repeated
+across sources (shared headers, footers and menus).
+"""
+
+import re
+from collections import Counter
+from typing import Dict, Iterable, Iterator, Tuple
+from src.config.logger import get_logger
+from src.services import metrics_service
+
+logger = get_logger("TextCleaning")
+
+# Lines that are mostly link markup are navigation or link lists
+MAX_LINK_DENSITY = 0.5
+# Lines this short that appear in two or more sources are shared page chrome
+MAX_REPEATED_LINE_LENGTH = 200
+
+_WHITESPACE_PATTERN = re.compile(r"[ \t\u00a0]+")
+_MARKDOWN_LINK_PATTERN = re.compile(r"!?\[([^\]]*)\]\(([^)]*)\)")
+_BARE_URL_PATTERN = re.compile(r"https?://\S+")
+_BOILERPLATE_PATTERN = re.compile(
+    r"\b(cookies?|privacy policy|terms of (use|service)|all rights reserved|subscribe|newsletter|"
+    r"sign (in|up)|log ?in|create an account|advertisement|skip to (main )?content|share (this|on)|"
+    r"follow us|related (articles|posts|stories)|read more|click here|accept all|manage preferences)\b",
+    re.IGNORECASE
+)
+# Boilerplate phrases only drop short lines; longer lines mentioning them are usually real content
+_MAX_BOILERPLATE_WORDS = 12
+_MENU_SEPARATOR_PATTERN = re.compile(r"\s[|·•»]\s")
+
+
+def _normalize(lines: Iterable[str]) -> Iterator[str]:
+    """Collapse runs of spaces and strip lines; keep at most one blank line in a row."""
+    previous_blank = True
+    for line in lines:
+        line = _WHITESPACE_PATTERN.sub(" ", line).strip()
+        if not line:
+            if not previous_blank:
+                yield ""
+            previous_blank = True
+            continue
+        previous_blank = False
+        yield line
+
+
+def _is_boilerplate(line: str) -> bool:
+    """Short lines with cookie/newsletter/login/share wording, or menus separated by pipes."""
+    if len(_MENU_SEPARATOR_PATTERN.findall(line)) >= 2:
+        return True
+    return len(line.split()) <= _MAX_BOILERPLATE_WORDS and bool(_BOILERPLATE_PATTERN.search(line))
+
+
+def link_density(line: str) -> float:
+    """
+    Share of a line's characters that belong to links.
+
+    Args:
+        line: Line of text (markdown links and bare URLs are counted)
+
+    Returns:
+        Value between 0.0 and 1.0
+    """
+    if not line:
+        return 0.0
+    link_chars = sum(len(m.group(0)) for m in _MARKDOWN_LINK_PATTERN.finditer(line))
+    remainder = _MARKDOWN_LINK_PATTERN.sub("", line)
+    link_chars += sum(len(m.group(0)) for m in _BARE_URL_PATTERN.finditer(remainder))
+    return link_chars / len(line)
+
+
+def _filter_noise(lines: Iterable[str], repeated: set) -> Iterator[str]:
+    """Drop boilerplate, link-dense and cross-source repeated lines."""
+    for line in lines:
+        if line and (_is_boilerplate(line) or link_density(line) > MAX_LINK_DENSITY or line in repeated):
+            continue
+        yield line
+
+
+def _repeated_lines(texts: Iterable[str]) -> set:
+    """Find short lines that appear in two or more sources."""
+    counts = Counter()
+    for text in texts:
+        counts.update({
+            line for line in _normalize(text.splitlines())
+            if line and len(line) <= MAX_REPEATED_LINE_LENGTH
+        })
+    return {line for line, count in counts.items() if count >= 2}
+
+
+def clean_text(text: str, repeated: set = frozenset()) -> str:
+    """
+    Strip boilerplate and noise from one source text.
+
+    Args:
+        text: Raw page text
+        repeated: Lines to drop because other sources share them
+
+    Returns:
+        Cleaned text
+    """
+    lines = _filter_noise(_normalize(text.splitlines()), repeated)
+    # Filtering can leave blank lines next to each other; normalize once more
+    return "\n".join(_normalize(lines)).strip()
+
+
+def clean_texts(texts: Dict[str, str]) -> Tuple[Dict[str, str], Dict[str, int]]:
+    """
+    Strip boilerplate and noise from each source, including lines repeated across sources.
+
+    Args:
+        texts: Dict mapping URL to raw text
+
+    Returns:
+        Tuple of (URL -> cleaned text for sources with text left, URL -> bytes removed)
+    """
+    repeated = _repeated_lines(texts.values()) if len(texts) > 1 else set()
+
+    cleaned = {}
+    bytes_removed = {}
+    for url, text in texts.items():
+        result = clean_text(text, repeated)
+        removed = len(text.encode("utf-8")) - len(result.encode("utf-8"))
+        bytes_removed[url] = removed
+        metrics_service.increment("cleaning.bytes_removed", removed)
+        logger.info(f"Cleaned {url}: removed {removed} bytes ({len(text)} -> {len(result)} characters)")
+        if result:
+            cleaned[url] = result
+    return cleaned, bytes_removed
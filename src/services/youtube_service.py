@@ -2,20 +2,52 @@
 YouTube search and transcript fetching service.
 """
 
-from typing import List, Optional, Any
+import html
+import json
+import re
+import threading
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Any, Dict
 from datetime import datetime, timedelta
+import httpx
+import numpy as np
 from src.config.logger import get_logger
 from src.config.settings import settings
+from src.services.mongo_service import find_cached_transcripts, save_transcript
+from src.services import budget_service, http_transport_service
+from src.services.circuit_breaker_service import get_breaker
 
 logger = get_logger("YouTube")
 
 _youtube_client: Optional[Any] = None
+_youtube_client_lock = threading.Lock()
+# httplib2.Http is not thread-safe: each thread reuses its own connections
+_thread_local = threading.local()
+
+# videos().list accepts at most 50 IDs per call
+MAX_VIDEOS_PER_LIST = 50
+# Engagement weights relative to a view: a like or comment signals more than a view
+LIKE_WEIGHT = 10.0
+COMMENT_WEIGHT = 20.0
+# Videos younger than this are scored as if this old, so a few early views don't dominate
+MIN_AGE_HOURS = 6.0
+
+# Partial responses: only the fields discovery reads
+_SEARCH_FIELDS = "items(id/videoId)"
+_VIDEO_FIELDS = "items(id,snippet(title,publishedAt),statistics(viewCount,likeCount,commentCount))"
+
+_VIDEO_ID_PATTERN = re.compile(r"(?:[?&]v=|youtu\.be/|/shorts/|/embed/)([A-Za-z0-9_-]{11})")
+# Non-speech caption cues such as [Music] or [Applause]
+_CAPTION_CUE_PATTERN = re.compile(r"\[[^\]]{1,30}\]")
 
 
 def get_youtube_client() -> Optional[Any]:
     """
     Get or create YouTube API client instance.
-    Uses singleton pattern to reuse the same client instance.
+    Uses singleton pattern to reuse the same client instance. The client is built from the
+    discovery document bundled with google-api-python-client, so no network fetch is made;
+    it is built on application startup (warm_up_client) rather than in the first request.
     
     Returns:
         YouTube API client instance or None if API key is not configured.
@@ -29,17 +61,60 @@ def get_youtube_client() -> Optional[Any]:
         logger.warning("YOUTUBE_API_KEY not configured")
         return None
     
+    with _youtube_client_lock:
+        if _youtube_client is not None:
+            return _youtube_client
+        try:
+            from googleapiclient.discovery import build
+            _youtube_client = build(
+                "youtube", "v3",
+                developerKey=settings.youtube_api_key,
+                static_discovery=True,
+                cache_discovery=False
+            )
+            logger.info("YouTube client initialized successfully")
+            return _youtube_client
+        except ImportError:
+            logger.error("googleapiclient.discovery not installed. Install with: pip install google-api-python-client")
+            return None
+        except Exception as e:
+            logger.error(f"Failed to initialize YouTube client: {e}", exc_info=True)
+            return None
+
+
+def warm_up_client() -> None:
+    """Build the YouTube client ahead of the first request (called on application startup)."""
+    if settings.youtube_api_key:
+        get_youtube_client()
+
+
+def _get_thread_http() -> Any:
+    """
+    Get this thread's HTTP connection object, creating it on first use.
+    
+    Returns:
+        httplib2.Http instance
+    """
+    http = getattr(_thread_local, "http", None)
+    if http is None:
+        import httplib2
+        http = httplib2.Http(timeout=settings.youtube_http_timeout_seconds)
+        _thread_local.http = http
+    return http
+
+
+def _execute(request: Any) -> Dict[str, Any]:
+    """Execute an API request on the calling thread's HTTP connections (through the YouTube circuit breaker)."""
+    return get_breaker("youtube").call(request.execute, http=_get_thread_http())
+
+
+def _execute_reserved(request: Any, units: int) -> Dict[str, Any]:
+    """Execute a request whose quota units were reserved, releasing them if the request fails."""
     try:
-        from googleapiclient.discovery import build
-        _youtube_client = build("youtube", "v3", developerKey=settings.youtube_api_key)
-        logger.info("YouTube client initialized successfully")
-        return _youtube_client
-    except ImportError:
-        logger.error("googleapiclient.discovery not installed. Install with: pip install google-api-python-client")
-        return None
-    except Exception as e:
-        logger.error(f"Failed to initialize YouTube client: {e}", exc_info=True)
-        return None
+        return _execute(request)
+    except Exception:
+        budget_service.release(budget_service.YOUTUBE, units)
+        raise
 
 
 def search_youtube_videos(topic: str, details: str, max_results: int = 5) -> List[str]:
@@ -68,15 +143,18 @@ def search_youtube_videos(topic: str, details: str, max_results: int = 5) -> Lis
         logger.info("Get your API key from: https://console.cloud.google.com/apis/credentials")
         return []
     
+    if not budget_service.reserve(budget_service.YOUTUBE, budget_service.YOUTUBE_SEARCH_UNITS):
+        return []
+    
     try:
         # Search for videos
-        search_response = youtube.search().list(
+        search_response = _execute_reserved(youtube.search().list(
             q=query,
             part="snippet",
             type="video",
             order="viewCount",  # Order by view count (viral/popular videos)
             maxResults=max_results
-        ).execute()
+        ), budget_service.YOUTUBE_SEARCH_UNITS)
         
         video_urls = []
         for item in search_response.get("items", []):
@@ -104,9 +182,105 @@ def _get_last_month_timestamp() -> str:
     return one_month_ago.strftime("%Y-%m-%dT%H:%M:%SZ")
 
 
+def get_video_statistics(video_ids: List[str]) -> List[Dict[str, Any]]:
+    """
+    Fetch title, publish time and statistics for videos in one batched videos().list call.
+    
+    Args:
+        video_ids: Video IDs (at most 50)
+    
+    Returns:
+        List of dicts with id, title, published_at, views, likes and comments
+        (hidden counts are 0), in the order returned by the API
+    """
+    youtube = get_youtube_client()
+    if not youtube or not video_ids:
+        return []
+    
+    response = _execute(youtube.videos().list(
+        part="snippet,statistics",
+        id=",".join(video_ids[:MAX_VIDEOS_PER_LIST]),
+        fields=_VIDEO_FIELDS,
+        maxResults=MAX_VIDEOS_PER_LIST,
+    ))
+    budget_service.record(budget_service.YOUTUBE, budget_service.YOUTUBE_LIST_UNITS)
+    
+    videos = []
+    for item in response.get("items", []):
+        snippet = item.get("snippet", {})
+        statistics = item.get("statistics", {})
+        videos.append({
+            "id": item["id"],
+            "title": snippet.get("title", ""),
+            "published_at": snippet.get("publishedAt", ""),
+            "views": int(statistics.get("viewCount", 0)),
+            "likes": int(statistics.get("likeCount", 0)),
+            "comments": int(statistics.get("commentCount", 0)),
+        })
+    return videos
+
+
+def _hours_since(published_at: List[str], now: datetime) -> np.ndarray:
+    """Hours since each RFC 3339 publish time (unparseable times count as 30 days)."""
+    hours = []
+    for value in published_at:
+        try:
+            published = datetime.strptime(value[:19], "%Y-%m-%dT%H:%M:%S")
+            hours.append((now - published).total_seconds() / 3600)
+        except (TypeError, ValueError):
+            hours.append(30 * 24.0)
+    return np.asarray(hours, dtype=np.float64)
+
+
+def engagement_velocity(videos: List[Dict[str, Any]], now: Optional[datetime] = None) -> np.ndarray:
+    """
+    Score videos by weighted engagement (views, likes, comments) per hour since publish.
+    
+    Args:
+        videos: Video dicts as returned by get_video_statistics
+        now: Reference time (defaults to the current UTC time)
+    
+    Returns:
+        Array of scores, one per video (higher is more viral)
+    """
+    if not videos:
+        return np.zeros(0, dtype=np.float64)
+    
+    counts = np.array([[v["views"], v["likes"], v["comments"]] for v in videos], dtype=np.float64)
+    engagement = counts @ np.array([1.0, LIKE_WEIGHT, COMMENT_WEIGHT])
+    hours = np.maximum(_hours_since([v["published_at"] for v in videos], now or datetime.utcnow()), MIN_AGE_HOURS)
+    return engagement / hours
+
+
+def rank_by_engagement_velocity(video_ids: List[str]) -> List[str]:
+    """
+    Rank candidate videos by engagement velocity using one batched statistics call.
+    
+    Args:
+        video_ids: Candidate video IDs
+    
+    Returns:
+        Video IDs, best first (the input order if statistics are unavailable)
+    """
+    try:
+        videos = get_video_statistics(video_ids)
+    except Exception as e:
+        logger.error(f"Error fetching YouTube statistics, keeping search order: {e}", exc_info=True)
+        return video_ids
+    if not videos:
+        return video_ids
+    
+    scores = engagement_velocity(videos)
+    order = np.argsort(-scores, kind="stable")
+    for i in order:
+        logger.debug(f"Ranked video: {videos[i]['title']} ({videos[i]['id']}) - {scores[i]:.1f} engagement/hour")
+    return [videos[i]["id"] for i in order]
+
+
 def get_viral_urls_from_last_month(topic: str, details: str, limit: int = 2) -> List[str]:
     """
     Get viral YouTube URLs from the last month.
+    Search candidates are re-ranked by engagement velocity (see rank_by_engagement_velocity).
     
     Args:
         topic: General topic category
@@ -123,6 +297,10 @@ def get_viral_urls_from_last_month(topic: str, details: str, limit: int = 2) ->
         logger.warning("YouTube client not available")
         return []
     
+    # Search costs 100 quota units; skip YouTube when today's quota is spent
+    if not budget_service.reserve(budget_service.YOUTUBE, budget_service.YOUTUBE_SEARCH_UNITS):
+        return []
+    
     try:
         # Combine topic and details for search query
         query = f"{topic} {details}".strip() if details else topic
@@ -130,36 +308,154 @@ def get_viral_urls_from_last_month(topic: str, details: str, limit: int = 2) ->
         # Get timestamp for last month
         published_after = _get_last_month_timestamp()
         
-        # Search for videos from last month, ordered by view count (viral)
-        search_response = youtube.search().list(
+        ranking_enabled = settings.youtube_engagement_ranking_enabled
+        candidates = min(max(settings.youtube_ranking_candidates, limit), MAX_VIDEOS_PER_LIST) if ranking_enabled else limit * 3
+        
+        # Search for videos from last month, ordered by view count (viral); only the IDs are returned
+        search_response = _execute_reserved(youtube.search().list(
             q=query,
-            part="snippet",
+            part="id",
+            fields=_SEARCH_FIELDS,
             type="video",
             order="viewCount",  # Order by view count (viral/popular)
             publishedAfter=published_after,  # Filter by date
-            maxResults=limit * 3,  # Get more to filter for best ones
+            maxResults=candidates,  # Get more to filter for best ones
             videoDefinition="high",  # Prefer high quality videos
             videoDuration="medium",  # Medium length videos tend to be more viral
-        ).execute()
+        ), budget_service.YOUTUBE_SEARCH_UNITS)
         
-        video_urls = []
+        video_ids = []
         for item in search_response.get("items", []):
             video_id = item["id"]["videoId"]
-            video_url = f"https://www.youtube.com/watch?v={video_id}"
-            video_urls.append(video_url)
-            logger.debug(f"Found video: {item['snippet']['title']} - {video_url}")
-            
-            if len(video_urls) >= limit:
-                break
+            if video_id not in video_ids:
+                video_ids.append(video_id)
+        
+        if ranking_enabled and len(video_ids) > limit:
+            video_ids = rank_by_engagement_velocity(video_ids)
+        
+        video_urls = [f"https://www.youtube.com/watch?v={video_id}" for video_id in video_ids[:limit]]
         
         logger.info(f"Found {len(video_urls)} YouTube URLs from last month")
-        return video_urls[:limit]
+        return video_urls
         
     except Exception as e:
         logger.error(f"Error searching YouTube: {e}", exc_info=True)
         return []
 
 
+def extract_video_id(video_url: str) -> Optional[str]:
+    """
+    Get the video ID from a YouTube watch, short or embed URL.
+    
+    Args:
+        video_url: YouTube video URL
+    
+    Returns:
+        Video ID or None if the URL is not a YouTube video URL
+    """
+    if "youtube.com" not in video_url and "youtu.be" not in video_url:
+        return None
+    match = _VIDEO_ID_PATTERN.search(video_url)
+    return match.group(1) if match else None
+
+
+def _get_transcript_client() -> httpx.Client:
+    """
+    Get the HTTP client for caption downloads (the shared transport's pooled client).
+    
+    Returns:
+        httpx.Client instance
+    """
+    return http_transport_service.get_client()
+
+
+def parse_caption_payload(payload: str) -> str:
+    """
+    Turn a timedtext caption payload (json3 or XML) into plain, timestamp-free text.
+    
+    Args:
+        payload: Response body of the timedtext endpoint
+    
+    Returns:
+        Normalized transcript text (empty if the payload has no captions)
+    """
+    payload = (payload or "").strip()
+    if not payload:
+        return ""
+    
+    if payload.startswith("{"):
+        events = json.loads(payload).get("events", [])
+        lines = ["".join(seg.get("utf8", "") for seg in event.get("segs", [])) for event in events]
+    else:
+        lines = [element.text or "" for element in ET.fromstring(payload).iter() if element.tag in ("text", "p")]
+    
+    words = []
+    previous = None
+    for line in lines:
+        line = _CAPTION_CUE_PATTERN.sub(" ", html.unescape(line))
+        line = " ".join(line.split())
+        # Auto-generated captions repeat the rolling line; keep it once
+        if line and line != previous:
+            words.append(line)
+        previous = line or previous
+    return " ".join(words)
+
+
+def _download_transcript(video_id: str) -> Optional[str]:
+    """Download and normalize the captions of one video from the timedtext endpoint."""
+    try:
+        def download() -> httpx.Response:
+            response = _get_transcript_client().get(
+                settings.youtube_timedtext_base_url,
+                params={"v": video_id, "lang": settings.youtube_transcript_language, "fmt": "json3"},
+                timeout=httpx.Timeout(settings.youtube_http_timeout_seconds, connect=settings.http_connect_timeout_seconds)
+            )
+            response.raise_for_status()
+            return response
+        
+        response = get_breaker("youtube_transcripts").call(download)
+        return parse_caption_payload(response.text) or None
+    except Exception as e:
+        logger.warning(f"Could not fetch transcript for video {video_id}: {e}")
+        return None
+
+
+def fetch_transcripts(video_urls: List[str]) -> Dict[str, str]:
+    """
+    Fetch transcripts for several videos: cached ones from MongoDB, the rest downloaded
+    concurrently (at most YOUTUBE_TRANSCRIPT_CONCURRENCY at a time) and cached by video ID.
+    
+    Args:
+        video_urls: YouTube video URLs
+    
+    Returns:
+        Dict mapping video URL to transcript text (videos without captions are left out)
+    """
+    video_ids = {url: extract_video_id(url) for url in video_urls}
+    video_ids = {url: video_id for url, video_id in video_ids.items() if video_id}
+    if not video_ids:
+        return {}
+    
+    try:
+        cached = find_cached_transcripts(list(set(video_ids.values())))
+    except Exception as e:
+        logger.warning(f"Transcript cache lookup failed: {e}")
+        cached = {}
+    missing = sorted(set(video_ids.values()) - set(cached))
+    
+    downloaded = {}
+    if missing:
+        with ThreadPoolExecutor(max_workers=min(len(missing), settings.youtube_transcript_concurrency)) as executor:
+            downloaded = dict(zip(missing, executor.map(_download_transcript, missing)))
+        for video_id, text in downloaded.items():
+            if text:
+                save_transcript(video_id, text)
+    
+    logger.info(f"Transcripts: {len(cached)} cached, {sum(1 for t in downloaded.values() if t)}/{len(missing)} downloaded")
+    texts = {**cached, **downloaded}
+    return {url: texts[video_id] for url, video_id in video_ids.items() if texts.get(video_id)}
+
+
 def fetch_transcript(video_url: str) -> Optional[str]:
     """
     Fetch transcript for a YouTube video.
@@ -170,9 +466,5 @@ def fetch_transcript(video_url: str) -> Optional[str]:
     Returns:
         Transcript text or None if unavailable
     """
-    # TODO: Implement transcript fetching using youtube-transcript-api or similar
     logger.info(f"Fetching transcript for video: {video_url}")
-    
-    logger.warning("Transcript fetching not fully implemented - returning None")
-    return None
-
+    return fetch_transcripts([video_url]).get(video_url)
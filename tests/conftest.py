@@ -28,3 +28,11 @@ def pytest_configure(config):
         "ignore::pydantic.warnings.PydanticDeprecatedSince20"
     )
 
+
+@pytest.fixture(autouse=True)
+def reset_circuit_breakers():
+    """Start each test with closed circuit breakers, so failures simulated by one test cannot open them for the next."""
+    yield
+    module = sys.modules.get("src.services.circuit_breaker_service")
+    if module is not None:
+        module.reset_breakers()
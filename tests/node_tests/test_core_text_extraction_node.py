@@ -37,12 +37,19 @@ def sample_state():
     }
 
 
+_NODE = "src.graph.nodes.core_text_extraction_node"
+
+
 def test_core_text_extraction_node_success(sample_state):
     """Test successful core text extraction."""
-    mock_extracted_text = "Extracted core text about AI and machine learning from URLs"
+    mock_extracted_texts = {
+        "https://example.com/article1": "Extracted core text about AI",
+        "https://example.com/article2": "Extracted core text about machine learning",
+    }
     
-    with patch("src.graph.nodes.core_text_extraction_node.extract_core_text_from_urls") as mock_extract:
-        mock_extract.return_value = mock_extracted_text
+    with patch(f"{_NODE}.extract_core_texts_with_failures") as mock_extract, \
+         patch(f"{_NODE}.find_stored_core_texts", return_value={}):
+        mock_extract.return_value = (mock_extracted_texts, {})
         
         result = core_text_extraction_node(sample_state)
         
@@ -53,10 +60,11 @@ def test_core_text_extraction_node_success(sample_state):
             sample_state["details"]
         )
         
-        # Verify output
+        # Verify output: one text per URL, in URL order
         assert "core_texts" in result
-        assert len(result["core_texts"]) == 1
-        assert result["core_texts"][0] == mock_extracted_text
+        assert result["core_texts"] == list(mock_extracted_texts.values())
+        assert result["core_text_urls"] == sample_state["urls"]
+        assert result["stored_text_urls"] == []
         assert result["urls"] == sample_state["urls"]
         assert result["topic"] == sample_state["topic"]
         assert result["details"] == sample_state["details"]
@@ -70,10 +78,10 @@ def test_core_text_extraction_node_no_urls():
         "details": "AI",
     }
     
-    with patch("src.graph.nodes.core_text_extraction_node.extract_core_text_from_urls") as mock_extract:
+    with patch(f"{_NODE}.extract_core_texts_with_failures") as mock_extract:
         result = core_text_extraction_node(state)
         
-        # Should not call extract_core_text_from_urls
+        # Should not call extract_core_texts_with_failures
         mock_extract.assert_not_called()
         
         assert result["core_texts"] == []
@@ -87,8 +95,9 @@ def test_core_text_extraction_node_empty_topic_details():
         "details": "",
     }
     
-    with patch("src.graph.nodes.core_text_extraction_node.extract_core_text_from_urls") as mock_extract:
-        mock_extract.return_value = "Extracted text"
+    with patch(f"{_NODE}.extract_core_texts_with_failures") as mock_extract, \
+         patch(f"{_NODE}.find_stored_core_texts", return_value={}):
+        mock_extract.return_value = ({"https://example.com/article": "Extracted text"}, {})
         
         result = core_text_extraction_node(state)
         
@@ -97,3 +106,102 @@ def test_core_text_extraction_node_empty_topic_details():
         # Verify extract was called with empty strings for topic/details
         mock_extract.assert_called_once_with(["https://example.com/article"], "", "")
 
+
+def test_core_text_extraction_node_extracts_only_new_urls(sample_state):
+    """Test that URLs with stored text are reused and only new URLs are extracted."""
+    stored = {"https://example.com/article1": "Stored text"}
+    
+    with patch(f"{_NODE}.extract_core_texts_with_failures") as mock_extract, \
+         patch(f"{_NODE}.find_stored_core_texts", return_value=stored):
+        mock_extract.return_value = ({"https://example.com/article2": "New text"}, {})
+        
+        result = core_text_extraction_node(sample_state)
+        
+        mock_extract.assert_called_once_with(["https://example.com/article2"], "tech", "AI and machine learning")
+        assert result["core_texts"] == ["Stored text", "New text"]
+        assert result["core_text_urls"] == sample_state["urls"]
+        assert result["stored_text_urls"] == ["https://example.com/article1"]
+
+
+def test_core_text_extraction_node_all_urls_stored(sample_state):
+    """Test that nothing is extracted when every URL already has stored text."""
+    stored = {url: f"Stored {url}" for url in sample_state["urls"]}
+    
+    with patch(f"{_NODE}.extract_core_texts_with_failures") as mock_extract, \
+         patch(f"{_NODE}.find_stored_core_texts", return_value=stored):
+        result = core_text_extraction_node(sample_state)
+        
+        mock_extract.assert_not_called()
+        assert len(result["core_texts"]) == 2
+
+
+def test_core_text_extraction_node_uses_prefetched_texts(sample_state):
+    """Test that speculatively prefetched core texts are used without extracting again."""
+    state = {
+        **sample_state,
+        "prefetched_core_texts": ["Prefetched text"],
+        "prefetched_core_text_urls": ["https://example.com/article1"],
+        "prefetched_stored_text_urls": ["https://example.com/article1"],
+        "prefetched_failed_results": [["https://example.com/article2", "timeout"]],
+    }
+    
+    with patch(f"{_NODE}.extract_core_texts_with_failures") as mock_extract:
+        result = core_text_extraction_node(state)
+        
+        mock_extract.assert_not_called()
+        assert result["core_texts"] == ["Prefetched text"]
+        assert result["core_text_urls"] == ["https://example.com/article1"]
+        assert result["stored_text_urls"] == ["https://example.com/article1"]
+        assert result["failed_results"] == [["https://example.com/article2", "timeout"]]
+        assert result["prefetched_core_texts"] is None
+
+
+def test_core_text_extraction_node_uses_search_texts(sample_state):
+    """Test that URLs with text from their search result (fast mode) are not extracted."""
+    state = {**sample_state, "search_texts": [["https://example.com/article1", "Search result text"]]}
+    
+    with patch(f"{_NODE}.extract_core_texts_with_failures") as mock_extract, \
+         patch(f"{_NODE}.find_stored_core_texts", return_value={}):
+        mock_extract.return_value = ({"https://example.com/article2": "Extracted text"}, {})
+        
+        result = core_text_extraction_node(state)
+        
+        mock_extract.assert_called_once_with(["https://example.com/article2"], "tech", "AI and machine learning")
+        assert result["core_texts"] == ["Search result text", "Extracted text"]
+        assert result["stored_text_urls"] == []
+
+
+def test_core_text_extraction_node_uses_transcripts(sample_state):
+    """Test that YouTube URLs with a transcript use it instead of page extraction."""
+    video_url = "https://www.youtube.com/watch?v=abcdefghijk"
+    state = {
+        **sample_state,
+        "urls": sample_state["urls"] + [video_url],
+        "video_urls": [video_url],
+        "transcripts": ["Video transcript text"],
+    }
+    
+    with patch(f"{_NODE}.extract_core_texts_with_failures") as mock_extract, \
+         patch(f"{_NODE}.find_stored_core_texts", return_value={}):
+        mock_extract.return_value = ({url: f"Text of {url}" for url in sample_state["urls"]}, {})
+        
+        result = core_text_extraction_node(state)
+        
+        mock_extract.assert_called_once_with(sample_state["urls"], "tech", "AI and machine learning")
+        assert result["core_text_urls"] == state["urls"]
+        assert result["core_texts"][-1] == "Video transcript text"
+
+
+def test_core_text_extraction_node_reports_failed_urls(sample_state):
+    """Test that URLs that fail to extract are reported and the rest are kept."""
+    with patch(f"{_NODE}.extract_core_texts_with_failures") as mock_extract, \
+         patch(f"{_NODE}.find_stored_core_texts", return_value={}):
+        mock_extract.return_value = (
+            {"https://example.com/article1": "Extracted text"},
+            {"https://example.com/article2": "timeout"}
+        )
+        
+        result = core_text_extraction_node(sample_state)
+        
+        assert result["core_texts"] == ["Extracted text"]
+        assert result["failed_results"] == [["https://example.com/article2", "timeout"]]
@@ -0,0 +1,130 @@
+"""
+Tests for the async MongoDB data access layer.
+Uses an in-memory fake collection instead of a running MongoDB.
+"""
+
+import sys
+import asyncio
+from datetime import datetime, timedelta
+from unittest.mock import patch, MagicMock
+
+# Mock modules to avoid circular imports before importing anything
+sys.modules['src.graph'] = MagicMock()
+sys.modules['src.graph.graph'] = MagicMock()
+sys.modules['src.graph.nodes'] = MagicMock()
+sys.modules['src.config.setup_server'] = MagicMock()
+sys.modules['src.api'] = MagicMock()
+sys.modules['src.api.routes'] = MagicMock()
+
+# Now import the async Mongo service
+import src.services.async_mongo_service as async_mongo_service
+
+
+class FakeAsyncCursor:
+    """In-memory stand-in for pymongo's AsyncCursor."""
+
+    def __init__(self, documents: list):
+        self._documents = documents
+
+    def sort(self, key: str, direction: int):
+        self._documents = sorted(self._documents, key=lambda doc: doc[key], reverse=direction < 0)
+        return self
+
+    async def to_list(self, length=None):
+        return list(self._documents if length is None else self._documents[:length])
+
+
+class FakeAsyncCollection:
+    """In-memory stand-in for pymongo's AsyncCollection (supports the queries used by the service)."""
+
+    def __init__(self):
+        self.documents = []
+
+    async def insert_one(self, document: dict):
+        self.documents.append(dict(document))
+
+    def find(self, query: dict):
+        def matches(doc):
+            for key, condition in query.items():
+                if isinstance(condition, dict):
+                    if "$gte" in condition and not doc.get(key) >= condition["$gte"]:
+                        return False
+                elif doc.get(key) != condition:
+                    return False
+            return True
+        return FakeAsyncCursor([doc for doc in self.documents if matches(doc)])
+
+
+class TestAsyncRelevanceData:
+    """Tests for async save_relevance_data and find_recent_topic_documents."""
+
+    def test_save_and_find_recent(self):
+        """Test that saved documents are found by topic, newest first, within the lookback window."""
+        fake_collection = FakeAsyncCollection()
+        now = datetime.utcnow()
+
+        async def scenario():
+            await async_mongo_service.save_relevance_data("tech", "AI", "https://a.com", "old text", now - timedelta(days=100))
+            await async_mongo_service.save_relevance_data("tech", "AI", "https://b.com", "text b", now - timedelta(days=2))
+            await async_mongo_service.save_relevance_data("tech", "AI", "https://c.com", "text c", now - timedelta(days=1))
+            await async_mongo_service.save_relevance_data("sports", "football", "https://d.com", "text d", now)
+            return await async_mongo_service.find_recent_topic_documents("tech", now - timedelta(days=90))
+
+        with patch.object(async_mongo_service, "get_collection", return_value=fake_collection):
+            docs = asyncio.run(scenario())
+
+        assert [doc["url"] for doc in docs] == ["https://c.com", "https://b.com"]
+        assert docs[0]["core_text"] == "text c"
+        assert "timestamp" in docs[0]
+
+    def test_no_collection(self):
+        """Test that a missing collection is handled without raising."""
+        with patch.object(async_mongo_service, "get_collection", return_value=None):
+            asyncio.run(async_mongo_service.save_relevance_data("tech", "AI", "https://a.com", "text"))
+            docs = asyncio.run(async_mongo_service.find_recent_topic_documents("tech", datetime.utcnow()))
+
+        assert docs == []
+
+
+    def test_relevance_score_saved(self):
+        """Test that the async save stores the relevance score like the sync one."""
+        fake_collection = FakeAsyncCollection()
+        now = datetime.utcnow()
+
+        async def scenario():
+            await async_mongo_service.save_relevance_data("tech", "AI", "https://a.com", "text", now, relevance_score=0.8)
+            return await async_mongo_service.find_recent_topic_documents("tech", now - timedelta(days=1))
+
+        with patch.object(async_mongo_service, "get_collection", return_value=fake_collection):
+            docs = asyncio.run(scenario())
+
+        assert docs[0]["relevance_score"] == 0.8
+
+
+class TestGetAsyncCollection:
+    """Tests for async get_collection."""
+
+    def test_no_mongodb_uri(self):
+        """Test that get_collection returns None when MONGODB_URI is not set."""
+        with patch.object(async_mongo_service, "settings") as mock_settings:
+            mock_settings.mongodb_uri = ""
+            assert async_mongo_service.get_collection() is None
+
+    def test_collection_handles_cached(self):
+        """Test that the async client is created once and collection handles are cached per name."""
+        async_mongo_service._async_client = None
+
+        with patch.object(async_mongo_service, "settings") as mock_settings, \
+             patch("pymongo.AsyncMongoClient") as mock_client_class:
+            mock_settings.mongodb_uri = "mongodb://localhost:27017"
+            mock_settings.mongodb_db_name = "test_db"
+
+            collection1 = async_mongo_service.get_collection("Topic and data")
+            collection2 = async_mongo_service.get_collection("Topic and data")
+
+            assert collection1 is collection2
+            assert mock_client_class.call_count == 1
+            listener = mock_client_class.call_args.kwargs["event_listeners"][0]
+            assert listener._prefix == "mongo.async_pool"
+
+        async_mongo_service._async_client = None
@@ -0,0 +1,130 @@
+"""
+Tests for the async Reddit service (against an httpx.MockTransport stand-in).
+"""
+
+import sys
+import pytest
+import httpx
+from unittest.mock import patch, MagicMock
+
+# Mock modules to avoid circular imports before importing anything
+sys.modules['src.graph'] = MagicMock()
+sys.modules['src.graph.graph'] = MagicMock()
+sys.modules['src.graph.nodes'] = MagicMock()
+sys.modules['src.config.setup_server'] = MagicMock()
+sys.modules['src.api'] = MagicMock()
+sys.modules['src.api.routes'] = MagicMock()
+
+# Now import the async Reddit service
+import src.services.async_reddit_service as async_reddit_service
+
+LISTING = {"kind": "Listing", "data": {"children": [
+    {"kind": "t3", "data": {"title": "Post", "url": "https://example.com/a", "permalink": "/r/tech/comments/abc/post/",
+                            "score": 50, "num_comments": 12, "subreddit": "tech", "created_utc": 1700000000.0, "author": "me"}},
+]}}
+COMMENTS = [LISTING, {"kind": "Listing", "data": {"children": [
+    {"kind": "t1", "data": {"body": "Great post", "score": 30, "author": "reader", "created_utc": 1700000100.0}},
+    {"kind": "more", "data": {"count": 40}},
+    {"kind": "t1", "data": {"body": "Agreed", "score": 10, "author": None, "created_utc": 1700000200.0}},
+]}}]
+
+
+class RedditStandIn:
+    """Minimal stand-in for Reddit's token and OAuth API endpoints."""
+
+    def __init__(self, reject_first_api_call: bool = False):
+        self.requests = []
+        self.token_calls = 0
+        self.reject_first_api_call = reject_first_api_call
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        if request.url.path == "/api/v1/access_token":
+            self.token_calls += 1
+            return httpx.Response(200, json={"access_token": f"token-{self.token_calls}", "expires_in": 3600})
+        if self.reject_first_api_call:
+            self.reject_first_api_call = False
+            return httpx.Response(401)
+        if request.url.path.startswith("/comments/"):
+            return httpx.Response(200, json=COMMENTS)
+        return httpx.Response(200, json=LISTING)
+
+
+@pytest.fixture
+def stand_in():
+    """Route the service's HTTP client to a stand-in and reset its cached state."""
+    server = RedditStandIn()
+    async_reddit_service._http_client = None
+    async_reddit_service._token_lock = None
+    async_reddit_service._token.update({"value": None, "expires_at": 0.0})
+    transport = httpx.MockTransport(server)
+    with patch.object(async_reddit_service, "settings", MagicMock()) as mock_settings, \
+         patch.object(async_reddit_service.http_transport_service, "create_async_client",
+                      side_effect=lambda **kwargs: httpx.AsyncClient(transport=transport, **kwargs)):
+        mock_settings.reddit_client_mode = "async"
+        mock_settings.reddit_client_id = "id"
+        mock_settings.reddit_client_secret = "secret"
+        mock_settings.reddit_user_agent = "test-agent"
+        mock_settings.reddit_auth_url = "https://reddit.test/api/v1/access_token"
+        mock_settings.reddit_api_base_url = "https://oauth.reddit.test"
+        mock_settings.reddit_http_max_connections = 4
+        mock_settings.reddit_http_timeout_seconds = 5
+        mock_settings.http_connect_timeout_seconds = 5
+        mock_settings.http_keepalive_expiry_seconds = 5
+        yield server
+    async_reddit_service.close_client()
+    async_reddit_service._http_client = None
+
+
+def test_token_is_cached_across_requests(stand_in):
+    """Test that one OAuth token serves several requests and is sent as a bearer token."""
+    run = async_reddit_service.run_reddit_coroutine
+    posts = run(async_reddit_service.search_reddit_posts("tech AI", limit=5))
+    run(async_reddit_service.get_subreddit_posts("technology", limit=5))
+
+    assert [p.url for p in posts] == ["https://example.com/a"]
+    assert stand_in.token_calls == 1
+    api_requests = [r for r in stand_in.requests if r.url.host == "oauth.reddit.test"]
+    assert [r.url.path for r in api_requests] == ["/r/all/search", "/r/technology/hot"]
+    assert all(r.headers["Authorization"] == "bearer token-1" for r in api_requests)
+    assert api_requests[0].url.params["t"] == "month"
+
+
+def test_rejected_token_is_refreshed_once(stand_in):
+    """Test that a 401 refreshes the token and retries the request."""
+    stand_in.reject_first_api_call = True
+
+    posts = async_reddit_service.run_reddit_coroutine(async_reddit_service.search_reddit_posts("tech"))
+
+    assert len(posts) == 1
+    assert stand_in.token_calls == 2
+
+
+def test_post_comments_skip_more_placeholders(stand_in):
+    """Test that top-level comments are parsed and "more" placeholders are skipped."""
+    comments = async_reddit_service.run_reddit_coroutine(
+        async_reddit_service.get_post_comments("https://www.reddit.com/r/tech/comments/abc/post/", limit=5)
+    )
+
+    assert [c["body"] for c in comments] == ["Great post", "Agreed"]
+    assert comments[1]["author"] == "[deleted]"
+    assert stand_in.requests[-1].url.path == "/comments/abc"
+
+
+def test_timed_out_coroutine_is_cancelled(stand_in):
+    """Test that a coroutine exceeding its timeout is cancelled instead of left running on the loop."""
+    import asyncio
+    cancelled = []
+
+    async def slow():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    with pytest.raises(TimeoutError):
+        async_reddit_service.run_reddit_coroutine(slow(), timeout=0.05)
+    async_reddit_service.run_reddit_coroutine(asyncio.sleep(0.05), timeout=5)
+
+    assert cancelled == [True]
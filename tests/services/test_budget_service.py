@@ -0,0 +1,154 @@
+"""
+Tests for the API budget ledger.
+"""
+
+import sys
+import pytest
+from unittest.mock import patch, MagicMock
+
+# Mock modules to avoid circular imports before importing anything
+sys.modules['src.graph'] = MagicMock()
+sys.modules['src.graph.graph'] = MagicMock()
+sys.modules['src.graph.nodes'] = MagicMock()
+sys.modules['src.config.setup_server'] = MagicMock()
+sys.modules['src.api'] = MagicMock()
+sys.modules['src.api.routes'] = MagicMock()
+
+# Now import the budget service
+import src.services.budget_service as budget_service
+import src.services.tavily_service as tavily_service
+
+
+@pytest.fixture
+def budget():
+    """Small budgets with a clean in-memory ledger."""
+    budget_service.reset_budget()
+    # No MongoDB: the in-memory fallback ledger is used
+    with patch.object(budget_service, "settings") as mock_settings, \
+         patch("src.services.mongo_service.get_collection", return_value=None):
+        mock_settings.budget_enabled = True
+        mock_settings.budget_soft_limit_ratio = 0.8
+        mock_settings.budget_youtube_daily_units = 300
+        mock_settings.budget_tavily_daily_credits = 10
+        mock_settings.budget_openai_daily_tokens = 1000
+        yield mock_settings
+    budget_service.reset_budget()
+
+
+def test_levels_follow_soft_and_hard_limits(budget):
+    """Test that spending moves a source from ok to soft to hard, independently of other sources."""
+    assert budget_service.get_level(budget_service.TAVILY) == budget_service.OK
+
+    budget_service.record(budget_service.TAVILY, 7)
+    assert budget_service.get_level(budget_service.TAVILY) == budget_service.OK
+    assert not budget_service.reserve(budget_service.TAVILY, 4)
+    assert budget_service.reserve(budget_service.TAVILY, 1)
+    assert budget_service.get_level(budget_service.TAVILY) == budget_service.SOFT
+
+    assert budget_service.reserve(budget_service.TAVILY, 2)
+    assert budget_service.get_level(budget_service.TAVILY) == budget_service.HARD
+    assert budget_service.get_level(budget_service.OPENAI) == budget_service.OK
+
+
+def test_youtube_search_is_denied_when_it_does_not_fit(budget):
+    """Test that a 100-unit search is skipped once less than 100 units remain."""
+    budget_service.record(budget_service.YOUTUBE, 250)
+
+    assert not budget_service.reserve(budget_service.YOUTUBE, budget_service.YOUTUBE_SEARCH_UNITS)
+
+
+def test_budget_resets_on_a_new_day(budget):
+    """Test that usage from a previous day does not count."""
+    budget_service.record(budget_service.OPENAI, 1000)
+    budget_service._state["day"] = "2000-01-01"
+
+    assert budget_service.get_level(budget_service.OPENAI) == budget_service.OK
+
+
+def test_disabled_budget_allows_everything(budget):
+    """Test that BUDGET_ENABLED=false turns off downgrades."""
+    budget.budget_enabled = False
+    budget_service.record(budget_service.OPENAI, 5000)
+
+    assert budget_service.reserve(budget_service.OPENAI, 100)
+    assert budget_service.get_level(budget_service.OPENAI) == budget_service.OK
+    assert budget_service.get_budget_status()["sources"]["openai"]["spent"] == 0
+
+
+def test_status_reports_remaining_budget(budget):
+    """Test the status returned by the /budget endpoint."""
+    budget_service.record(budget_service.YOUTUBE, 101)
+
+    status = budget_service.get_budget_status()
+
+    assert status["enabled"] is True
+    youtube = status["sources"]["youtube"]
+    assert youtube["unit"] == "quota_units"
+    assert youtube["spent"] == 101
+    assert youtube["remaining"] == 199
+    assert youtube["soft_limit"] == 240
+    assert youtube["level"] == budget_service.OK
+    assert set(status["sources"]) == {"youtube", "tavily", "openai"}
+
+
+def test_tavily_downgrades_to_basic_then_skips(budget):
+    """Test that Tavily searches drop to basic depth past the soft limit and stop at the hard limit."""
+    client = MagicMock()
+    client.search.return_value = {"results": [{"url": "https://example.com"}]}
+
+    with patch.object(tavily_service, "_get_tavily_client", return_value=client):
+        budget_service.record(budget_service.TAVILY, 8)
+        assert tavily_service.search_tavily("query", search_depth="advanced") == [{"url": "https://example.com"}]
+        assert client.search.call_args.kwargs["search_depth"] == "basic"
+
+        # 9 of 10 credits spent: one more basic search fits, the next does not
+        assert tavily_service.search_tavily("query") == [{"url": "https://example.com"}]
+        assert tavily_service.search_tavily("query") == []
+        assert client.search.call_count == 2
+
+        urls = ["https://a.com", "https://b.com"]
+        texts, failed = tavily_service.extract_core_texts_with_failures(urls, "tech", "AI")
+        assert texts == {}
+        assert set(failed) == set(urls)
+        client.extract.assert_not_called()
+
+
+def test_failed_calls_are_not_charged(budget):
+    """Test that a Tavily search that fails (or is rejected by its breaker) does not spend credits."""
+    client = MagicMock()
+    client.search.side_effect = TimeoutError("timed out")
+
+    with patch.object(tavily_service, "_get_tavily_client", return_value=client):
+        assert tavily_service.search_tavily("query", search_depth="basic") == []
+
+    assert budget_service.get_budget_status()["sources"]["tavily"]["spent"] == 0
+
+
+def test_released_reservation_is_not_charged(budget):
+    """Test that releasing a reservation gives its cost back."""
+    assert budget_service.reserve(budget_service.YOUTUBE, budget_service.YOUTUBE_SEARCH_UNITS)
+    budget_service.release(budget_service.YOUTUBE, budget_service.YOUTUBE_SEARCH_UNITS)
+
+    assert budget_service.get_budget_status()["sources"]["youtube"]["spent"] == 0
+
+
+def test_shared_ledger_reserves_with_conditional_inc(budget):
+    """Test that with MongoDB the ledger is one (source, day) document updated with a conditional $inc."""
+    from pymongo import errors
+    import src.services.mongo_service as mongo_service
+
+    collection = MagicMock()
+    collection.find_one_and_update.side_effect = [{"spent": 9}, errors.DuplicateKeyError("E11000")]
+    collection.find_one.return_value = {"spent": 9}
+
+    with patch.object(mongo_service, "get_collection", return_value=collection):
+        assert budget_service.reserve(budget_service.TAVILY, 2)
+        assert not budget_service.reserve(budget_service.TAVILY, 2)
+
+    query, update = collection.find_one_and_update.call_args_list[0][0]
+    assert query["_id"].startswith("tavily:")
+    assert query["spent"] == {"$lte": 8}
+    assert update["$inc"] == {"spent": 2}
+    assert collection.find_one_and_update.call_args_list[0][1]["upsert"] is True
+    # Nothing was counted in the in-memory fallback
+    assert budget_service._spent == {}
@@ -0,0 +1,149 @@
+"""
+Tests for the circuit breaker service.
+"""
+
+import sys
+import asyncio
+import pytest
+from unittest.mock import patch, MagicMock
+
+# Mock modules to avoid circular imports before importing anything
+sys.modules['src.graph'] = MagicMock()
+sys.modules['src.graph.graph'] = MagicMock()
+sys.modules['src.graph.nodes'] = MagicMock()
+sys.modules['src.config.setup_server'] = MagicMock()
+sys.modules['src.api'] = MagicMock()
+sys.modules['src.api.routes'] = MagicMock()
+
+# Now import the circuit breaker service
+from src.services.circuit_breaker_service import (
+    CircuitBreaker, CircuitOpenError, get_breaker, is_outage_error, CLOSED, OPEN, HALF_OPEN
+)
+from src.services import metrics_service
+
+
+def _failing():
+    raise ConnectionError("provider down")
+
+
+@pytest.fixture
+def breaker():
+    """Breaker that opens at a 50% failure rate over at least 4 calls."""
+    return CircuitBreaker("test", failure_rate_threshold=0.5, window_size=10, min_calls=4, reset_timeout_seconds=30)
+
+
+def test_opens_at_failure_rate_and_rejects_without_calling(breaker):
+    """Test that the breaker opens once the failure rate crosses the threshold and then fails fast."""
+    breaker.call(lambda: "ok")
+    breaker.call(lambda: "ok")
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            breaker.call(_failing)
+    assert breaker.state == OPEN
+
+    fn = MagicMock()
+    with pytest.raises(CircuitOpenError):
+        breaker.call(fn)
+    fn.assert_not_called()
+    assert metrics_service.get_metrics()["gauges"]["circuit.test.state"] == OPEN
+
+
+class _HTTPError(Exception):
+    """Error raised for an HTTP response, like requests/httpx/praw errors."""
+
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}")
+        self.response = MagicMock(status_code=status_code)
+
+
+def test_client_errors_do_not_open_the_breaker(breaker):
+    """Test that 4xx and application errors pass through without counting as failures."""
+    for error in (_HTTPError(404), _HTTPError(403), ValueError("bad payload"), KeyError("data")):
+        with pytest.raises(type(error)):
+            breaker.call(lambda: (_ for _ in ()).throw(error))
+
+    assert breaker.state == CLOSED
+    assert len(breaker._outcomes) == 0
+
+
+def test_outage_errors_are_classified():
+    """Test that timeouts, connection errors, 5xx responses and wrapped transport errors count as outages."""
+    class ServerSelectionTimeoutError(Exception):
+        pass
+
+    class RequestException(Exception):
+        def __init__(self, original_exception):
+            super().__init__(str(original_exception))
+            self.original_exception = original_exception
+
+    assert is_outage_error(TimeoutError())
+    assert is_outage_error(ConnectionResetError())
+    assert is_outage_error(_HTTPError(503))
+    assert is_outage_error(ServerSelectionTimeoutError())
+    assert is_outage_error(RequestException(ConnectionError("refused")))
+    assert not is_outage_error(_HTTPError(404))
+    assert not is_outage_error(RequestException(ValueError("bad")))
+
+
+def test_stays_closed_below_minimum_calls(breaker):
+    """Test that a few early failures do not open the breaker."""
+    for _ in range(3):
+        with pytest.raises(ConnectionError):
+            breaker.call(_failing)
+
+    assert breaker.state == CLOSED
+
+
+def test_half_open_probe_closes_or_reopens(breaker):
+    """Test that after the reset timeout one probe is let through, and its outcome decides the state."""
+    with patch("src.services.circuit_breaker_service.time.monotonic", return_value=1000.0):
+        for _ in range(4):
+            with pytest.raises(ConnectionError):
+                breaker.call(_failing)
+    assert breaker.state == OPEN
+
+    with patch("src.services.circuit_breaker_service.time.monotonic", return_value=1031.0):
+        with pytest.raises(ConnectionError):
+            breaker.call(_failing)
+        assert breaker.state == OPEN
+
+    with patch("src.services.circuit_breaker_service.time.monotonic", return_value=1062.0):
+        assert breaker.call(lambda: "recovered") == "recovered"
+        assert breaker.state == CLOSED
+
+
+def test_only_one_probe_while_half_open(breaker):
+    """Test that concurrent calls are rejected while the half-open probe is in flight."""
+    for _ in range(4):
+        with pytest.raises(ConnectionError):
+            breaker.call(_failing)
+    # Opened long enough ago for the probe (asyncio itself needs the real clock)
+    breaker._opened_at -= 31
+
+    async def probe():
+        await asyncio.sleep(0.01)
+        return "ok"
+
+    async def run():
+        return await asyncio.gather(breaker.call_async(probe), breaker.call_async(probe), return_exceptions=True)
+
+    results = asyncio.run(run())
+
+    assert results[0] == "ok"
+    assert isinstance(results[1], CircuitOpenError)
+    assert breaker.state == CLOSED
+
+
+def test_service_call_fails_fast_when_open():
+    """Test that a service entry point returns its fallback without calling the client once the breaker is open."""
+    import src.services.tavily_service as tavily_service
+
+    client = MagicMock()
+    client.search.side_effect = TimeoutError("timed out")
+    with patch.object(tavily_service, "_get_tavily_client", return_value=client):
+        for _ in range(4):
+            assert tavily_service.search_tavily("query", search_depth="basic") == []
+        assert get_breaker("tavily").state == OPEN
+
+        assert tavily_service.search_tavily("query", search_depth="basic") == []
+    assert client.search.call_count == 4
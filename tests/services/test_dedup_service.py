@@ -0,0 +1,82 @@
+"""
+Tests for the near-duplicate detection service.
+"""
+
+import sys
+import numpy as np
+from unittest.mock import MagicMock
+
+# Mock modules to avoid circular imports before importing anything
+sys.modules['src.graph'] = MagicMock()
+sys.modules['src.graph.graph'] = MagicMock()
+sys.modules['src.graph.nodes'] = MagicMock()
+sys.modules['src.config.setup_server'] = MagicMock()
+sys.modules['src.api'] = MagicMock()
+sys.modules['src.api.routes'] = MagicMock()
+
+# Now import the dedup service
+from src.services.dedup_service import (
+    minhash_signature, signature_to_list, pairwise_similarities, find_near_duplicates, NUM_PERMUTATIONS
+)
+
+THRESHOLD = 0.8
+
+ARTICLE = (
+    "OpenAI released a new reasoning model on Tuesday that the company says outperforms "
+    "its previous systems on math and coding benchmarks. The model is available to paying "
+    "subscribers today and will roll out to free users over the coming weeks, according to "
+    "a blog post published alongside the announcement."
+)
+SYNDICATED = ARTICLE + " This article originally appeared on a partner site."
+UNRELATED = (
+    "The city council approved a new budget for public parks, adding funding for playground "
+    "repairs, tree planting and longer opening hours at community pools during the summer."
+)
+
+
+class TestMinhashSignature:
+    """Tests for minhash_signature function."""
+
+    def test_signature_is_stable(self):
+        """Test that signatures are identical across calls (they are persisted)."""
+        signature = minhash_signature(ARTICLE)
+
+        assert signature.shape == (NUM_PERMUTATIONS,)
+        assert np.array_equal(signature, minhash_signature(ARTICLE))
+
+    def test_similarity_estimates(self):
+        """Test that syndicated copies are similar and unrelated texts are not."""
+        matrix = np.vstack([minhash_signature(t) for t in (ARTICLE, SYNDICATED, UNRELATED)])
+        similarities = pairwise_similarities(matrix)
+
+        assert similarities[0, 1] >= THRESHOLD
+        assert similarities[0, 2] < 0.2
+
+    def test_signature_round_trips_through_list(self):
+        """Test that the stored list form is plain ints."""
+        stored = signature_to_list(minhash_signature(ARTICLE))
+
+        assert all(type(x) is int for x in stored)
+        assert np.array_equal(np.asarray(stored, dtype=np.uint64), minhash_signature(ARTICLE))
+
+
+class TestFindNearDuplicates:
+    """Tests for find_near_duplicates function."""
+
+    def test_keeps_longest_of_duplicates(self):
+        """Test that a duplicate group is collapsed to its longest text, keeping order."""
+        keep = find_near_duplicates([ARTICLE, UNRELATED, SYNDICATED], threshold=THRESHOLD)
+
+        assert keep == [1, 2]
+
+    def test_uses_stored_signatures(self):
+        """Test that persisted signatures are used instead of recomputing them."""
+        signature = signature_to_list(minhash_signature(ARTICLE))
+
+        keep = find_near_duplicates(["first text", "second text"], [signature, signature], threshold=THRESHOLD)
+
+        assert len(keep) == 1
+
+    def test_empty_texts_are_not_duplicates(self):
+        """Test that empty texts are not collapsed into each other."""
+        assert find_near_duplicates(["", "", ARTICLE], threshold=THRESHOLD) == [0, 1, 2]
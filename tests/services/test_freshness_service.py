@@ -0,0 +1,91 @@
+"""
+Tests for the stale-while-revalidate freshness policy.
+"""
+
+import sys
+import threading
+from datetime import datetime, timedelta
+from unittest.mock import patch, MagicMock
+
+# Mock modules to avoid circular imports before importing anything
+sys.modules['src.config.setup_server'] = MagicMock()
+sys.modules['src.api'] = MagicMock()
+sys.modules['src.api.routes'] = MagicMock()
+
+# Now import the freshness service
+import src.services.freshness_service as freshness_service
+from src.services.freshness_service import classify_content_age, FRESH, STALE, EXPIRED
+
+NOW = datetime(2026, 1, 31, 12, 0, 0)
+
+
+def _settings(overrides: str = ""):
+    """Build freshness settings for a test."""
+    mock_settings = MagicMock()
+    mock_settings.freshness_soft_days = 7
+    mock_settings.freshness_hard_days = 30
+    mock_settings.topic_freshness_overrides = overrides
+    return mock_settings
+
+
+class TestClassifyContentAge:
+    """Tests for classify_content_age function."""
+
+    def test_per_topic_policies(self):
+        """Test that news and cooking content of the same age are classified differently."""
+        with patch.object(freshness_service, "settings", _settings()), \
+             patch.object(freshness_service, "TOPIC_FRESHNESS_DAYS", {"news": (1, 3), "cooking": (30, 90)}):
+            five_days_old = NOW - timedelta(days=5)
+            assert classify_content_age("news", five_days_old, NOW) == EXPIRED
+            assert classify_content_age("cooking", five_days_old, NOW) == FRESH
+            assert classify_content_age("news", NOW - timedelta(days=2), NOW) == STALE
+
+    def test_default_policy(self):
+        """Test that topics without a policy use the settings defaults."""
+        with patch.object(freshness_service, "settings", _settings()), \
+             patch.object(freshness_service, "TOPIC_FRESHNESS_DAYS", {}):
+            assert classify_content_age("art", NOW - timedelta(days=3), NOW) == FRESH
+            assert classify_content_age("art", NOW - timedelta(days=10), NOW) == STALE
+            assert classify_content_age("art", NOW - timedelta(days=31), NOW) == EXPIRED
+
+    def test_overrides_and_missing_date(self):
+        """Test that JSON overrides win over the table and a missing date counts as expired."""
+        with patch.object(freshness_service, "settings", _settings('{"cooking": [1, 2]}')), \
+             patch.object(freshness_service, "TOPIC_FRESHNESS_DAYS", {"cooking": (30, 90)}):
+            assert classify_content_age("cooking", NOW - timedelta(days=5), NOW) == EXPIRED
+            assert classify_content_age("cooking", None, NOW) == EXPIRED
+
+
+    def test_overrides_parsed_once(self):
+        """Test that the overrides JSON is parsed once per settings value, not on every lookup."""
+        freshness_service._parse_overrides.cache_clear()
+        with patch.object(freshness_service, "settings", _settings('{"news": [1, 3]}')), \
+             patch.object(freshness_service.json, "loads", wraps=freshness_service.json.loads) as mock_loads:
+            for _ in range(3):
+                assert freshness_service.get_freshness_policy("news") == (1.0, 3.0)
+            freshness_service.settings.topic_freshness_overrides = '{"news": [2, 4]}'
+            assert freshness_service.get_freshness_policy("news") == (2.0, 4.0)
+
+        assert mock_loads.call_count == 2
+
+class TestScheduleBackgroundRefresh:
+    """Tests for schedule_background_refresh function."""
+
+    def test_one_refresh_per_topic(self):
+        """Test that a second refresh for the same topic/details is not queued while one runs."""
+        release = threading.Event()
+        done = threading.Event()
+
+        def slow_refresh(topic, details):
+            release.wait(timeout=5)
+            done.set()
+            return 1
+
+        with patch("src.services.prewarm_service.refresh_topic", side_effect=slow_refresh) as mock_refresh:
+            assert freshness_service.schedule_background_refresh("news", "elections")
+            assert not freshness_service.schedule_background_refresh("News", "Elections")
+            release.set()
+            done.wait(timeout=5)
+            freshness_service._get_executor().submit(lambda: None).result(timeout=5)
+
+        assert mock_refresh.call_count == 1
@@ -0,0 +1,88 @@
+"""
+Tests for the shared HTTP transport (against a local keep-alive HTTP server).
+"""
+
+import sys
+import threading
+import pytest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch, MagicMock
+
+# Mock modules to avoid circular imports before importing anything
+sys.modules['src.graph'] = MagicMock()
+sys.modules['src.graph.graph'] = MagicMock()
+sys.modules['src.graph.nodes'] = MagicMock()
+sys.modules['src.config.setup_server'] = MagicMock()
+sys.modules['src.api'] = MagicMock()
+sys.modules['src.api.routes'] = MagicMock()
+
+# Now import the transport service
+import src.services.http_transport_service as http_transport_service
+from src.services import metrics_service
+
+
+class _KeepAliveHandler(BaseHTTPRequestHandler):
+    """Answers every GET with a small body on a persistent HTTP/1.1 connection."""
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = b"ok"
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server_url():
+    """Local HTTP server; shared clients and metrics are reset around each test."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _KeepAliveHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    http_transport_service.close()
+    metrics_service.reset_metrics()
+    yield f"http://127.0.0.1:{server.server_address[1]}/"
+    http_transport_service.close()
+    server.shutdown()
+    server.server_close()
+
+
+def test_shared_client_reuses_connection_and_reports_metrics(server_url):
+    """Test that the shared httpx client keeps the connection alive and reports one handshake."""
+    client = http_transport_service.get_client()
+    assert http_transport_service.get_client() is client
+
+    for _ in range(3):
+        assert client.get(server_url).text == "ok"
+
+    metrics = metrics_service.get_metrics()
+    assert metrics["counters"]["http.connections_opened"] == 1
+    assert metrics["timings"]["http.handshake_ms"]["count"] == 1
+    assert metrics["timings"]["http.pool_wait_ms"]["count"] == 3
+
+
+def test_sessions_share_pools_but_not_headers(server_url):
+    """Test that sessions for different services reuse one pool while keeping their own headers."""
+    tavily_session = http_transport_service.create_session()
+    reddit_session = http_transport_service.create_session()
+    tavily_session.headers["Authorization"] = "Bearer tavily-key"
+
+    assert tavily_session.get(server_url).text == "ok"
+    assert reddit_session.get(server_url).text == "ok"
+
+    assert "Authorization" not in reddit_session.headers
+    metrics = metrics_service.get_metrics()
+    assert metrics["counters"]["http.connections_opened"] == 1
+    assert metrics["timings"]["http.pool_wait_ms"]["count"] == 2
+
+
+def test_http2_requires_h2(server_url):
+    """Test that HTTP/2 is only enabled when the h2 package is installed."""
+    with patch.object(http_transport_service.importlib.util, "find_spec", return_value=None):
+        assert not http_transport_service.http2_enabled()
+    with patch.object(http_transport_service, "settings") as mock_settings:
+        mock_settings.http_http2_enabled = False
+        assert not http_transport_service.http2_enabled()
@@ -112,3 +112,133 @@ class TestGetMongoCollection:
             assert collection1 is collection2
             assert mock_mongo_client.call_count == 1
 
+
+    def test_collection_handles_cached_per_name(self):
+        """Test that collection handles are cached per name and the client gets pool/timeout settings."""
+        import src.services.mongo_service
+        src.services.mongo_service._client = None
+        
+        with patch('src.services.mongo_service.settings') as mock_settings, \
+             patch('src.services.mongo_service.MongoClient') as mock_mongo_client:
+            
+            # Setup
+            mock_settings.mongodb_uri = "mongodb://localhost:27017"
+            mock_settings.mongodb_db_name = "test_db"
+            mock_settings.mongodb_max_pool_size = 20
+            mock_settings.mongodb_server_selection_timeout_ms = 3000
+            
+            mock_client_instance = MagicMock()
+            mock_db = MagicMock()
+            mock_db.__getitem__.side_effect = lambda name: MagicMock(name=name)
+            mock_client_instance.__getitem__.return_value = mock_db
+            mock_mongo_client.return_value = mock_client_instance
+            
+            # Execute
+            inputs1 = get_collection("inputs")
+            topic_data = get_collection("Topic and data")
+            inputs2 = get_collection("inputs")
+            
+            # Assert - one handle per name, created once
+            assert inputs1 is inputs2
+            assert inputs1 is not topic_data
+            assert mock_db.__getitem__.call_count == 2
+            
+            # Assert - pool size and timeouts come from settings
+            _, kwargs = mock_mongo_client.call_args
+            assert kwargs["maxPoolSize"] == 20
+            assert kwargs["serverSelectionTimeoutMS"] == 3000
+            assert len(kwargs["event_listeners"]) == 1
+
+
+class TestPoolMetricsListener:
+    """Tests for the connection pool metrics listener."""
+    
+    def test_checkout_wait_recorded(self):
+        """Test that checkout wait durations are reported as a timing metric."""
+        from src.services import metrics_service
+        from src.services.mongo_service import _PoolMetricsListener
+        metrics_service.reset_metrics()
+        
+        listener = _PoolMetricsListener()
+        listener.connection_checked_out(MagicMock(duration=0.25))
+        listener.connection_check_out_failed(MagicMock(duration=2.0))
+        
+        metrics = metrics_service.get_metrics()
+        wait = metrics["timings"]["mongo.pool.checkout_wait_ms"]
+        assert wait["count"] == 2
+        assert wait["max"] == 2000.0
+        assert metrics["counters"]["mongo.pool.checkout_failed"] == 1
+    
+    def test_checked_out_gauge(self):
+        """Test that connections in use are reported as a gauge."""
+        from src.services import metrics_service
+        from src.services.mongo_service import _PoolMetricsListener
+        metrics_service.reset_metrics()
+        
+        listener = _PoolMetricsListener()
+        listener.connection_checked_out(MagicMock(duration=0.0))
+        listener.connection_checked_out(MagicMock(duration=0.0))
+        listener.connection_checked_in(MagicMock())
+        
+        assert metrics_service.get_metrics()["gauges"]["mongo.pool.checked_out"] == 1
+
+    def test_custom_prefix(self):
+        """Test that a listener with its own prefix does not share the default pool gauges."""
+        from src.services import metrics_service
+        from src.services.mongo_service import _PoolMetricsListener
+        metrics_service.reset_metrics()
+        
+        _PoolMetricsListener().connection_checked_out(MagicMock(duration=0.0))
+        _PoolMetricsListener("mongo.async_pool").connection_checked_out(MagicMock(duration=0.0))
+        _PoolMetricsListener("mongo.async_pool").connection_checked_out(MagicMock(duration=0.0))
+        
+        gauges = metrics_service.get_metrics()["gauges"]
+        assert gauges["mongo.pool.checked_out"] == 1
+        assert gauges["mongo.async_pool.checked_out"] == 1
+
+
+class TestDetailsLookups:
+    """Tests for the details similarity lookups."""
+    
+    def test_details_scoped_to_topic(self):
+        """Test that both details lookups only match documents of the requested topic."""
+        from datetime import datetime
+        from src.services import mongo_service
+        since = datetime(2024, 1, 1)
+        collection = MagicMock()
+        collection.aggregate.return_value = []
+        collection.find.return_value.sort.return_value = []
+        
+        with patch('src.services.mongo_service.get_collection', return_value=collection):
+            mongo_service.find_recent_details("AI", since)
+            mongo_service.find_recent_documents_by_details("AI", ["agents"], since)
+        
+        pipeline = collection.aggregate.call_args[0][0]
+        assert pipeline[0]["$match"]["topic"] == "AI"
+        assert collection.find.call_args[0][0]["topic"] == "AI"
+    
+    def test_lookups_degrade_when_mongo_is_down(self):
+        """Test that lookups return empty results instead of raising, also once the breaker is open."""
+        from datetime import datetime
+        from pymongo.errors import ServerSelectionTimeoutError
+        from src.services import mongo_service
+        from src.services.circuit_breaker_service import get_breaker, OPEN
+        since = datetime(2024, 1, 1)
+        collection = MagicMock()
+        collection.find.side_effect = ServerSelectionTimeoutError("no servers")
+        collection.aggregate.side_effect = ServerSelectionTimeoutError("no servers")
+        
+        with patch('src.services.mongo_service.get_collection', return_value=collection):
+            for _ in range(get_breaker("mongo").min_calls):
+                assert mongo_service.find_recent_topic_documents("AI", since) == []
+            assert get_breaker("mongo").state == OPEN
+            calls = collection.find.call_count
+            
+            assert mongo_service.find_recent_topic_documents("AI", since) == []
+            assert mongo_service.find_stored_core_texts("AI", ["https://a.com"], since) == {}
+            assert mongo_service.find_recent_details("AI", since) == []
+            assert mongo_service.find_recent_documents_by_details("AI", ["agents"], since) == []
+            assert mongo_service.find_cached_transcripts(["abc"]) == {}
+        
+        assert collection.find.call_count == calls
+        collection.aggregate.assert_not_called()
@@ -29,8 +29,15 @@ from src.services.openai_service import (
     _get_openai_structured_client,
     extract_topic_and_details,
     rate_relevance,
+    rate_relevance_batch,
+    BatchRelevanceScores,
+    SourceRelevance,
     generate_linkedin_content,
-    generate_video_script
+    generate_video_script,
+    split_into_chunks,
+    map_reduce_source_content,
+    prepare_source_content,
+    MAX_SOURCE_CONTENT_LENGTH
 )
 
 
@@ -111,3 +118,108 @@ class TestGetOpenAIClient:
             assert mock_chat_openai.call_count == 1
 
 
+
+
+class TestMapReduceSourceContent:
+    """Tests for map-reduce condensing of long source content."""
+
+    def test_split_into_chunks_keeps_all_text(self):
+        """Test that chunks respect the length limit and cut at sentence boundaries."""
+        text = "This is one sentence. " * 500
+        chunks = split_into_chunks(text, 1000)
+
+        assert all(len(chunk) <= 1000 for chunk in chunks)
+        assert all(chunk.endswith(".") for chunk in chunks)
+        assert "".join(chunks).replace(" ", "") == text.replace(" ", "")
+
+    def test_chunks_are_summarized_concurrently_in_order(self):
+        """Test that chunk summaries run in parallel and are joined in chunk order."""
+        import threading
+        import time
+
+        active = {"now": 0, "max": 0}
+        lock = threading.Lock()
+
+        def fake_summarize(topic, details, chunk, max_words):
+            with lock:
+                active["now"] += 1
+                active["max"] = max(active["max"], active["now"])
+            time.sleep(0.05)
+            with lock:
+                active["now"] -= 1
+            return f"summary of chunk starting {chunk[:6]}"
+
+        text = "".join(f"P{i:04d} " + "word " * 400 + ".\n" for i in range(4))
+        with patch('src.services.openai_service.settings') as mock_settings, \
+             patch('src.services.openai_service.summarize_chunk', side_effect=fake_summarize):
+            mock_settings.map_reduce_chunk_chars = 2100
+            mock_settings.map_reduce_max_chunks = 8
+
+            digest = map_reduce_source_content("tech", "AI", text)
+
+        assert active["max"] == 4
+        assert digest.split("\n\n") == [f"summary of chunk starting P{i:04d}" for i in range(4)]
+
+    def test_failed_chunk_falls_back_to_truncated_text(self):
+        """Test that a failed chunk summary keeps the (truncated) chunk instead of failing."""
+        with patch('src.services.openai_service.settings') as mock_settings, \
+             patch('src.services.openai_service.summarize_chunk', side_effect=ValueError("rate limited")):
+            mock_settings.map_reduce_chunk_chars = 100
+            mock_settings.map_reduce_max_chunks = 8
+
+            digest = map_reduce_source_content("tech", "AI", "Short source text.")
+
+        assert digest == "Short source text."
+
+    def test_prepare_source_content_truncates_when_disabled(self):
+        """Test that map-reduce is skipped when disabled."""
+        long_text = "x" * (MAX_SOURCE_CONTENT_LENGTH * 2)
+        with patch('src.services.openai_service.settings') as mock_settings, \
+             patch('src.services.openai_service.map_reduce_source_content') as mock_map_reduce:
+            mock_settings.map_reduce_enabled = False
+
+            result = prepare_source_content("tech", "AI", long_text)
+
+        mock_map_reduce.assert_not_called()
+        assert len(result) < len(long_text)
+
+
+class TestRateRelevanceBatch:
+    """Tests for batched relevance rating."""
+
+    def test_all_sources_rated_in_one_call(self):
+        """Test that one call scores every source and unscored sources get a neutral score."""
+        result = BatchRelevanceScores(scores=[
+            SourceRelevance(index=0, relevance_score=0.9),
+            SourceRelevance(index=2, relevance_score=0.1),
+            SourceRelevance(index=7, relevance_score=1.0),
+        ])
+        with patch('src.services.openai_service._get_openai_batch_relevance_client', return_value=MagicMock()), \
+             patch('src.services.openai_service.budget_service.get_level', return_value="ok"), \
+             patch('src.services.openai_service._invoke_limited', return_value=result) as mock_invoke:
+            scores = rate_relevance_batch("AI agents post", ["first", "second", "third"])
+
+        assert mock_invoke.call_count == 1
+        sources = mock_invoke.call_args[0][1]["sources"]
+        assert "[Source 0]\nfirst" in sources and "[Source 2]\nthird" in sources
+        assert scores == [0.9, 0.5, 0.1]
+
+    def test_neutral_scores_when_openai_unavailable(self):
+        """Test that a missing client, an open circuit or an OpenAI error keep every source with a neutral score."""
+        from src.services.circuit_breaker_service import CircuitOpenError
+
+        with patch('src.services.openai_service._get_openai_batch_relevance_client', return_value=None), \
+             patch('src.services.openai_service.budget_service.get_level', return_value="ok"):
+            assert rate_relevance_batch("AI agents post", ["first", "second"]) == [0.5, 0.5]
+
+        for error in (CircuitOpenError("openai"), RuntimeError("rate limited")):
+            with patch('src.services.openai_service._get_openai_batch_relevance_client', return_value=MagicMock()), \
+                 patch('src.services.openai_service.budget_service.get_level', return_value="ok"), \
+                 patch('src.services.openai_service._invoke_limited', side_effect=error):
+                assert rate_relevance_batch("AI agents post", ["first", "second"]) == [0.5, 0.5]
+
+    def test_no_sources_makes_no_call(self):
+        """Test that an empty batch does not call OpenAI."""
+        with patch('src.services.openai_service._invoke_limited') as mock_invoke:
+            assert rate_relevance_batch("AI agents post", []) == []
+        mock_invoke.assert_not_called()
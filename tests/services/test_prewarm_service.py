@@ -0,0 +1,117 @@
+"""
+Tests for the background topic pre-warmer.
+"""
+
+import sys
+import time
+import asyncio
+import threading
+from datetime import datetime
+from unittest.mock import patch, MagicMock
+
+# Mock modules to avoid circular imports before importing anything
+sys.modules['src.config.setup_server'] = MagicMock()
+sys.modules['src.api'] = MagicMock()
+sys.modules['src.api.routes'] = MagicMock()
+
+# Now import the pre-warm service
+import src.services.prewarm_service as prewarm_service
+
+
+def _settings(**overrides):
+    """Build pre-warm settings for a test."""
+    mock_settings = MagicMock()
+    mock_settings.prewarm_enabled = True
+    mock_settings.prewarm_interval_seconds = 3600
+    mock_settings.prewarm_max_concurrency = 1
+    mock_settings.prewarm_max_runs_per_cycle = 10
+    mock_settings.prewarm_daily_budget = 10
+    mock_settings.prewarm_top_details = 2
+    for key, value in overrides.items():
+        setattr(mock_settings, key, value)
+    return mock_settings
+
+
+class TestRecentTraffic:
+    """Tests for request tracking."""
+
+    def test_most_requested_details(self):
+        """Test that the most requested (topic, details) pairs come first and are normalized."""
+        prewarm_service._recent_requests.clear()
+        for _ in range(3):
+            prewarm_service.record_topic_request("tech", "AI Agents")
+        prewarm_service.record_topic_request("sports", "football")
+        prewarm_service.record_topic_request("tech", "")  # no details, not tracked
+
+        assert prewarm_service.get_most_requested_details(5) == [("tech", "ai agents"), ("sports", "football")]
+
+
+class TestIsWarm:
+    """Tests for the warm check."""
+
+    def test_details_matched_case_insensitively(self):
+        """Test that lowercased tracked details match details stored as the user typed them."""
+        stored = [{"details": "AI  Agents", "topic": "tech"}]
+        with patch("src.services.mongo_service.find_recent_details", return_value=stored):
+            assert prewarm_service._is_warm("tech", "ai agents", datetime.utcnow())
+            assert not prewarm_service._is_warm("tech", "ai startups", datetime.utcnow())
+
+
+class TestRunPrewarmCycle:
+    """Tests for run_prewarm_cycle function."""
+
+    def setup_method(self):
+        prewarm_service._recent_requests.clear()
+        prewarm_service._status["budget_day"] = None
+        prewarm_service._status["runs_today"] = 0
+
+    def test_skips_warm_and_respects_cycle_budget(self):
+        """Test that warm targets are skipped and at most max_runs_per_cycle refreshes run."""
+        with patch.object(prewarm_service, "settings", _settings(prewarm_max_runs_per_cycle=2)), \
+             patch.object(prewarm_service, "PREDEFINED_TOPICS", ["tech", "sports", "food", "news"]), \
+             patch.object(prewarm_service, "_is_warm", side_effect=lambda topic, details, since: topic == "tech"), \
+             patch.object(prewarm_service, "refresh_topic", return_value=3) as mock_refresh:
+
+            results = asyncio.run(prewarm_service.run_prewarm_cycle())
+
+        statuses = {r["topic"]: r["status"] for r in results}
+        assert statuses == {"tech": "warm", "sports": "ok", "food": "ok", "news": "skipped_cycle_budget"}
+        assert mock_refresh.call_count == 2
+        assert prewarm_service.get_prewarm_status()["last_results"] == results
+
+    def test_respects_daily_budget_and_concurrency(self):
+        """Test that the daily budget caps runs and no more than max_concurrency run at once."""
+        active = {"now": 0, "max": 0}
+        lock = threading.Lock()
+
+        def slow_refresh(topic, details):
+            with lock:
+                active["now"] += 1
+                active["max"] = max(active["max"], active["now"])
+            time.sleep(0.05)
+            with lock:
+                active["now"] -= 1
+            return 1
+
+        with patch.object(prewarm_service, "settings", _settings(prewarm_max_concurrency=2, prewarm_daily_budget=3)), \
+             patch.object(prewarm_service, "PREDEFINED_TOPICS", ["tech", "sports", "food", "news", "art"]), \
+             patch.object(prewarm_service, "_is_warm", return_value=False), \
+             patch.object(prewarm_service, "refresh_topic", side_effect=slow_refresh):
+
+            results = asyncio.run(prewarm_service.run_prewarm_cycle())
+
+        assert [r["status"] for r in results].count("ok") == 3
+        assert [r["status"] for r in results].count("skipped_daily_budget") == 2
+        assert active["max"] == 2
+
+    def test_failed_refresh_reported(self):
+        """Test that a failing refresh is reported without stopping the cycle."""
+        with patch.object(prewarm_service, "settings", _settings()), \
+             patch.object(prewarm_service, "PREDEFINED_TOPICS", ["tech", "sports"]), \
+             patch.object(prewarm_service, "_is_warm", return_value=False), \
+             patch.object(prewarm_service, "refresh_topic", side_effect=[RuntimeError("tavily down"), 2]):
+
+            results = asyncio.run(prewarm_service.run_prewarm_cycle())
+
+        assert [r["status"] for r in results] == ["error", "ok"]
+        assert results[0]["error"] == "tavily down"
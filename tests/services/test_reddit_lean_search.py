@@ -0,0 +1,182 @@
+"""
+Tests for the lean Reddit listing search.
+"""
+
+import sys
+from unittest.mock import patch, MagicMock
+
+# Mock modules to avoid circular imports before importing anything
+sys.modules['src.graph'] = MagicMock()
+sys.modules['src.graph.graph'] = MagicMock()
+sys.modules['src.graph.nodes'] = MagicMock()
+sys.modules['src.config.setup_server'] = MagicMock()
+sys.modules['src.api'] = MagicMock()
+sys.modules['src.api.routes'] = MagicMock()
+
+# Now import the Reddit service
+from src.services.reddit_service import (
+    RedditPost, parse_listing, search_reddit_posts_lean, get_routed_posts, merge_by_engagement,
+    build_discussion_text, get_discussion_texts
+)
+
+LISTING = {
+    "kind": "Listing",
+    "data": {
+        "children": [
+            {"kind": "t3", "data": {
+                "title": "New model released", "url": "https://example.com/model", "permalink": "/r/tech/comments/abc/new/",
+                "score": 120, "num_comments": 45, "selftext": "", "subreddit": "tech", "created_utc": 1700000000.0,
+                "author": "writer", "preview": {"images": []}, "ups": 120,
+            }},
+            {"kind": "t3", "data": {
+                "title": "Deleted author", "url": "https://example.com/other", "permalink": "/r/tech/comments/def/x/",
+                "score": 3, "num_comments": 0, "selftext": "x" * 900, "subreddit": "tech", "created_utc": 1700000100.0,
+                "author": None,
+            }},
+            {"kind": "more", "data": {"count": 10}},
+        ]
+    }
+}
+
+
+class TestParseListing:
+    """Tests for parse_listing function."""
+
+    def test_parses_posts_into_compact_records(self):
+        """Test that listing children become RedditPost records with the search_reddit_posts fields."""
+        posts = parse_listing(LISTING)
+
+        assert len(posts) == 2
+        assert all(isinstance(p, RedditPost) for p in posts)
+        assert posts[0].to_dict() == {
+            "title": "New model released",
+            "url": "https://example.com/model",
+            "permalink": "https://www.reddit.com/r/tech/comments/abc/new/",
+            "score": 120,
+            "num_comments": 45,
+            "selftext": "",
+            "subreddit": "tech",
+            "created_utc": 1700000000.0,
+            "author": "writer",
+        }
+        assert posts[1].author == "[deleted]"
+        assert len(posts[1].selftext) == 500
+
+    def test_records_have_no_instance_dict(self):
+        """Test that records use __slots__."""
+        assert not hasattr(parse_listing(LISTING)[0], "__dict__")
+
+
+class TestSearchRedditPostsLean:
+    """Tests for search_reddit_posts_lean function."""
+
+    def test_single_request_with_server_side_time_filter(self):
+        """Test that one raw listing request is made with the time filter and limit."""
+        reddit = MagicMock()
+        reddit.request.return_value = LISTING
+
+        with patch('src.services.reddit_service.get_reddit_client', return_value=reddit):
+            posts = search_reddit_posts_lean("tech AI", limit=10, time_filter="month")
+
+        assert len(posts) == 2
+        reddit.request.assert_called_once()
+        kwargs = reddit.request.call_args.kwargs
+        assert kwargs["path"] == "/r/all/search"
+        assert kwargs["params"]["t"] == "month"
+        assert kwargs["params"]["limit"] == 10
+
+    def test_no_client(self):
+        """Test that an empty list is returned without a client."""
+        with patch('src.services.reddit_service.get_reddit_client', return_value=None):
+            assert search_reddit_posts_lean("tech") == []
+
+
+def _post(url: str, score: int, num_comments: int = 0, subreddit: str = "tech") -> RedditPost:
+    return RedditPost(title=url, url=url, permalink="", score=score, num_comments=num_comments, selftext="",
+                      subreddit=subreddit, created_utc=1700000000.0, author="a")
+
+
+class TestRoutedPosts:
+    """Tests for subreddit routing (get_routed_posts and merge_by_engagement)."""
+
+    def test_merge_ranks_by_engagement_relative_to_each_subreddit(self):
+        """Test that a small subreddit's top post outranks a large subreddit's middling post."""
+        large = [_post("https://big/top", 5000, 1000), _post("https://big/mid", 1000, 200)]
+        small = [_post("https://small/top", 80, 20, "small"), _post("https://big/top", 10, 0, "small")]
+
+        merged = merge_by_engagement([large, small, []])
+
+        assert [p.url for p in merged] == ["https://big/top", "https://small/top", "https://big/mid"]
+
+    def test_lists_each_subreddit_or_searches_within_it(self):
+        """Test that each subreddit gets its own request: a top listing, or a restricted search with a query."""
+        mock_reddit = MagicMock()
+        mock_reddit.request.return_value = LISTING
+
+        with patch("src.services.reddit_service.get_reddit_client", return_value=mock_reddit):
+            listings = get_routed_posts(["technology", "gadgets"], limit=5)
+            searched = get_routed_posts(["technology"], query="chips", limit=5)
+
+        assert [len(l) for l in listings] == [2, 2]
+        assert len(searched) == 1
+        paths = sorted(c.kwargs["path"] for c in mock_reddit.request.call_args_list)
+        assert paths == ["/r/gadgets/top", "/r/technology/search", "/r/technology/top"]
+        search_params = next(c.kwargs["params"] for c in mock_reddit.request.call_args_list if c.kwargs["path"].endswith("/search"))
+        assert search_params["restrict_sr"] == "on"
+        assert search_params["t"] == "month"
+
+
+class TestDiscussionTexts:
+    """Tests for Reddit discussion harvesting."""
+
+    def test_builds_one_compact_record_per_thread(self):
+        """Test that the record holds the title, post text and live top comments."""
+        post = _post("https://www.reddit.com/r/tech/comments/abc/x/", 100, 40)
+        post.selftext = "Which   laptop\nshould I buy?"
+        comments = [
+            {"body": "The  new one.\nDefinitely.", "score": 50},
+            {"body": "[deleted]", "score": 3},
+            {"body": "Wait a month", "score": 12},
+        ]
+
+        text = build_discussion_text(post, comments)
+
+        assert text == (
+            "r/tech: https://www.reddit.com/r/tech/comments/abc/x/\n"
+            "Which laptop should I buy?\n"
+            "Top comments:\n"
+            "- (50 points) The new one. Definitely.\n"
+            "- (12 points) Wait a month"
+        )
+
+    def test_harvests_threads_concurrently_within_the_pool_limit(self):
+        """Test that comments are fetched per permalink, with no more requests in flight than the limit."""
+        import threading
+        import time
+
+        in_flight = []
+        lock = threading.Lock()
+        active = [0]
+
+        def fake_comments(permalink, limit):
+            with lock:
+                active[0] += 1
+                in_flight.append(active[0])
+            time.sleep(0.02)
+            with lock:
+                active[0] -= 1
+            return [{"body": f"comment on {permalink}", "score": 1}]
+
+        posts = [_post(f"https://www.reddit.com/r/tech/comments/{i}/x/", 10, 10) for i in range(6)]
+        for post in posts:
+            post.permalink = post.url
+
+        with patch("src.services.reddit_service.get_post_comments", side_effect=fake_comments) as mock_comments, \
+             patch("src.services.reddit_service.settings") as mock_settings:
+            mock_settings.reddit_comment_concurrency = 2
+            discussions = get_discussion_texts(posts, comment_limit=5)
+
+        assert [url for url, _ in discussions] == [p.permalink for p in posts]
+        assert all(f"comment on {url}" in text for url, text in discussions)
+        assert mock_comments.call_count == 6
+        assert max(in_flight) <= 2
@@ -0,0 +1,77 @@
+"""
+Tests for the local details similarity service.
+"""
+
+import sys
+import numpy as np
+from unittest.mock import MagicMock
+
+# Mock modules to avoid circular imports before importing anything
+sys.modules['src.graph'] = MagicMock()
+sys.modules['src.graph.graph'] = MagicMock()
+sys.modules['src.graph.nodes'] = MagicMock()
+sys.modules['src.config.setup_server'] = MagicMock()
+sys.modules['src.api'] = MagicMock()
+sys.modules['src.api.routes'] = MagicMock()
+
+# Now import the similarity service
+from src.services.similarity_service import embed_text, cosine_similarities, find_similar_details, VECTOR_DIM
+
+THRESHOLD = 0.5
+
+
+class TestEmbedText:
+    """Tests for embed_text function."""
+
+    def test_vector_is_normalized_and_stable(self):
+        """Test that vectors are unit length and identical across calls (they are persisted)."""
+        vector1 = embed_text("AI agents for startups")
+        vector2 = embed_text("AI agents for startups")
+
+        assert vector1.shape == (VECTOR_DIM,)
+        assert np.isclose(np.linalg.norm(vector1), 1.0)
+        assert np.array_equal(vector1, vector2)
+
+    def test_empty_text(self):
+        """Test that empty text gives a zero vector."""
+        assert not embed_text("").any()
+
+    def test_reworded_details_are_similar(self):
+        """Test that rewordings score above the threshold and unrelated details below it."""
+        assert float(embed_text("AI and machine learning") @ embed_text("machine learning and AI")) >= THRESHOLD
+        assert float(embed_text("AI agents") @ embed_text("autonomous AI agents")) >= THRESHOLD
+        assert float(embed_text("quantum computing") @ embed_text("AI agents")) < THRESHOLD
+
+
+class TestCosineSimilarities:
+    """Tests for cosine_similarities function."""
+
+    def test_zero_rows(self):
+        """Test that zero rows get similarity 0 instead of NaN."""
+        matrix = np.vstack([embed_text("quantum computing"), np.zeros(VECTOR_DIM, dtype=np.float32)])
+        scores = cosine_similarities(embed_text("quantum computing"), matrix)
+
+        assert np.isclose(scores[0], 1.0)
+        assert scores[1] == 0.0
+
+
+class TestFindSimilarDetails:
+    """Tests for find_similar_details function."""
+
+    def test_only_relevant_matches_returned(self):
+        """Test that only details above the threshold are returned, best first."""
+        candidates = [
+            {"details": "AI agents", "details_vector": embed_text("AI agents").tolist()},
+            {"details": "quantum computing", "details_vector": embed_text("quantum computing").tolist()},
+            {"details": "autonomous AI agents"},  # legacy document without a stored vector
+        ]
+
+        matches = find_similar_details("AI agents", candidates, THRESHOLD)
+
+        assert [details for details, _ in matches] == ["AI agents", "autonomous AI agents"]
+        assert matches[0][1] > matches[1][1]
+
+    def test_no_details(self):
+        """Test that empty details or no candidates give no matches."""
+        assert find_similar_details("", [{"details": "AI agents"}], THRESHOLD) == []
+        assert find_similar_details("AI agents", [], THRESHOLD) == []
@@ -0,0 +1,181 @@
+"""
+Tests for single-flight coordination of pipeline stages.
+"""
+
+import sys
+import time
+import threading
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch, MagicMock
+import pytest
+from pymongo import errors
+
+# Mock modules to avoid circular imports before importing anything
+sys.modules['src.config.setup_server'] = MagicMock()
+sys.modules['src.api'] = MagicMock()
+sys.modules['src.api.routes'] = MagicMock()
+
+# Now import the single-flight service
+import src.services.single_flight_service as single_flight_service
+from src.services.single_flight_service import run_single_flight, normalize_key
+
+
+def _settings(distributed: bool = False):
+    """Build single-flight settings for a test."""
+    mock_settings = MagicMock()
+    mock_settings.single_flight_enabled = True
+    mock_settings.single_flight_distributed = distributed
+    mock_settings.single_flight_lease_seconds = 60
+    mock_settings.single_flight_wait_timeout_seconds = 5
+    mock_settings.single_flight_result_ttl_seconds = 30
+    return mock_settings
+
+
+class TestNormalizeKey:
+    """Tests for normalize_key function."""
+
+    def test_case_and_whitespace_insensitive(self):
+        """Test that keys ignore case and extra whitespace."""
+        assert normalize_key("find_url", "Tech", "AI   Agents ") == normalize_key("find_url", "tech", "ai agents")
+        assert normalize_key("find_url", "tech", "ai") != normalize_key("core_text", "tech", "ai")
+
+    def test_inputs_are_part_of_key(self):
+        """Test that stage inputs change the key and dict key order does not."""
+        base = normalize_key("core_text", "tech", "ai")
+        with_a = normalize_key("core_text", "tech", "ai", ["https://a.com"])
+        assert with_a != base
+        assert with_a != normalize_key("core_text", "tech", "ai", ["https://b.com"])
+        assert normalize_key("relevance", "tech", "ai", {"m": "x", "s": [1]}) == \
+            normalize_key("relevance", "tech", "ai", {"s": [1], "m": "x"})
+
+
+class TestRunSingleFlight:
+    """Tests for in-process single-flight."""
+
+    def test_concurrent_callers_share_one_run(self):
+        """Test that concurrent calls with the same key run the work once and all get the result."""
+        calls = []
+        started = threading.Event()
+
+        def work():
+            calls.append(1)
+            started.set()
+            time.sleep(0.2)
+            return ["https://a.com", "https://b.com"]
+
+        with patch.object(single_flight_service, "settings", _settings()):
+            with ThreadPoolExecutor(max_workers=5) as executor:
+                leader = executor.submit(run_single_flight, "find_url", "tech", "AI", work)
+                started.wait()
+                followers = [executor.submit(run_single_flight, "find_url", "Tech", "ai", work) for _ in range(4)]
+                results = [leader.result()] + [f.result() for f in followers]
+
+        assert len(calls) == 1
+        assert all(r == ["https://a.com", "https://b.com"] for r in results)
+
+    def test_different_keys_run_separately(self):
+        """Test that different topics do not share work."""
+        with patch.object(single_flight_service, "settings", _settings()):
+            assert run_single_flight("find_url", "tech", "AI", lambda: "tech") == "tech"
+            assert run_single_flight("find_url", "sports", "AI", lambda: "sports") == "sports"
+
+    def test_different_inputs_run_separately(self):
+        """Test that the same topic/details with different inputs do not share work."""
+        with patch.object(single_flight_service, "settings", _settings()):
+            assert run_single_flight("core_text", "tech", "AI", lambda: "a", inputs=["https://a.com"]) == "a"
+            assert run_single_flight("core_text", "tech", "AI", lambda: "b", inputs=["https://b.com"]) == "b"
+
+    def test_leader_failure_propagates(self):
+        """Test that followers see the leader's exception and the key is released afterwards."""
+        started = threading.Event()
+
+        def failing_work():
+            started.set()
+            time.sleep(0.1)
+            raise RuntimeError("tavily down")
+
+        with patch.object(single_flight_service, "settings", _settings()):
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                leader = executor.submit(run_single_flight, "core_text", "tech", "AI", failing_work)
+                started.wait()
+                follower = executor.submit(run_single_flight, "core_text", "tech", "AI", lambda: "unused")
+                with pytest.raises(RuntimeError):
+                    leader.result()
+                with pytest.raises(RuntimeError):
+                    follower.result()
+
+            # Key released: a new call runs again
+            assert run_single_flight("core_text", "tech", "AI", lambda: "retry") == "retry"
+
+
+class TestDistributedSingleFlight:
+    """Tests for cross-worker single-flight via a Mongo lease document."""
+
+    def test_leader_stores_result_on_lease(self):
+        """Test that the lease holder runs the work and stores the result for other workers."""
+        collection = MagicMock()
+
+        with patch.object(single_flight_service, "settings", _settings(distributed=True)), \
+             patch("src.services.mongo_service.get_collection", return_value=collection):
+            result = run_single_flight("find_url", "tech", "AI", lambda: ["https://a.com"])
+
+        assert result == ["https://a.com"]
+        update = collection.update_one.call_args_list[-1]
+        assert update.args[1]["$set"]["status"] == "done"
+        assert update.args[1]["$set"]["result"] == {"value": ["https://a.com"]}
+
+    def test_follower_reuses_remote_result(self):
+        """Test that a worker that cannot take the lease waits for and reuses the remote result."""
+        collection = MagicMock()
+        collection.update_one.side_effect = errors.DuplicateKeyError("lease held")
+        collection.find_one.return_value = {
+            "status": "done",
+            "result": {"value": ["https://remote.com"]},
+            "expires_at": datetime.utcnow() + timedelta(seconds=30),
+        }
+        work = MagicMock(return_value=["https://local.com"])
+
+        with patch.object(single_flight_service, "settings", _settings(distributed=True)), \
+             patch("src.services.mongo_service.get_collection", return_value=collection):
+            result = run_single_flight("find_url", "tech", "AI", work)
+
+        assert result == ["https://remote.com"]
+        work.assert_not_called()
+
+    def test_expired_remote_lease_runs_locally(self):
+        """Test that an expired lease held by a dead worker does not block the caller."""
+        collection = MagicMock()
+        collection.update_one.side_effect = errors.DuplicateKeyError("lease held")
+        collection.find_one.return_value = {"status": "running", "expires_at": datetime.utcnow() - timedelta(seconds=1)}
+
+        with patch.object(single_flight_service, "settings", _settings(distributed=True)), \
+             patch("src.services.mongo_service.get_collection", return_value=collection):
+            result = run_single_flight("find_url", "tech", "AI", lambda: ["https://local.com"])
+
+        assert result == ["https://local.com"]
+
+    def test_unreadable_lease_runs_locally(self):
+        """Test that a follower runs the work itself when the lease cannot be read."""
+        collection = MagicMock()
+        collection.update_one.side_effect = errors.DuplicateKeyError("lease held")
+        collection.find_one.side_effect = errors.ServerSelectionTimeoutError("mongo down")
+
+        with patch.object(single_flight_service, "settings", _settings(distributed=True)), \
+             patch("src.services.mongo_service.get_collection", return_value=collection):
+            result = run_single_flight("find_url", "tech", "AI", lambda: ["https://local.com"])
+
+        assert result == ["https://local.com"]
+
+    def test_lease_release_failure_keeps_leader_error(self):
+        """Test that a failed lease cleanup does not hide the leader's own exception."""
+        collection = MagicMock()
+        collection.delete_one.side_effect = errors.ServerSelectionTimeoutError("mongo down")
+
+        def failing():
+            raise ValueError("boom")
+
+        with patch.object(single_flight_service, "settings", _settings(distributed=True)), \
+             patch("src.services.mongo_service.get_collection", return_value=collection):
+            with pytest.raises(ValueError, match="boom"):
+                run_single_flight("find_url", "tech", "AI", failing)
@@ -0,0 +1,111 @@
+"""
+Tests for speculative background prefetch.
+"""
+
+import sys
+import threading
+from unittest.mock import patch, MagicMock
+
+# Mock modules to avoid circular imports before importing anything
+sys.modules['src.config.setup_server'] = MagicMock()
+sys.modules['src.api'] = MagicMock()
+sys.modules['src.api.routes'] = MagicMock()
+
+# Now import the speculation service
+import src.services.speculation_service as speculation_service
+
+PREFETCH_RESULT = {"urls": ["https://a.com"], "core_texts": ["fresh text"]}
+
+
+def _settings(**overrides):
+    """Build speculation settings for a test."""
+    mock_settings = MagicMock()
+    mock_settings.speculative_prefetch_enabled = True
+    mock_settings.speculative_max_concurrent = 2
+    mock_settings.speculative_daily_budget = 10
+    mock_settings.speculative_ttl_seconds = 600
+    for key, value in overrides.items():
+        setattr(mock_settings, key, value)
+    return mock_settings
+
+
+class TestSpeculativePrefetch:
+    """Tests for start/take/cancel of speculative prefetch."""
+
+    def setup_method(self):
+        speculation_service._speculations.clear()
+        speculation_service._budget.update({"day": None, "used": 0})
+
+    def test_no_reply_attaches_to_result(self):
+        """Test that a "no" reply gets the prefetched URLs and core texts."""
+        with patch.object(speculation_service, "settings", _settings()), \
+             patch.object(speculation_service, "_prefetch", return_value=PREFETCH_RESULT) as mock_prefetch:
+            assert speculation_service.start_speculative_prefetch("conv1", "tech", "AI agents")
+            result = speculation_service.take_speculative_prefetch("conv1", "Tech", "ai agents")
+
+        assert result == PREFETCH_RESULT
+        assert mock_prefetch.call_count == 1
+        # Taken once: a second attach finds nothing
+        assert speculation_service.take_speculative_prefetch("conv1", "tech", "AI agents") is None
+
+    def test_yes_reply_cancels(self):
+        """Test that a "yes" reply signals the running prefetch to stop and drops it."""
+        release = threading.Event()
+        seen_cancel = {}
+
+        def blocking_prefetch(topic, details, cancel_event):
+            release.wait(timeout=5)
+            seen_cancel["set"] = cancel_event.is_set()
+            return None
+
+        with patch.object(speculation_service, "settings", _settings()), \
+             patch.object(speculation_service, "_prefetch", side_effect=blocking_prefetch):
+            speculation_service.start_speculative_prefetch("conv2", "tech", "AI")
+            future = speculation_service._speculations["conv2"].future
+            speculation_service.cancel_speculative_prefetch("conv2")
+            release.set()
+            future.result(timeout=5)
+
+        assert seen_cancel["set"] is True
+        assert speculation_service.take_speculative_prefetch("conv2", "tech", "AI") is None
+
+    def test_topic_mismatch_discarded(self):
+        """Test that a speculation for a different topic is not reused."""
+        with patch.object(speculation_service, "settings", _settings()), \
+             patch.object(speculation_service, "_prefetch", return_value=PREFETCH_RESULT):
+            speculation_service.start_speculative_prefetch("conv3", "tech", "AI")
+            assert speculation_service.take_speculative_prefetch("conv3", "sports", "football") is None
+
+    def test_daily_budget(self):
+        """Test that speculation stops once the daily budget is spent."""
+        with patch.object(speculation_service, "settings", _settings(speculative_daily_budget=1)), \
+             patch.object(speculation_service, "_prefetch", return_value=PREFETCH_RESULT):
+            assert speculation_service.start_speculative_prefetch("conv4", "tech", "AI")
+            assert not speculation_service.start_speculative_prefetch("conv5", "sports", "football")
+
+    def test_disabled(self):
+        """Test that nothing starts when speculative prefetch is disabled."""
+        with patch.object(speculation_service, "settings", _settings(speculative_prefetch_enabled=False)), \
+             patch.object(speculation_service, "_prefetch") as mock_prefetch:
+            assert not speculation_service.start_speculative_prefetch("conv6", "tech", "AI")
+        mock_prefetch.assert_not_called()
+
+    def test_prefetch_ingests_transcripts_before_extraction(self):
+        """Test that the prefetch runs transcript ingestion between discovery and extraction."""
+        calls = []
+        find_url = MagicMock(find_url_node=lambda state: calls.append("find_url") or {"urls": ["https://youtu.be/abcdefghijk"]})
+        transcripts = MagicMock(transcript_ingestion_node=lambda state: calls.append("transcripts") or {
+            "video_urls": ["https://youtu.be/abcdefghijk"], "transcripts": ["spoken text"]})
+        core_text = MagicMock(core_text_extraction_node=lambda state: calls.append("core_text") or {
+            "core_texts": state["transcripts"], "core_text_urls": state["video_urls"]})
+        nodes = {
+            "src.graph.nodes.find_url_node": find_url,
+            "src.graph.nodes.transcript_ingestion_node": transcripts,
+            "src.graph.nodes.core_text_extraction_node": core_text,
+        }
+        with patch.dict(sys.modules, nodes), \
+             patch.object(speculation_service, "settings", _settings(youtube_transcripts_enabled=True)):
+            result = speculation_service._prefetch("tech", "AI", threading.Event())
+
+        assert calls == ["find_url", "transcripts", "core_text"]
+        assert result["core_texts"] == ["spoken text"]
@@ -0,0 +1,64 @@
+"""
+Tests for the local extractive summarizer.
+"""
+
+import sys
+from unittest.mock import MagicMock
+
+# Mock modules to avoid circular imports before importing anything
+sys.modules['src.graph'] = MagicMock()
+sys.modules['src.graph.graph'] = MagicMock()
+sys.modules['src.graph.nodes'] = MagicMock()
+sys.modules['src.config.setup_server'] = MagicMock()
+sys.modules['src.api'] = MagicMock()
+sys.modules['src.api.routes'] = MagicMock()
+
+# Now import the summarizer service
+from src.services.summarizer_service import split_sentences, rank_sentences, summarize_text, estimate_tokens
+
+CENTRAL = "The new language model improves reasoning on math benchmarks."
+ARTICLE = " ".join([
+    CENTRAL,
+    "The language model was trained on more math data than before.",
+    "Reasoning benchmarks show the model solving harder math problems.",
+    "The weather in the city was sunny on the day of the launch.",
+    "Subscribe to our newsletter for more updates.",
+] * 10)
+
+
+class TestSplitSentences:
+    """Tests for split_sentences function."""
+
+    def test_splits_on_punctuation_and_newlines(self):
+        """Test that sentences are split on punctuation and line breaks."""
+        assert split_sentences("First one. Second one!\nThird line") == ["First one.", "Second one!", "Third line"]
+
+
+class TestRankSentences:
+    """Tests for rank_sentences function."""
+
+    def test_central_sentence_outranks_off_topic(self):
+        """Test that a sentence sharing terms with many others ranks above unrelated ones."""
+        sentences = split_sentences(ARTICLE)[:5]
+        scores = rank_sentences(sentences)
+
+        assert scores[0] > scores[3]
+        assert scores[0] > scores[4]
+
+
+class TestSummarizeText:
+    """Tests for summarize_text function."""
+
+    def test_short_text_is_unchanged(self):
+        """Test that text within the budget is returned as is."""
+        assert summarize_text(CENTRAL, max_tokens=100) == CENTRAL
+
+    def test_summary_fits_budget_and_keeps_order(self):
+        """Test that the summary fits the budget and keeps sentences in original order."""
+        summary = summarize_text(ARTICLE, max_tokens=60)
+
+        assert estimate_tokens(summary) <= 60
+        sentences = split_sentences(summary)
+        positions = [ARTICLE.index(s) for s in sentences]
+        assert positions == sorted(positions)
+        assert "newsletter" not in summary
@@ -22,7 +22,10 @@ sys.modules['src.api.routes'] = MagicMock()
 sys.modules['src.services.graph_service'] = MagicMock()
 
 # Now import the Tavily service
-from src.services.tavily_service import _get_tavily_client
+from src.services.tavily_service import (
+    _get_tavily_client, get_search_result_texts, get_viral_results_from_last_month,
+    extract_core_texts_with_failures
+)
 
 
 class TestGetTavilyClient:
@@ -103,3 +106,105 @@ class TestGetTavilyClient:
             # Verify TavilyClient was only instantiated once
             assert mock_tavily_client_class.call_count == 1
 
+
+
+class TestGetSearchResultTexts:
+    """Tests for get_search_result_texts function (fast mode)."""
+
+    def test_prefers_raw_content_and_skips_short_snippets(self):
+        """Test that raw content is used when present and short snippets are left for extract."""
+        results = [
+            {"url": "https://a.example/1", "content": "Short snippet", "raw_content": "Full page text. " * 50},
+            {"url": "https://a.example/2", "content": "Too short"},
+        ]
+
+        with patch('src.services.tavily_service.settings') as mock_settings:
+            mock_settings.text_cleaning_enabled = False
+
+            texts = get_search_result_texts(results, min_chars=100)
+
+        assert list(texts) == ["https://a.example/1"]
+        assert texts["https://a.example/1"].startswith("Full page text.")
+
+
+class TestAdaptiveSearchDepth:
+    """Tests for basic-first Tavily search with escalation to advanced depth."""
+
+    @staticmethod
+    def _settings(mock_settings):
+        mock_settings.tavily_adaptive_depth_enabled = True
+        mock_settings.tavily_escalate_min_results = 2
+        mock_settings.tavily_escalate_max_age_days = 14
+        mock_settings.tavily_escalate_min_score = 0.5
+
+    def test_basic_results_are_used_when_good_enough(self):
+        """Test that no advanced search runs when basic results are enough, recent and relevant."""
+        basic = [{"url": "https://a.example/1", "score": 0.9}, {"url": "https://a.example/2", "score": 0.7}]
+
+        with patch('src.services.tavily_service.settings') as mock_settings, \
+             patch('src.services.tavily_service.search_tavily', return_value=basic) as mock_search:
+            self._settings(mock_settings)
+
+            results = get_viral_results_from_last_month("tech", "AI", limit=2)
+
+        assert results == basic
+        assert mock_search.call_count == 1
+        assert mock_search.call_args.kwargs["search_depth"] == "basic"
+
+    def test_escalates_when_results_are_too_few(self):
+        """Test that an advanced search runs when basic depth returns too few results."""
+        basic = [{"url": "https://a.example/1", "score": 0.9}]
+        advanced = [{"url": "https://b.example/1", "score": 0.8}, {"url": "https://b.example/2", "score": 0.6}]
+
+        with patch('src.services.tavily_service.settings') as mock_settings, \
+             patch('src.services.tavily_service.search_tavily', side_effect=[basic, advanced]) as mock_search:
+            self._settings(mock_settings)
+
+            results = get_viral_results_from_last_month("tech", "AI", limit=2)
+
+        assert results == advanced
+        assert [c.kwargs["search_depth"] for c in mock_search.call_args_list] == ["basic", "advanced"]
+
+    def test_escalates_when_scores_are_low(self):
+        """Test that low-scoring basic results trigger an advanced search."""
+        basic = [{"url": "https://a.example/1", "score": 0.2}, {"url": "https://a.example/2", "score": 0.1}]
+
+        with patch('src.services.tavily_service.settings') as mock_settings, \
+             patch('src.services.tavily_service.search_tavily', side_effect=[basic, []]) as mock_search:
+            self._settings(mock_settings)
+
+            results = get_viral_results_from_last_month("tech", "AI", limit=2)
+
+        # The advanced search found nothing, so the basic results are kept
+        assert results == basic
+        assert mock_search.call_count == 2
+
+
+class TestExtractCoreTextsWithFailures:
+    """Tests for batched, concurrent Tavily extraction."""
+
+    def test_failed_batch_keeps_other_batches(self):
+        """Test that a failing batch only fails its own URLs and Tavily failed_results are reported."""
+        def fake_extract(urls, **kwargs):
+            if "https://broken.example/1" in urls:
+                raise TimeoutError("read timed out")
+            return {
+                "results": [{"url": urls[0], "raw_content": f"Article text from {urls[0]}."}],
+                "failed_results": [{"url": u, "error": "blocked"} for u in urls[1:]],
+            }
+
+        client = MagicMock()
+        client.extract.side_effect = fake_extract
+        urls = ["https://a.example/1", "https://a.example/2", "https://broken.example/1"]
+
+        with patch('src.services.tavily_service.settings') as mock_settings, \
+             patch('src.services.tavily_service._get_tavily_client', return_value=client):
+            mock_settings.tavily_extract_batch_size = 2
+            mock_settings.tavily_extract_timeout_seconds = 5
+            mock_settings.text_cleaning_enabled = False
+
+            texts, failed = extract_core_texts_with_failures(urls, "tech", "AI")
+
+        assert client.extract.call_count == 2
+        assert texts == {"https://a.example/1": "Article text from https://a.example/1."}
+        assert failed == {"https://a.example/2": "blocked", "https://broken.example/1": "read timed out"}
@@ -0,0 +1,80 @@
+"""
+Tests for the boilerplate and noise stripping service.
+"""
+
+import sys
+from unittest.mock import MagicMock
+
+# Mock modules to avoid circular imports before importing anything
+sys.modules['src.graph'] = MagicMock()
+sys.modules['src.graph.graph'] = MagicMock()
+sys.modules['src.graph.nodes'] = MagicMock()
+sys.modules['src.config.setup_server'] = MagicMock()
+sys.modules['src.api'] = MagicMock()
+sys.modules['src.api.routes'] = MagicMock()
+
+# Now import the text cleaning service
+from src.services.text_cleaning_service import clean_text, clean_texts, link_density
+
+CONTENT = "The new model scored 92% on the benchmark, up from 85% last year, the lab said on Tuesday."
+
+
+class TestCleanText:
+    """Tests for clean_text function."""
+
+    def test_strips_boilerplate_lines(self):
+        """Test that banners, menus and link lists are removed and content is kept."""
+        raw = "\n".join([
+            "Skip to main content",
+            "Home | News | Tech | Sports",
+            "[Home](/) [World](/world) [Business](/business)",
+            CONTENT,
+            "We use cookies to improve your experience. Accept all",
+            "Subscribe to our newsletter",
+        ])
+
+        assert clean_text(raw) == CONTENT
+
+    def test_keeps_long_lines_that_mention_boilerplate_words(self):
+        """Test that real sentences mentioning a boilerplate phrase are not dropped."""
+        line = "Analysts expect the company to subscribe more enterprise customers to its new cloud plan before the end of the year."
+
+        assert clean_text(line) == line
+
+    def test_normalizes_whitespace(self):
+        """Test that runs of spaces and blank lines are collapsed."""
+        assert clean_text("  First   line\n\n\n\nSecond\tline  ") == "First line\n\nSecond line"
+
+
+class TestLinkDensity:
+    """Tests for link_density function."""
+
+    def test_link_density(self):
+        """Test that link-only lines are dense and plain text is not."""
+        assert link_density("[Read](https://example.com/a)") == 1.0
+        assert link_density(CONTENT) == 0.0
+
+
+class TestCleanTexts:
+    """Tests for clean_texts function."""
+
+    def test_removes_lines_repeated_across_sources_and_reports_bytes(self):
+        """Test that shared page chrome is removed from every source and bytes removed are reported."""
+        header = "Example Media Group - Technology Desk"
+        texts = {
+            "https://a.example/1": f"{header}\n{CONTENT}",
+            "https://a.example/2": f"{header}\nA different article body about chips.",
+        }
+
+        cleaned, bytes_removed = clean_texts(texts)
+
+        assert cleaned["https://a.example/1"] == CONTENT
+        assert header not in cleaned["https://a.example/2"]
+        assert bytes_removed["https://a.example/1"] == len(header) + 1
+
+    def test_drops_sources_with_nothing_left(self):
+        """Test that sources that were only boilerplate are dropped."""
+        cleaned, bytes_removed = clean_texts({"https://a.example/cookie": "Accept all cookies"})
+
+        assert cleaned == {}
+        assert bytes_removed["https://a.example/cookie"] > 0
@@ -105,4 +105,168 @@ class TestGetYouTubeClient:
             assert client1 is not None
             assert client2 is not None
             assert client1 is client2
-            assert mock_build.call_count == 1
\ No newline at end of file
+            assert mock_build.call_count == 1
+
+class TestEngagementRanking:
+    """Tests for engagement-velocity ranking of viral YouTube candidates."""
+
+    def test_velocity_favours_recent_engagement(self):
+        """Test that engagement per hour, not total views, decides the ranking."""
+        from datetime import datetime
+        from src.services.youtube_service import engagement_velocity
+
+        now = datetime(2024, 5, 31, 12, 0, 0)
+        videos = [
+            {"id": "old", "views": 100000, "likes": 1000, "comments": 100, "published_at": "2024-05-01T12:00:00Z"},
+            {"id": "new", "views": 20000, "likes": 1000, "comments": 200, "published_at": "2024-05-30T12:00:00Z"},
+            {"id": "fresh", "views": 300, "likes": 0, "comments": 0, "published_at": "2024-05-31T11:00:00Z"},
+        ]
+
+        scores = engagement_velocity(videos, now=now)
+
+        # (20000 + 10000 + 4000) / 24h beats (100000 + 10000 + 2000) / 720h
+        assert scores[1] > scores[0]
+        # Videos younger than MIN_AGE_HOURS are scored as MIN_AGE_HOURS old
+        assert scores[2] == pytest.approx(300 / 6)
+
+    def test_viral_urls_use_id_only_search_and_one_batched_statistics_call(self):
+        """Test that search requests only IDs and candidates are re-ranked from one videos().list call."""
+        import src.services.youtube_service as youtube_service
+
+        youtube = MagicMock()
+        youtube.search.return_value.list.return_value.execute.return_value = {
+            "items": [{"id": {"videoId": "a"}}, {"id": {"videoId": "b"}}, {"id": {"videoId": "c"}}]
+        }
+        youtube.videos.return_value.list.return_value.execute.return_value = {"items": [
+            {"id": "a", "snippet": {"title": "A", "publishedAt": "2020-01-01T00:00:00Z"}, "statistics": {"viewCount": "900"}},
+            {"id": "b", "snippet": {"title": "B", "publishedAt": "2020-01-01T00:00:00Z"},
+             "statistics": {"viewCount": "500", "likeCount": "100", "commentCount": "10"}},
+            {"id": "c", "snippet": {"title": "C", "publishedAt": "2020-01-01T00:00:00Z"}, "statistics": {"viewCount": "100"}},
+        ]}
+
+        with patch.object(youtube_service, "get_youtube_client", return_value=youtube), \
+             patch.object(youtube_service, "settings") as mock_settings:
+            mock_settings.youtube_engagement_ranking_enabled = True
+            mock_settings.youtube_ranking_candidates = 15
+            urls = youtube_service.get_viral_urls_from_last_month("tech", "AI", limit=2)
+
+        assert urls == ["https://www.youtube.com/watch?v=b", "https://www.youtube.com/watch?v=a"]
+        search_kwargs = youtube.search.return_value.list.call_args.kwargs
+        assert search_kwargs["part"] == "id"
+        assert search_kwargs["fields"] == "items(id/videoId)"
+        assert search_kwargs["maxResults"] == 15
+        youtube.videos.return_value.list.assert_called_once()
+        assert youtube.videos.return_value.list.call_args.kwargs["id"] == "a,b,c"
+
+    def test_statistics_failure_keeps_search_order(self):
+        """Test that the search order is used when the statistics call fails."""
+        import src.services.youtube_service as youtube_service
+
+        youtube = MagicMock()
+        youtube.videos.return_value.list.return_value.execute.side_effect = Exception("quota")
+
+        with patch.object(youtube_service, "get_youtube_client", return_value=youtube):
+            assert youtube_service.rank_by_engagement_velocity(["x", "y"]) == ["x", "y"]
+
+
+class TestClientWarmUp:
+    """Tests for offline client construction and per-thread HTTP."""
+
+    def test_client_built_once_from_bundled_discovery_document(self):
+        """Test that concurrent first calls build one client from the static discovery document."""
+        import threading
+        import src.services.youtube_service as youtube_service
+        youtube_service._youtube_client = None
+
+        with patch.object(youtube_service, "settings") as mock_settings, \
+             patch('googleapiclient.discovery.build') as mock_build:
+            mock_settings.youtube_api_key = "test_api_key"
+            mock_build.return_value = MagicMock()
+
+            threads = [threading.Thread(target=youtube_service.get_youtube_client) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        mock_build.assert_called_once()
+        assert mock_build.call_args.kwargs["static_discovery"] is True
+        assert mock_build.call_args.kwargs["cache_discovery"] is False
+        youtube_service._youtube_client = None
+
+    def test_requests_reuse_the_calling_threads_http(self):
+        """Test that each thread executes requests on its own, reused HTTP object."""
+        import threading
+        import src.services.youtube_service as youtube_service
+
+        request = MagicMock()
+        youtube_service._execute(request)
+        youtube_service._execute(request)
+        main_https = {id(c.kwargs["http"]) for c in request.execute.call_args_list}
+
+        other = MagicMock()
+        thread = threading.Thread(target=youtube_service._execute, args=(other,))
+        thread.start()
+        thread.join()
+
+        assert len(main_https) == 1
+        assert id(other.execute.call_args.kwargs["http"]) not in main_https
+
+
+class TestTranscripts:
+    """Tests for transcript ingestion (against an httpx.MockTransport caption stand-in)."""
+
+    JSON3 = (
+        '{"events": [{"tStartMs": 0, "segs": [{"utf8": "[Music]"}]},'
+        ' {"tStartMs": 1200, "segs": [{"utf8": "hello "}, {"utf8": "&amp; welcome"}]},'
+        ' {"tStartMs": 2400, "segs": [{"utf8": "hello & welcome"}]},'
+        ' {"tStartMs": 3600, "segs": [{"utf8": "\\n"}]},'
+        ' {"tStartMs": 4800, "segs": [{"utf8": "to the show"}]}]}'
+    )
+    XML = '<transcript><text start="0.0" dur="1.5">first  line</text><text start="1.5" dur="2">second [Applause]</text></transcript>'
+
+    def test_parse_caption_payloads(self):
+        """Test that json3 and XML captions become plain text without timestamps, cues or rolling repeats."""
+        from src.services.youtube_service import parse_caption_payload
+
+        assert parse_caption_payload(self.JSON3) == "hello & welcome to the show"
+        assert parse_caption_payload(self.XML) == "first line second"
+        assert parse_caption_payload("") == ""
+
+    def test_fetch_transcripts_uses_cache_and_caches_downloads(self):
+        """Test that cached videos are not downloaded and new transcripts are cached by video ID."""
+        import httpx
+        import src.services.youtube_service as youtube_service
+
+        requested = []
+
+        def stand_in(request: httpx.Request) -> httpx.Response:
+            requested.append(request.url.params["v"])
+            if request.url.params["v"] == "nocaptions1":
+                return httpx.Response(200, text="")
+            return httpx.Response(200, text=self.JSON3)
+
+        urls = [
+            "https://www.youtube.com/watch?v=cachedvideo",
+            "https://youtu.be/newvideo01a",
+            "https://www.youtube.com/watch?v=nocaptions1",
+            "https://example.com/article",
+        ]
+        caption_client = httpx.Client(transport=httpx.MockTransport(stand_in))
+        try:
+            with patch.object(youtube_service, "settings") as mock_settings, \
+                 patch.object(youtube_service, "_get_transcript_client", return_value=caption_client), \
+                 patch.object(youtube_service, "find_cached_transcripts", return_value={"cachedvideo": "Cached text"}), \
+                 patch.object(youtube_service, "save_transcript") as mock_save:
+                mock_settings.youtube_timedtext_base_url = "http://captions.test/api/timedtext"
+                mock_settings.youtube_transcript_language = "en"
+                mock_settings.youtube_transcript_concurrency = 2
+                mock_settings.youtube_http_timeout_seconds = 5
+                mock_settings.http_connect_timeout_seconds = 5
+                transcripts = youtube_service.fetch_transcripts(urls)
+        finally:
+            caption_client.close()
+
+        assert transcripts == {urls[0]: "Cached text", urls[1]: "hello & welcome to the show"}
+        assert sorted(requested) == ["newvideo01a", "nocaptions1"]
+        mock_save.assert_called_once_with("newvideo01a", "hello & welcome to the show")